@@ -6,7 +6,7 @@ from led_light import Led_Light
 from pedestrian_button import Pedestrian_Button
 from audio_notification import Audio_Notification
 from controller import Controller
-from time import sleep, time
+from crossing_runtime import CrossingRuntime, asyncio
 
 debug = False
 
@@ -29,6 +29,7 @@ controller = Controller(
     True,
 )
 
-while True:
-    controller.update()
-    sleep(0.1)
+# Event-driven: sleeps until the next phase deadline or a button press
+# instead of polling controller.update() every 100 ms
+runtime = CrossingRuntime(controller, pedestrian_button, led_pedestrian_red, buzzer)
+asyncio.run(runtime.run())
@@ -1,5 +1,8 @@
 from machine import Pin, PWM
-from time import sleep, time
+from clock import system_clock
+from envelope import Envelope
+from pattern_player import PatternPlayer
+from tone_engine import ToneEngine
 
 
 class Audio_Notification(PWM):
@@ -7,37 +10,62 @@ class Audio_Notification(PWM):
     Audio_Notification extends PWM to provide an interface for controlling a piezo buzzer.
 
     This class provides methods for generating warning beeps and custom tones
-    with optional debug output.
+    with optional debug output. Tones are played by a ToneEngine, so no
+    method blocks while the buzzer sounds. Every tone passes through an
+    Envelope that applies the volume and, optionally, attack/decay ramps.
 
     Args:
         pin (int): The GPIO pin number to which the buzzer is connected
         debug (bool, optional): Enable debug print statements. Defaults to False.
+        clock (Clock, optional): Time source for the beep cadence. Defaults to the system clock.
+        timer (Timer, optional): One-shot timer that ends each tone. Defaults to a new machine.Timer.
+        envelope (bool, optional): Ramp tones in and out to avoid clicks. Defaults to False.
+        schedule (VolumeSchedule, optional): Volume by time of day. Defaults to None.
     """
 
-    def __init__(self, pin, debug=False):
+    SCHEDULE_CHECK_MS = 60000
+
+    def __init__(
+        self, pin, debug=False, clock=None, timer=None, envelope=False, schedule=None
+    ):
         """
         Initialize the Audio_Notification object.
 
         Args:
             pin (int): The GPIO pin number to which the buzzer is connected
             debug (bool, optional): Enable debug print statements. Defaults to False.
+            clock (Clock, optional): Time source for the beep cadence. Defaults to the system clock.
+            timer (Timer, optional): One-shot timer that ends each tone. Defaults to a new machine.Timer.
+            envelope (bool, optional): Ramp tones in and out to avoid clicks. Defaults to False.
+            schedule (VolumeSchedule, optional): Volume by time of day, checked
+                once a minute while the buzzer is in use. Defaults to None.
         """
         super().__init__(Pin(pin))
         self.__debug = debug
+        self.__clock = clock if clock is not None else system_clock
+        self.__envelope = Envelope(self, ramps=envelope)
+        self.__tones = ToneEngine(self.__envelope, timer, self.__clock)
+        self.__schedule = schedule
+        self.__schedule_checked = None
+        self.__player = None  # PatternPlayer, created on first use
         self.duty_u16(0)  # Start with buzzer off
-        self.__last_toggle_time = time()
+        self.__last_toggle_time = self.__clock.ticks_ms()
+        self.__warning_active = False
 
     def warning_on(self):
         """
-        Sound a warning beep if 0.5 seconds have elapsed since the last beep.
+        Sound a warning beep if 500 ms have elapsed since the last beep.
 
         This method is designed to be called repeatedly in a main loop to
         create a periodic warning sound.
         """
         if self.__debug:
             print("Warning on")
-        now = time()
-        if now - self.__last_toggle_time >= 0.5:
+        self.__warning_active = True
+        self.__check_schedule()
+        self.__tones.service()
+        now = self.__clock.ticks_ms()
+        if self.__clock.ticks_diff(now, self.__last_toggle_time) >= 500:
             self.beep(freq=500, duration=100)
             self.__last_toggle_time = now
 
@@ -49,22 +77,148 @@ class Audio_Notification(PWM):
         """
         if self.__debug:
             print("Warning off")
-        self.duty_u16(0)  # Turn off sound
+        self.__warning_active = False
+        if self.__player is not None:
+            self.__player.stop()
+        self.__tones.stop()  # Turn off sound and drop queued tones
+
+    def ms_until_due(self):
+        """
+        Get how long until the next warning beep is due.
+
+        Used by schedulers to decide how long the CPU can sleep.
+
+        Returns:
+            int or None: Milliseconds until warning_on() will next beep (0 if
+            it is due now), or None if the warning is off.
+        """
+        tone_due = self.__tones.ms_until_due()
+        if self.__player is not None:
+            step_due = self.__player.ms_until_due()
+            if tone_due is None or (step_due is not None and step_due < tone_due):
+                tone_due = step_due
+        if not self.__warning_active:
+            return tone_due
+        now = self.__clock.ticks_ms()
+        elapsed = self.__clock.ticks_diff(now, self.__last_toggle_time)
+        beep_due = max(0, 500 - elapsed)
+        return beep_due if tone_due is None else min(beep_due, tone_due)
+
+    @property
+    def busy(self):
+        """
+        Check whether a tone or a pattern step is sounding.
+
+        Schedulers must not lightsleep while busy, since that stops the PWM
+        and the timer that ends the tone. A looping pattern is not busy in
+        its rests, so the scheduler can sleep until ms_until_due(); the next
+        step then starts on the play_pattern() call after waking.
+
+        Returns:
+            bool: True while the buzzer is playing.
+        """
+        player = self.__player
+        return self.__tones.playing or (player is not None and player.sounding)
 
     def beep(self, freq=1000, duration=500):
         """
         Generate a beep at the specified frequency and duration.
 
-        Note: This is a blocking method that will pause program execution
-        for the duration of the beep.
+        The beep starts at once, or after the tones already queued, and this
+        method returns immediately. The buzzer is silenced when it ends.
 
         Args:
             freq (int, optional): Frequency in Hz. Defaults to 1000.
             duration (int, optional): Duration in milliseconds. Defaults to 500.
+
+        Returns:
+            bool: True if the beep was queued, False if the queue was full.
         """
-        self.freq(freq)
-        self.duty_u16(32768)  # 50% duty cycle
-        sleep(duration / 1000)
-        self.duty_u16(0)  # Turn off after beep
+        self.__check_schedule()
+        queued = self.__tones.play(freq, duration)  # 50% duty cycle
         if self.__debug:
-            print("Beep")
+            print("Beep" if queued else "Beep dropped")
+        return queued
+
+    def play_sequence(self, steps):
+        """
+        Queue a sequence of tones to play one after another.
+
+        Args:
+            steps (sequence): (freq, duty, duration_ms) tuples. A freq of 0 is
+                a silent rest.
+
+        Returns:
+            bool: True if the sequence was queued, False if it was dropped
+            because the queue had no room for all of it.
+        """
+        return self.__tones.play_sequence(steps)
+
+    def play_pattern(self, pattern):
+        """
+        Loop an accessible signal pattern until another one is selected.
+
+        Switching pattern takes effect at once and discards queued tones.
+        Selecting the pattern already playing does nothing, so this can be
+        called on every tick.
+
+        Args:
+            pattern (array): Compiled pattern, e.g. pattern_player.LOCATOR,
+                or None to stop.
+        """
+        player = self.__player
+        if player is None:
+            if pattern is None:
+                return
+            player = PatternPlayer(self.__envelope, None, self.__clock)
+            self.__player = player
+        self.__check_schedule()
+        if pattern is not player.pattern:
+            if self.__debug:
+                print("Pattern switched")
+            self.__tones.stop()
+            player.select(pattern)
+        else:
+            player.service()
+
+    @property
+    def volume(self):
+        """
+        Get or set the buzzer volume in percent (0-100).
+
+        A volume schedule, if given, overrides this at its next check.
+        """
+        return self.__envelope.volume
+
+    @volume.setter
+    def volume(self, percent):
+        self.__envelope.volume = percent
+
+    def __check_schedule(self):
+        """
+        Apply the scheduled volume, at most once a minute.
+        """
+        if self.__schedule is None:
+            return
+        now = self.__clock.ticks_ms()
+        checked = self.__schedule_checked
+        if (
+            checked is not None
+            and self.__clock.ticks_diff(now, checked) < self.SCHEDULE_CHECK_MS
+        ):
+            return
+        self.__schedule_checked = now
+        volume = self.__schedule.current_volume()
+        if volume != self.__envelope.volume:
+            if self.__debug:
+                print("Volume " + str(volume) + "%")
+            self.__envelope.volume = volume
+
+    def tone_stats(self):
+        """
+        Get the tone engine counters.
+
+        Returns:
+            tuple: (played, dropped) tones started and sequences dropped.
+        """
+        return self.__tones.stats()
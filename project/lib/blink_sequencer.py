@@ -0,0 +1,264 @@
+from array import array
+from clock import system_clock
+
+try:
+    from machine import Timer, disable_irq, enable_irq
+except ImportError:
+    Timer = None
+
+    def disable_irq():
+        return None
+
+    def enable_irq(state):
+        pass
+
+
+SLOT_MS = 50  # Default time slot of compiled patterns
+
+
+def compile_blink(segments, slot_ms=SLOT_MS):
+    """Compile a blink pattern into a bit-packed array of time slots.
+
+    Args:
+        segments (sequence): (level, duration_ms) tuples, level 1 for on
+            and 0 for off. Durations are rounded to whole slots (at least 1).
+        slot_ms (int, optional): Length of one slot. Defaults to SLOT_MS.
+
+    Returns:
+        tuple: (slot_ms, slot_count, bits) where bit n of bits (LSB first)
+        is the lamp level during slot n.
+
+    Raises:
+        ValueError: If the pattern has no segments.
+    """
+    if not segments:
+        raise ValueError("blink pattern has no segments")
+    levels = []
+    for level, duration_ms in segments:
+        slots = max(1, (duration_ms + slot_ms // 2) // slot_ms)
+        levels.extend([1 if level else 0] * slots)
+    bits = bytearray((len(levels) + 7) // 8)
+    for n, level in enumerate(levels):
+        if level:
+            bits[n >> 3] |= 1 << (n & 7)
+    return slot_ms, len(levels), bits
+
+
+def fault_code(count, slot_ms=SLOT_MS):
+    """Compile a fault code: count short blinks, then a long pause.
+
+    Args:
+        count (int): Number of blinks.
+        slot_ms (int, optional): Length of one slot. Defaults to SLOT_MS.
+
+    Returns:
+        tuple: Compiled pattern, see compile_blink().
+    """
+    return compile_blink(((1, 200), (0, 300)) * count + ((0, 1500),), slot_ms)
+
+
+FLASH = compile_blink(((1, 500), (0, 500)))
+HEARTBEAT = compile_blink(((1, 100), (0, 100), (1, 100), (0, 700)))
+DOUBLE_BLINK = fault_code(2)
+
+
+class BlinkSequencer:
+    """Plays compiled blink patterns on any number of lamps from one timer.
+
+    A periodic timer runs once per slot. Its callback advances every lamp's
+    position in its pattern, reads the level bit and only calls on() or
+    off() when the level changes. Positions and levels live in preallocated
+    arrays, so playback never allocates. If a callback runs a slot or more
+    late, the missed slots are skipped to stay in time and counted as late,
+    which shows whether the slot length suits the board's load.
+
+    Args:
+        slot_ms (int, optional): Slot length, must match the patterns'.
+            Defaults to SLOT_MS.
+        max_lamps (int, optional): Lamps that can be assigned. Defaults to 8.
+        timer (Timer, optional): Periodic timer. Defaults to a new
+            machine.Timer, or deadline mode on the host.
+        clock (Clock, optional): Time source. Defaults to the system clock.
+    """
+
+    def __init__(self, slot_ms=SLOT_MS, max_lamps=8, timer=None, clock=None):
+        """Initialize the BlinkSequencer object.
+
+        Args:
+            slot_ms (int, optional): Slot length, must match the patterns'.
+                Defaults to SLOT_MS.
+            max_lamps (int, optional): Lamps that can be assigned. Defaults to 8.
+            timer (Timer, optional): Periodic timer. Defaults to a new
+                machine.Timer, or None on the host, in which case service()
+                must be called to play the slots.
+            clock (Clock, optional): Time source. Defaults to the system clock.
+        """
+        if timer is None and Timer is not None:
+            timer = Timer()
+        self.__slot_ms = slot_ms
+        self.__timer = timer
+        self.__clock = clock if clock is not None else system_clock
+        self.__lamps = [None] * max_lamps
+        self.__bits = [None] * max_lamps
+        self.__lengths = array("H", [0] * max_lamps)
+        self.__positions = array("H", [0] * max_lamps)
+        self.__levels = bytearray(max_lamps)
+        self.__count = 0
+        self.__due = 0
+        self.__running = False
+        self.__slots = 0
+        self.__late = 0
+        # Bound once so arming the timer does not allocate
+        self.__on_timer = self.__timer_tick
+
+    def assign(self, lamp, pattern):
+        """Play a pattern on a lamp, replacing any pattern it had.
+
+        The pattern starts from its first slot, which is shown at once.
+
+        Args:
+            lamp (Led_Light): Lamp with on() and off().
+            pattern (tuple): Compiled pattern from compile_blink().
+
+        Raises:
+            ValueError: If the pattern slot length differs from the
+                sequencer's, or every lamp slot is taken.
+        """
+        slot_ms, length, bits = pattern
+        if slot_ms != self.__slot_ms:
+            raise ValueError("pattern slot length does not match the sequencer")
+        irq_state = disable_irq()
+        index = self.__index(lamp)
+        if index < 0:
+            if self.__count == len(self.__lamps):
+                enable_irq(irq_state)
+                raise ValueError("no free lamp slot in the sequencer")
+            index = self.__count
+            self.__lamps[index] = lamp
+            self.__count += 1
+        self.__bits[index] = bits
+        self.__lengths[index] = length
+        self.__positions[index] = 0
+        level = bits[0] & 1
+        self.__levels[index] = level
+        enable_irq(irq_state)
+        if level:
+            lamp.on()
+        else:
+            lamp.off()
+
+    def remove(self, lamp):
+        """Stop playing a pattern on a lamp, leaving it off.
+
+        Args:
+            lamp (Led_Light): An assigned lamp.
+        """
+        irq_state = disable_irq()
+        index = self.__index(lamp)
+        if index >= 0:
+            last = self.__count - 1
+            # Move the last lamp into the freed place
+            self.__lamps[index] = self.__lamps[last]
+            self.__bits[index] = self.__bits[last]
+            self.__lengths[index] = self.__lengths[last]
+            self.__positions[index] = self.__positions[last]
+            self.__levels[index] = self.__levels[last]
+            self.__lamps[last] = None
+            self.__bits[last] = None
+            self.__count = last
+        enable_irq(irq_state)
+        if index >= 0:
+            lamp.off()
+
+    def start(self):
+        """Start playing the slots."""
+        clock = self.__clock
+        self.__due = clock.ticks_add(clock.ticks_ms(), self.__slot_ms)
+        self.__running = True
+        if self.__timer is not None:
+            timer = self.__timer
+            timer.init(
+                mode=timer.PERIODIC, period=self.__slot_ms, callback=self.__on_timer
+            )
+
+    def stop(self):
+        """Stop playing, leaving every lamp as it is."""
+        self.__running = False
+        if self.__timer is not None:
+            self.__timer.deinit()
+
+    def service(self):
+        """Play any slots that are due.
+
+        Only needed when the sequencer runs without a timer; with a timer it
+        does nothing.
+        """
+        if self.__timer is None and self.__running:
+            clock = self.__clock
+            if clock.ticks_diff(clock.ticks_ms(), self.__due) >= 0:
+                self.__advance()
+
+    def ms_until_due(self):
+        """Get how long until the next slot.
+
+        Returns:
+            int or None: Milliseconds until the next slot (0 if it is due
+            now), or None when the sequencer is stopped.
+        """
+        if not self.__running:
+            return None
+        clock = self.__clock
+        return max(0, clock.ticks_diff(self.__due, clock.ticks_ms()))
+
+    def stats(self):
+        """Get the slot counters.
+
+        Returns:
+            tuple: (slots, late) slots advanced in total, and how many of
+            them were skipped because a tick ran late.
+        """
+        return self.__slots, self.__late
+
+    def reset_stats(self):
+        """Reset the slot counters to zero."""
+        self.__slots = 0
+        self.__late = 0
+
+    def __index(self, lamp):
+        """Get the position of an assigned lamp, or -1."""
+        for i in range(self.__count):
+            if self.__lamps[i] is lamp:
+                return i
+        return -1
+
+    def __timer_tick(self, timer):
+        """Timer callback: play the slot that is due."""
+        self.__advance()
+
+    def __advance(self):
+        """Move every lamp on by the slots due and apply level changes."""
+        clock = self.__clock
+        slot_ms = self.__slot_ms
+        lag = clock.ticks_diff(clock.ticks_ms(), self.__due)
+        # A timer tick can land just before the due time on the ms clock
+        if lag < -(slot_ms >> 1):
+            return
+        steps = 1
+        if lag >= slot_ms:
+            steps += lag // slot_ms
+            self.__late += steps - 1
+        self.__due = clock.ticks_add(self.__due, steps * slot_ms)
+        self.__slots += steps
+        lengths = self.__lengths
+        positions = self.__positions
+        levels = self.__levels
+        for i in range(self.__count):
+            position = (positions[i] + steps) % lengths[i]
+            positions[i] = position
+            level = (self.__bits[i][position >> 3] >> (position & 7)) & 1
+            if level != levels[i]:
+                levels[i] = level
+                if level:
+                    self.__lamps[i].on()
+                else:
+                    self.__lamps[i].off()
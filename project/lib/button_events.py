@@ -0,0 +1,138 @@
+from array import array
+
+try:
+    from machine import disable_irq, enable_irq
+except ImportError:
+
+    def disable_irq():
+        return None
+
+    def enable_irq(state):
+        pass
+
+
+# Event kinds
+PRESS = 0  # button went down
+RELEASE = 1  # button went up
+SHORT_PRESS = 2  # released before the long-press time, no second press followed
+LONG_PRESS = 3  # held for the long-press time
+DOUBLE_PRESS = 4  # second short press within the double-press window
+
+KIND_NAMES = ("press", "release", "short", "long", "double")
+
+
+class ButtonEvents:
+    """Fixed-size queue of button presses written from interrupt handlers.
+
+    Each event is (ticks_ms, pin, kind) stored in preallocated arrays, so
+    push() never allocates and is safe to call from a hard interrupt
+    handler. Unlike a Trace, the queue keeps the oldest events: when it is
+    full new presses are dropped and counted, so a slow consumer loses the
+    latest presses rather than the ones it has not yet seen. The consumer
+    empties it in bulk with drain(), e.g. once per main loop pass, which
+    gives press counts and timestamps for demand analytics. Several buttons
+    can share one queue.
+
+    Args:
+        size (int, optional): Number of events held. Defaults to 16.
+    """
+
+    def __init__(self, size=16):
+        """Initialize the ButtonEvents object.
+
+        Args:
+            size (int, optional): Number of events held. Defaults to 16.
+        """
+        self.__size = size
+        self.__times = array("I", [0] * size)
+        self.__pins = bytearray(size)
+        self.__kinds = bytearray(size)
+        self.__head = 0  # next event to drain
+        self.__count = 0
+        self.__pushed = 0
+        self.__dropped = 0
+
+    def __len__(self):
+        return self.__count
+
+    def push(self, ticks, pin, kind=PRESS):
+        """Queue an event; called from the button interrupt handler.
+
+        Args:
+            ticks (int): ticks_ms() of the event.
+            pin (int): GPIO pin number of the button.
+            kind (int, optional): Event kind, e.g. LONG_PRESS. Defaults to PRESS.
+
+        Returns:
+            bool: True if queued, False if the queue was full.
+        """
+        irq_state = disable_irq()
+        count = self.__count
+        if count == self.__size:
+            self.__dropped += 1
+            enable_irq(irq_state)
+            return False
+        i = self.__head + count
+        if i >= self.__size:
+            i -= self.__size
+        self.__times[i] = ticks
+        self.__pins[i] = pin
+        self.__kinds[i] = kind
+        self.__count = count + 1
+        self.__pushed += 1
+        enable_irq(irq_state)
+        return True
+
+    def drain(self, times, pins=None, kinds=None):
+        """Move queued events, oldest first, into caller-owned buffers.
+
+        Copies as many events as fit, so the caller can reuse the same
+        preallocated buffers every pass without allocating.
+
+        Args:
+            times (array): Receives the ticks_ms() of each event.
+            pins (bytearray, optional): Receives the pin of each event.
+                Defaults to None (pins not copied).
+            kinds (bytearray, optional): Receives the kind of each event.
+                Defaults to None (kinds not copied).
+
+        Returns:
+            int: Number of events copied.
+        """
+        limit = len(times)
+        if pins is not None:
+            limit = min(limit, len(pins))
+        if kinds is not None:
+            limit = min(limit, len(kinds))
+        irq_state = disable_irq()
+        n = min(limit, self.__count)
+        i = self.__head
+        for k in range(n):
+            times[k] = self.__times[i]
+            if pins is not None:
+                pins[k] = self.__pins[i]
+            if kinds is not None:
+                kinds[k] = self.__kinds[i]
+            i += 1
+            if i == self.__size:
+                i = 0
+        self.__head = i
+        self.__count -= n
+        enable_irq(irq_state)
+        return n
+
+    def clear(self):
+        """Discard every queued event."""
+        irq_state = disable_irq()
+        self.__head = 0
+        self.__count = 0
+        enable_irq(irq_state)
+
+    def stats(self):
+        """Get the queue counters.
+
+        Returns:
+            tuple: (pushed, dropped) events queued and events lost to a
+            full queue, since the object was created.
+        """
+        return self.__pushed, self.__dropped
@@ -0,0 +1,151 @@
+try:
+    from time import sleep_ms, ticks_add, ticks_diff, ticks_ms, ticks_us
+except ImportError:
+    # CPython on the host has no tick counters, so emulate MicroPython's:
+    # values wrap at TICKS_PERIOD and must be compared with ticks_diff().
+    from time import monotonic_ns, sleep
+
+    TICKS_PERIOD = 1 << 30
+    _TICKS_MAX = TICKS_PERIOD - 1
+    _TICKS_HALFPERIOD = TICKS_PERIOD // 2
+
+    def ticks_ms():
+        return (monotonic_ns() // 1000000) & _TICKS_MAX
+
+    def ticks_us():
+        return (monotonic_ns() // 1000) & _TICKS_MAX
+
+    def ticks_add(ticks, delta):
+        return (ticks + delta) & _TICKS_MAX
+
+    def ticks_diff(ticks1, ticks2):
+        return ((ticks1 - ticks2 + _TICKS_HALFPERIOD) & _TICKS_MAX) - _TICKS_HALFPERIOD
+
+    def sleep_ms(ms):
+        sleep(ms / 1000)
+
+else:
+    TICKS_PERIOD = 1 << 30
+
+_TICKS_MASK = TICKS_PERIOD - 1
+
+
+class Clock:
+    """Millisecond clock built on the wraparound-safe tick counters.
+
+    Classes that need timing take a clock as an optional dependency so the
+    same code runs against the hardware ticks on the Pico or a VirtualClock
+    on the host. Tick values wrap, so elapsed time must always be measured
+    with ticks_diff() rather than by subtracting.
+    """
+
+    def ticks_ms(self):
+        """Get the current time in milliseconds.
+
+        Returns:
+            int: Wrapping millisecond tick count.
+        """
+        return ticks_ms()
+
+    def ticks_us(self):
+        """Get the current time in microseconds.
+
+        Returns:
+            int: Wrapping microsecond tick count.
+        """
+        return ticks_us()
+
+    def ticks_diff(self, ticks1, ticks2):
+        """Get the signed difference ticks1 - ticks2, allowing for wraparound.
+
+        Args:
+            ticks1 (int): Later tick value.
+            ticks2 (int): Earlier tick value.
+
+        Returns:
+            int: Difference in ticks.
+        """
+        return ticks_diff(ticks1, ticks2)
+
+    def ticks_add(self, ticks, delta):
+        """Offset a tick value, allowing for wraparound.
+
+        Args:
+            ticks (int): Tick value.
+            delta (int): Number of ticks to add, may be negative.
+
+        Returns:
+            int: The offset tick value.
+        """
+        return ticks_add(ticks, delta)
+
+    def sleep_ms(self, ms):
+        """Block for the given number of milliseconds.
+
+        Args:
+            ms (int): Time to sleep in milliseconds.
+        """
+        sleep_ms(ms)
+
+
+class VirtualClock(Clock):
+    """Clock that only moves when told to, for host simulations.
+
+    Sleeping advances the virtual time instantly, so hours of crossing
+    cycles can be fast-forwarded. Ticks wrap at the same period as the
+    hardware counters so wraparound handling is exercised too.
+
+    Args:
+        start_ms (int, optional): Initial time in milliseconds. Defaults to 0.
+    """
+
+    def __init__(self, start_ms=0):
+        """Initialize the VirtualClock object.
+
+        Args:
+            start_ms (int, optional): Initial time in milliseconds. Defaults to 0.
+        """
+        self.__now_us = start_ms * 1000
+
+    def ticks_ms(self):
+        """Get the virtual time in milliseconds.
+
+        Returns:
+            int: Wrapping millisecond tick count.
+        """
+        return (self.__now_us // 1000) & _TICKS_MASK
+
+    def ticks_us(self):
+        """Get the virtual time in microseconds.
+
+        Returns:
+            int: Wrapping microsecond tick count.
+        """
+        return self.__now_us & _TICKS_MASK
+
+    def sleep_ms(self, ms):
+        """Advance the virtual time instead of blocking.
+
+        Args:
+            ms (int): Time to skip in milliseconds.
+        """
+        self.__now_us += int(ms * 1000)
+
+    def advance(self, ms):
+        """Move the virtual time forward.
+
+        Args:
+            ms (int): Time to skip in milliseconds.
+        """
+        self.__now_us += int(ms * 1000)
+
+    def advance_us(self, us):
+        """Move the virtual time forward by microseconds.
+
+        Args:
+            us (int): Time to skip in microseconds.
+        """
+        self.__now_us += us
+
+
+system_clock = Clock()
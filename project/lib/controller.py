@@ -1,7 +1,50 @@
-from led_light import Led_Light
-from pedestrian_button import Pedestrian_Button
-from audio_notification import Audio_Notification
-from time import sleep, time
+from output_latch import OutputLatch
+from clock import TICKS_PERIOD, system_clock
+from event_trace import EV_STATE
+
+# ticks_diff(now, due) >= 0, inlined as a mask test for update()
+_TICKS_MASK = TICKS_PERIOD - 1
+_TICKS_HALF = TICKS_PERIOD // 2
+
+# Integer state identifiers used to index the compiled transition table
+IDLE = 0
+CHANGE = 1
+WALK = 2
+WALK_WARNING = 3
+ERROR = 4
+
+STATE_NAMES = ("IDLE", "CHANGE", "WALK", "WALK_WARNING", "ERROR")
+
+# Crossing sequence: state -> (next state, milliseconds in state before leaving,
+# whether a button press is required, whether the button is reset on exit).
+# ERROR has no entry, so the controller stays there until it is reset.
+TRANSITIONS = {
+    IDLE: (CHANGE, 5000, True, False),
+    CHANGE: (WALK, 5000, False, False),
+    WALK: (WALK_WARNING, 5000, False, False),
+    WALK_WARNING: (IDLE, 5000, False, True),
+}
+
+# Traffic light aspects as (red, amber, green) lamp states, indexed in the
+# same order as the lamps of a traffic LedBank.
+TRAFFIC_RED = 0
+TRAFFIC_AMBER = 1
+TRAFFIC_GREEN = 2
+TRAFFIC_ASPECTS = ((1, 0, 0), (0, 1, 0), (0, 0, 1))
+
+# Milliseconds between refreshes of the outputs while in ERROR
+ERROR_REFRESH_MS = 1000
+
+# Output ids used in trace records: the traffic latch owns ids 0-2 and the
+# pedestrian latch ids 3-5.
+OUTPUT_NAMES = (
+    "traffic red",
+    "traffic amber",
+    "traffic green",
+    "ped red",
+    "ped green",
+    "buzzer",
+)
 
 
 class TrafficLightSubsystem:
@@ -15,10 +58,12 @@ class TrafficLightSubsystem:
         __red (Led_Light): Red traffic light for vehicles
         __amber (Led_Light): Amber traffic light for vehicles
         __green (Led_Light): Green traffic light for vehicles
+        __latch (OutputLatch): Last commanded state of red, amber and green
+        __bank (LedBank): Optional bank switching all three lamps in one write
         __debug (bool): Whether to print debug statements
     """
 
-    def __init__(self, red, amber, green, debug=False):
+    def __init__(self, red, amber, green, debug=False, bank=None, trace=None):
         """
         Initialize the traffic light subsystem.
 
@@ -27,10 +72,17 @@ class TrafficLightSubsystem:
             amber (Led_Light): Amber traffic light for vehicles
             green (Led_Light): Green traffic light for vehicles
             debug (bool, optional): Enable debug output. Defaults to False.
+            bank (LedBank, optional): Bank of (red, amber, green) used to
+                change aspect in a single write. Defaults to None, which
+                switches the lamps one at a time.
+            trace (Trace, optional): Trace that records lamp changes.
+                Defaults to None.
         """
         self.__red = red
         self.__amber = amber
         self.__green = green
+        self.__latch = OutputLatch(3, trace, 0)
+        self.__bank = bank
         self.__debug = debug
 
     def show_red(self):
@@ -41,9 +93,7 @@ class TrafficLightSubsystem:
         """
         if self.__debug:
             print("Traffic: Red ON")
-        self.__red.on()
-        self.__amber.off()
-        self.__green.off()
+        self.__show(TRAFFIC_RED)
 
     def show_amber(self):
         """
@@ -53,9 +103,7 @@ class TrafficLightSubsystem:
         """
         if self.__debug:
             print("Traffic: Amber ON")
-        self.__red.off()
-        self.__amber.on()
-        self.__green.off()
+        self.__show(TRAFFIC_AMBER)
 
     def show_green(self):
         """
@@ -65,9 +113,52 @@ class TrafficLightSubsystem:
         """
         if self.__debug:
             print("Traffic: Green ON")
-        self.__red.off()
-        self.__amber.off()
-        self.__green.on()
+        self.__show(TRAFFIC_GREEN)
+
+    def __show(self, aspect):
+        """
+        Light the lamp for an aspect and turn the other two off.
+
+        Only lamps whose state changes are written. With a bank, any change
+        is applied to all three lamps in one write so no two are ever lit
+        together.
+
+        Args:
+            aspect (int): TRAFFIC_RED, TRAFFIC_AMBER or TRAFFIC_GREEN
+        """
+        red, amber, green = TRAFFIC_ASPECTS[aspect]
+        latch = self.__latch
+        red_changed = latch.changed(0, red)
+        amber_changed = latch.changed(1, amber)
+        green_changed = latch.changed(2, green)
+        if self.__bank is not None:
+            if red_changed or amber_changed or green_changed:
+                self.__bank.show(aspect)
+            return
+        if red_changed:
+            if red:
+                self.__red.on()
+            else:
+                self.__red.off()
+        if amber_changed:
+            if amber:
+                self.__amber.on()
+            else:
+                self.__amber.off()
+        if green_changed:
+            if green:
+                self.__green.on()
+            else:
+                self.__green.off()
+
+    def write_stats(self):
+        """
+        Get the number of lamp writes issued and suppressed by the latch.
+
+        Returns:
+            tuple: (issued, suppressed) lamp writes.
+        """
+        return self.__latch.stats()
 
 
 class PedestrianSubsystem:
@@ -82,10 +173,14 @@ class PedestrianSubsystem:
         __green (Led_Light): Green pedestrian light (walk)
         __button (Pedestrian_Button): Button for pedestrians to request crossing
         __buzzer (Audio_Notification): Audible notification device
+        __latch (OutputLatch): Last commanded state of red, green and buzzer
+        __patterns (tuple): Optional (stop, walk, warning) buzzer patterns
         __debug (bool): Whether to print debug statements
     """
 
-    def __init__(self, red, green, button, buzzer, debug=False):
+    def __init__(
+        self, red, green, button, buzzer, debug=False, trace=None, patterns=None
+    ):
         """
         Initialize the pedestrian subsystem.
 
@@ -95,13 +190,35 @@ class PedestrianSubsystem:
             button (Pedestrian_Button): Crossing request button
             buzzer (Audio_Notification): Audible notification device
             debug (bool, optional): Enable debug output. Defaults to False.
+            trace (Trace, optional): Trace that records lamp and buzzer
+                changes. Defaults to None.
+            patterns (tuple, optional): Compiled (stop, walk, warning)
+                accessible signal patterns, see pattern_player. Defaults to
+                None, which keeps the warning beep during walk only.
         """
         self.__red = red
         self.__green = green
         self.__button = button
         self.__buzzer = buzzer
+        self.__latch = OutputLatch(3, trace, 3)
+        # A lamp with a flash backend keeps flashing without flash() calls
+        self.__red_self_timed = getattr(red, "self_timed", False)
+        self.__patterns = patterns
         self.__debug = debug
 
+    def __play_pattern(self, phase):
+        """
+        Select the buzzer pattern for a phase.
+
+        The pattern player keeps its own timing, so the buzzer is left
+        free-running and the selection is made every tick.
+
+        Args:
+            phase (int): 0 for stop, 1 for walk, 2 for warning.
+        """
+        self.__latch.release(2)
+        self.__buzzer.play_pattern(self.__patterns[phase])
+
     def show_stop(self):
         """
         Show 'don't walk' signal to pedestrians.
@@ -111,9 +228,14 @@ class PedestrianSubsystem:
         """
         if self.__debug:
             print("Pedestrian: Red ON")
-        self.__red.on()
-        self.__green.off()
-        self.__buzzer.warning_off()
+        if self.__latch.changed(0, 1):
+            self.__red.on()
+        if self.__latch.changed(1, 0):
+            self.__green.off()
+        if self.__patterns is not None:
+            self.__play_pattern(0)
+        elif self.__latch.changed(2, 0):
+            self.__buzzer.warning_off()
 
     def show_walk(self):
         """
@@ -124,8 +246,15 @@ class PedestrianSubsystem:
         """
         if self.__debug:
             print("Pedestrian: Green ON")
-        self.__red.off()
-        self.__green.on()
+        if self.__latch.changed(0, 0):
+            self.__red.off()
+        if self.__latch.changed(1, 1):
+            self.__green.on()
+        if self.__patterns is not None:
+            self.__play_pattern(1)
+            return
+        # The buzzer keeps its own beep cadence, so it is called every tick
+        self.__latch.release(2)
         self.__buzzer.warning_on()
 
     def show_warning(self):
@@ -136,9 +265,20 @@ class PedestrianSubsystem:
         """
         if self.__debug:
             print("Pedestrian: Warning")
-        self.__red.flash()
-        self.__green.off()
-        self.__buzzer.warning_off()
+        if self.__red_self_timed:
+            # Latched as free-running, so the backend is started only once
+            if self.__latch.changed(0, 2):
+                self.__red.flash()
+        else:
+            # Flashing toggles the red light itself, so it is called every tick
+            self.__latch.release(0)
+            self.__red.flash()
+        if self.__latch.changed(1, 0):
+            self.__green.off()
+        if self.__patterns is not None:
+            self.__play_pattern(2)
+        elif self.__latch.changed(2, 0):
+            self.__buzzer.warning_off()
 
     def is_button_pressed(self):
         """
@@ -153,9 +293,23 @@ class PedestrianSubsystem:
         """
         Reset the pedestrian crossing button state.
 
-        Called after the crossing cycle completes to reset for next use.
+        Called after the crossing cycle completes to reset for next use. The
+        flag is read and cleared with the button's atomic take_press(), so an
+        interrupt cannot set it between the two.
+
+        Returns:
+            bool: True if a press made during the cycle was discarded.
         """
-        self.__button.button_state = False
+        return self.__button.take_press()
+
+    def write_stats(self):
+        """
+        Get the number of output writes issued and suppressed by the latch.
+
+        Returns:
+            tuple: (issued, suppressed) lamp and buzzer writes.
+        """
+        return self.__latch.stats()
 
 
 class Controller:
@@ -170,8 +324,16 @@ class Controller:
         __traffic_lights (TrafficLightSubsystem): Manages vehicle traffic signals
         __pedestrian_signals (PedestrianSubsystem): Manages pedestrian signals
         __debug (bool): Whether to print debug statements
-        state (str): Current state of the crossing system
-        __last_state_change (float): Timestamp of the last state transition
+        __state (int): Current state of the crossing system, see STATE_NAMES
+        __has_patterns (bool): Whether the buzzer plays accessible signal patterns
+        __table (tuple): Compiled transition table indexed by state
+        __row (tuple): Row of __table for the current state
+        __clock (Clock): Time source for phase timing
+        __trace (Trace): Optional trace of state transitions
+        __profiler (TickProfiler): Optional per-state tick duration histogram
+        __last_state_change (int): Tick count (ms) of the last state transition
+        __due (int): Tick count (ms) from which the current state may be left,
+            or in ERROR when the outputs are next refreshed
     """
 
     def __init__(
@@ -184,6 +346,11 @@ class Controller:
         button,
         buzzer,
         debug=False,
+        traffic_bank=None,
+        clock=None,
+        trace=None,
+        profiler=None,
+        patterns=None,
     ):
         """
         Initialize the crossing controller.
@@ -197,19 +364,123 @@ class Controller:
             button (Pedestrian_Button): Pedestrian crossing button
             buzzer (Audio_Notification): Crossing buzzer
             debug (bool, optional): Enable debug output. Defaults to False.
+            traffic_bank (LedBank, optional): Bank of the traffic red, amber
+                and green lights for single-write aspect changes.
+            clock (Clock, optional): Time source. Defaults to the system clock.
+            trace (Trace, optional): Trace that records state transitions
+                and output changes. Defaults to None.
+            profiler (TickProfiler, optional): Profiler that records how long
+                every update() takes. Defaults to None.
+            patterns (tuple, optional): Compiled (stop, walk, warning) buzzer
+                patterns for an accessible signal. Defaults to None.
         """
         # Initialize subsystems
         self.__traffic_lights = TrafficLightSubsystem(
-            traffic_red, traffic_amber, traffic_green, debug
+            traffic_red, traffic_amber, traffic_green, debug, traffic_bank, trace
         )
         self.__pedestrian_signals = PedestrianSubsystem(
-            ped_red, ped_green, button, buzzer, debug
+            ped_red, ped_green, button, buzzer, debug, trace, patterns
         )
 
         # Other controller attributes
         self.__debug = debug
-        self.state = "IDLE"
-        self.__last_state_change = time()
+        self.__state = IDLE
+        self.__clock = clock if clock is not None else system_clock
+        self.__trace = trace
+        self.__profiler = profiler
+        self.__has_patterns = patterns is not None
+        self.__table = self.__compile_table(TRANSITIONS)
+        self.__row = self.__table[IDLE]
+        # Bound once so update() does not look them up on every tick
+        self.__ticks_ms = self.__clock.ticks_ms
+        self.__button_pressed = self.__pedestrian_signals.is_button_pressed
+        self.__mark(self.__clock.ticks_ms())
+        if profiler is not None:
+            # Timing is only paid for when asked for
+            self.update = self.__profiled_update
+
+    def __compile_table(self, transitions):
+        """
+        Compile the transition specification into a table indexed by state.
+
+        Each row is a tuple of (state action, milliseconds in state, next state,
+        button required, reset button on exit). States without a transition
+        get a duration of None so update() never leaves them.
+
+        Args:
+            transitions (dict): Mapping of state to transition, see TRANSITIONS
+
+        Returns:
+            tuple: One row per state in STATE_NAMES order.
+        """
+        actions = (
+            self.set_idle_state,
+            self.set_change_state,
+            self.set_walk_state,
+            self.set_warning_state,
+            self.__error_tick,
+        )
+        table = []
+        for state in range(len(STATE_NAMES)):
+            if state in transitions:
+                next_state, duration, needs_button, resets_button = transitions[state]
+                table.append(
+                    (actions[state], duration, next_state, needs_button, resets_button)
+                )
+            else:
+                table.append((actions[state], None, state, False, False))
+        return tuple(table)
+
+    @property
+    def state(self):
+        """
+        Get the name of the current state.
+
+        Returns:
+            str: One of the names in STATE_NAMES.
+        """
+        return STATE_NAMES[self.__state]
+
+    @state.setter
+    def state(self, value):
+        """
+        Force the controller into a state.
+
+        Unknown names put the controller into the ERROR state.
+
+        Args:
+            value (str or int): State name or state identifier
+        """
+        if value in STATE_NAMES:
+            value = STATE_NAMES.index(value)
+        elif not (isinstance(value, int) and 0 <= value < len(STATE_NAMES)):
+            value = ERROR
+        self.__state = value
+        self.__row = self.__table[value]
+        self.__mark(self.__clock.ticks_ms())
+        if self.__trace is not None:
+            self.__trace.record(EV_STATE, value)
+
+    @property
+    def has_patterns(self):
+        """
+        Check whether the buzzer plays accessible signal patterns.
+
+        Returns:
+            bool: True if the buzzer runs patterns, which keep their own
+            timing, rather than the warning beep during walk.
+        """
+        return self.__has_patterns
+
+    @property
+    def state_id(self):
+        """
+        Get the integer identifier of the current state.
+
+        Returns:
+            int: One of IDLE, CHANGE, WALK, WALK_WARNING or ERROR.
+        """
+        return self.__state
 
     def set_idle_state(self):
         """
@@ -244,7 +515,6 @@ class Controller:
         self.__pedestrian_signals.show_walk()
         self.__traffic_lights.show_red()
 
-
     def set_error_state(self):
         """
         Set system to error state.
@@ -270,46 +540,130 @@ class Controller:
         - WALK: Pedestrians crossing (red traffic light, green pedestrian light)
         - WALK_WARNING: Warning that walk cycle is ending
         - Back to IDLE
+
+        The row of the compiled transition table for the current state is
+        kept, so a tick that does not change state is one timer check and
+        the state's action, with the clock and button methods bound once in
+        the constructor. The outputs of the resulting state are applied
+        afterwards, so they always match the state reported once update()
+        returns.
+
+        With a profiler, update() is replaced by a version that times the
+        whole call with ticks_us and records it against the state the
+        controller is in when it returns.
+        """
+        row = self.__row
+        if row[1] is not None:
+            current_time = self.__ticks_ms()
+            if (current_time - self.__due) & _TICKS_MASK < _TICKS_HALF and (
+                not row[3] or self.__button_pressed()
+            ):
+                row = self.__enter(row, current_time)
+        row[0]()
+
+    def __profiled_update(self):
+        """
+        Run update() and record its duration in the profiler.
+        """
+        clock = self.__clock
+        start = clock.ticks_us()
+        Controller.update(self)
+        self.__profiler.record(self.__state, clock.ticks_diff(clock.ticks_us(), start))
+
+    def __enter(self, row, current_time):
         """
-        current_time = time()
-        elapsed = current_time - self.__last_state_change
-
-        if self.state == "IDLE":
-            if self.__pedestrian_signals.is_button_pressed() and elapsed > 5:
-                self.state = "CHANGE"
-                self.__last_state_change = current_time
-                if self.__debug:
-                    print("Switching to CHANGE")
-            self.set_idle_state()
-
-        elif self.state == "CHANGE":
-            if elapsed > 5:
-                self.state = "WALK"
-                self.__last_state_change = current_time
-                if self.__debug:
-                    print("Switching to WALK")
-            self.set_change_state()
-
-        elif self.state == "WALK":
-            if elapsed > 5:
-                self.state = "WALK_WARNING"
-                self.__last_state_change = current_time
-                if self.__debug:
-                    print("Switching to WALK WARNING")
-            self.set_walk_state()
-
-        elif self.state == "WALK_WARNING":
-            if elapsed > 5:
-                self.state = "IDLE"
-                self.__last_state_change = current_time
-                self.__pedestrian_signals.reset_button()
-                if self.__debug:
-                    print("Returning to IDLE")
-            self.set_warning_state()
-
-        else:  # error state
+        Take the transition in a row.
+
+        Args:
+            row (tuple): Row of the state being left
+            current_time (int): Tick count (ms) of the transition
+
+        Returns:
+            tuple: Row of the state entered.
+        """
+        state = row[2]
+        self.__state = state
+        if row[4]:
+            self.__pedestrian_signals.reset_button()
+        if self.__trace is not None:
+            self.__trace.record(EV_STATE, state)
+        if self.__debug:
+            print("Switching to " + STATE_NAMES[state])
+        row = self.__table[state]
+        self.__row = row
+        self.__mark(current_time)
+        return row
+
+    def __mark(self, current_time):
+        """
+        Start the timer of the current state.
+
+        Args:
+            current_time (int): Tick count (ms) the state was entered
+        """
+        self.__last_state_change = current_time
+        duration = self.__row[1]
+        if duration is not None:
+            # Transitions need the elapsed time to be strictly greater
+            self.__due = self.__clock.ticks_add(current_time, duration + 1)
+        else:
+            # ERROR refreshes its outputs from the first update() on
+            self.__due = current_time
+
+    def ms_until_due(self):
+        """
+        Get how long until update() could next change state.
+
+        Event-driven runtimes use this to sleep instead of polling.
+
+        Returns:
+            int or None: Milliseconds until the current state's timer expires
+            (0 if a transition is due now), or None if the state can only be
+            left after a button press. In ERROR, milliseconds until the
+            outputs are next refreshed.
+        """
+        row = self.__row
+        duration = row[1]
+        if duration is None:
+            clock = self.__clock
+            return max(0, clock.ticks_diff(self.__due, clock.ticks_ms()))
+        now = self.__clock.ticks_ms()
+        elapsed = self.__clock.ticks_diff(now, self.__last_state_change)
+        # Transitions need the elapsed time to be strictly greater
+        remaining = duration + 1 - elapsed
+        if remaining > 0:
+            return remaining
+        if row[3] and not self.__pedestrian_signals.is_button_pressed():
+            return None
+        return 0
+
+    def output_stats(self):
+        """
+        Get the output writes issued and suppressed across both subsystems.
+
+        Useful in soak tests to confirm that repeated ticks in the same state
+        do not touch the hardware.
+
+        Returns:
+            tuple: (issued, suppressed) writes since the controller started.
+        """
+        traffic_issued, traffic_suppressed = self.__traffic_lights.write_stats()
+        ped_issued, ped_suppressed = self.__pedestrian_signals.write_stats()
+        return traffic_issued + ped_issued, traffic_suppressed + ped_suppressed
+
+    def __error_tick(self):
+        """
+        Hold the error state, refreshing the outputs every ERROR_REFRESH_MS.
+
+        Never blocks: between refreshes it returns at once, and
+        ms_until_due() tells the caller when the next refresh is due.
+        """
+        clock = self.__clock
+        now = self.__ticks_ms()
+        if clock.ticks_diff(now, self.__due) >= 0:
             self.set_error_state()
-            sleep(1)
+            self.__due = clock.ticks_add(now, ERROR_REFRESH_MS)
+
     def set_warning_state(self):
         """
         Set system to warning state - indicating walk signal ending soon.
@@ -0,0 +1,127 @@
+try:
+    import asyncio
+except ImportError:
+    import uasyncio as asyncio
+
+from clock import system_clock
+from controller import WALK, WALK_WARNING
+
+# uasyncio sleeps in milliseconds natively; CPython's asyncio only in seconds
+if hasattr(asyncio, "sleep_ms"):
+    sleep_ms = asyncio.sleep_ms
+else:
+
+    def sleep_ms(ms):
+        return asyncio.sleep(ms / 1000)
+
+
+# ThreadSafeFlag can be set from an interrupt; CPython falls back to Event
+Flag = getattr(asyncio, "ThreadSafeFlag", asyncio.Event)
+
+
+class CrossingRuntime:
+    """Event-driven runtime for the crossing controller.
+
+    Replaces the fixed 100 ms polling loop. The phase task sleeps until the
+    controller's next deadline, or until the pedestrian button interrupt
+    sets a flag, and only then calls update(). While the walk or warning
+    phase is showing, the buzzer cadence and the flashing light run as
+    their own tasks, each sleeping until its next step. When the
+    controller plays buzzer patterns there is no beep cadence, as the
+    pattern player keeps its own timing.
+
+    Args:
+        controller (Controller): The crossing controller to drive.
+        button (Pedestrian_Button): Crossing button, its press handler is used.
+        flasher (Led_Light): Light that flashes during WALK_WARNING.
+        buzzer (Audio_Notification): Buzzer that beeps during WALK.
+        clock (Clock, optional): Time source. Defaults to the system clock.
+        flash_ms (int, optional): Flash toggle period. Defaults to 500.
+        beep_ms (int, optional): Beep period. Defaults to 500.
+    """
+
+    def __init__(
+        self, controller, button, flasher, buzzer, clock=None, flash_ms=500, beep_ms=500
+    ):
+        """Initialize the CrossingRuntime object.
+
+        Args:
+            controller (Controller): The crossing controller to drive.
+            button (Pedestrian_Button): Crossing button, its press handler is used.
+            flasher (Led_Light): Light that flashes during WALK_WARNING.
+            buzzer (Audio_Notification): Buzzer that beeps during WALK.
+            clock (Clock, optional): Time source. Defaults to the system clock.
+            flash_ms (int, optional): Flash toggle period. Defaults to 500.
+            beep_ms (int, optional): Beep period. Defaults to 500.
+        """
+        self.__controller = controller
+        self.__button = button
+        self.__clock = clock if clock is not None else system_clock
+        self.__cadences = {WALK_WARNING: (flasher.flash, flash_ms)}
+        # Patterns keep their own timing, and a beep cadence would fight them
+        if not controller.has_patterns:
+            self.__cadences[WALK] = (buzzer.warning_on, beep_ms)
+        self.__flag = None
+        self.__cadence_task = None
+        self.wakeups = 0
+
+    async def run(self):
+        """Run the crossing forever (or until the task is cancelled)."""
+        self.__flag = Flag()
+        self.__button.set_press_handler(self.__flag.set)
+        controller = self.__controller
+        state = None
+        try:
+            while True:
+                self.wakeups += 1
+                controller.update()
+                if controller.state_id != state:
+                    state = controller.state_id
+                    self.__start_cadence(state)
+                wait = controller.ms_until_due()
+                if wait is None:
+                    await self.__wait_for_press()
+                elif wait > 0:
+                    await sleep_ms(wait)
+        finally:
+            self.__button.set_press_handler(None)
+            self.__stop_cadence()
+
+    async def __wait_for_press(self):
+        """Sleep until the button interrupt fires."""
+        flag = self.__flag
+        flag.clear()
+        # A press that landed before the flag was cleared is still latched
+        if self.__controller.ms_until_due() is not None:
+            return
+        await flag.wait()
+
+    def __start_cadence(self, state):
+        """Replace the running cadence task with the one for a state."""
+        self.__stop_cadence()
+        cadence = self.__cadences.get(state)
+        if cadence is not None:
+            self.__cadence_task = asyncio.create_task(self.__repeat(*cadence))
+
+    def __stop_cadence(self):
+        """Cancel the running cadence task, if any."""
+        if self.__cadence_task is not None:
+            self.__cadence_task.cancel()
+            self.__cadence_task = None
+
+    async def __repeat(self, action, period_ms):
+        """Call action every period_ms, measured from a fixed start time.
+
+        Args:
+            action (callable): Function to call each period.
+            period_ms (int): Period in milliseconds.
+        """
+        clock = self.__clock
+        due = clock.ticks_ms()
+        while True:
+            due = clock.ticks_add(due, period_ms)
+            wait = clock.ticks_diff(due, clock.ticks_ms())
+            if wait > 0:
+                await sleep_ms(wait)
+            self.wakeups += 1
+            action()
@@ -0,0 +1,168 @@
+from clock import system_clock
+from controller import CHANGE
+
+try:
+    from machine import lightsleep
+except ImportError:
+    lightsleep = None
+
+
+class DeadlineScheduler:
+    """Runs the crossing controller and sleeps until the next deadline.
+
+    Every source (the controller, flashing lights, the buzzer) reports how
+    long until it next needs attention through ms_until_due(). After each
+    update the scheduler sleeps until the earliest of those deadlines,
+    using machine.lightsleep() on the Pico. Lightsleep stops the PWM, PIO
+    and timers that play buzzer tones and flash lamps, so while any source
+    reports busy (e.g. an Audio_Notification with a tone sounding or a
+    Led_Light with a flash backend running) the scheduler waits with
+    clock.sleep_ms() instead.
+
+    A press during lightsleep is latched by the Pedestrian_Button
+    interrupt. Whether a GPIO interrupt also ends the lightsleep early
+    depends on the port and has not been verified here, so max_sleep_ms
+    bounds how long a press can wait to be acted on; lower it if presses
+    are seen late.
+
+    Awake and asleep time are measured with ticks_us and reported in total
+    and for the last complete crossing cycle, to quantify power savings.
+
+    Note: lightsleep suspends USB, so the serial console may disconnect.
+
+    Args:
+        controller (Controller): The crossing controller to drive.
+        sources (sequence, optional): Other objects with ms_until_due(),
+            e.g. the flashing Led_Light and the Audio_Notification.
+        clock (Clock, optional): Time source. Defaults to the system clock.
+        sleeper (callable, optional): Function taking milliseconds that
+            sleeps. Defaults to machine.lightsleep, or clock.sleep_ms where
+            lightsleep is not available.
+        max_sleep_ms (int, optional): Longest single sleep when no deadline
+            is pending, and so the longest a press can wait if it does not
+            wake the Pico. Defaults to 60000.
+    """
+
+    def __init__(
+        self, controller, sources=(), clock=None, sleeper=None, max_sleep_ms=60000
+    ):
+        """Initialize the DeadlineScheduler object.
+
+        Args:
+            controller (Controller): The crossing controller to drive.
+            sources (sequence, optional): Other objects with ms_until_due().
+            clock (Clock, optional): Time source. Defaults to the system clock.
+            sleeper (callable, optional): Function taking milliseconds that
+                sleeps. Defaults to machine.lightsleep or clock.sleep_ms.
+            max_sleep_ms (int, optional): Longest single sleep when no
+                deadline is pending. Defaults to 60000.
+        """
+        self.__controller = controller
+        self.__sources = [controller] + list(sources)
+        self.__clock = clock if clock is not None else system_clock
+        if sleeper is None:
+            sleeper = lightsleep if lightsleep is not None else self.__clock.sleep_ms
+        self.__sleeper = sleeper
+        self.__max_sleep_ms = max_sleep_ms
+        self.__awake_us = 0
+        self.__asleep_us = 0
+        self.__wakeups = 0
+        self.__cycle_start = None
+        self.__last_cycle = None
+        self.__state = controller.state_id
+
+    def add_source(self, source):
+        """Add another object whose ms_until_due() deadline is respected.
+
+        Args:
+            source: Object with an ms_until_due() method.
+        """
+        self.__sources.append(source)
+
+    def next_due_ms(self):
+        """Get the time until the earliest pending deadline.
+
+        Returns:
+            int or None: Milliseconds until the earliest deadline, or None
+            if nothing is due until an interrupt arrives.
+        """
+        earliest = None
+        for source in self.__sources:
+            due = source.ms_until_due()
+            if due is not None and (earliest is None or due < earliest):
+                earliest = due
+        return earliest
+
+    def run_once(self):
+        """Update the controller, then sleep until the next deadline.
+
+        The sleeper is only used when no source is busy; otherwise the wait
+        is an idle clock.sleep_ms() so sounding tones are not cut off.
+        """
+        clock = self.__clock
+        start = clock.ticks_us()
+        self.__wakeups += 1
+        self.__controller.update()
+        self.__track_cycle()
+        wait = self.next_due_ms()
+        if wait is None or wait > self.__max_sleep_ms:
+            wait = self.__max_sleep_ms
+        slept_at = clock.ticks_us()
+        self.__awake_us += clock.ticks_diff(slept_at, start)
+        if wait > 0:
+            if self.__busy():
+                clock.sleep_ms(wait)
+            else:
+                self.__sleeper(wait)
+            self.__asleep_us += clock.ticks_diff(clock.ticks_us(), slept_at)
+
+    def run(self):
+        """Run the crossing forever."""
+        while True:
+            self.run_once()
+
+    def __busy(self):
+        """Check whether any source needs the clocks kept running."""
+        for source in self.__sources:
+            if getattr(source, "busy", False):
+                return True
+        return False
+
+    def __track_cycle(self):
+        """Close the per-cycle counters when a new crossing cycle starts."""
+        state = self.__controller.state_id
+        if state != self.__state:
+            self.__state = state
+            if state == CHANGE:
+                totals = (self.__awake_us, self.__asleep_us, self.__wakeups)
+                start = self.__cycle_start
+                if start is not None:
+                    self.__last_cycle = (
+                        totals[0] - start[0],
+                        totals[1] - start[1],
+                        totals[2] - start[2],
+                    )
+                self.__cycle_start = totals
+
+    def stats(self):
+        """Get the awake and asleep time since the scheduler started.
+
+        Returns:
+            tuple: (awake_ms, asleep_ms, wakeups)
+        """
+        return self.__awake_us // 1000, self.__asleep_us // 1000, self.__wakeups
+
+    def cycle_stats(self):
+        """Get the awake and asleep time of the last complete crossing cycle.
+
+        A cycle runs from one CHANGE transition to the next, so it includes
+        the idle time waiting for the next pedestrian.
+
+        Returns:
+            tuple or None: (awake_ms, asleep_ms, wakeups), or None before
+            the second cycle has started.
+        """
+        if self.__last_cycle is None:
+            return None
+        awake_us, asleep_us, wakeups = self.__last_cycle
+        return awake_us // 1000, asleep_us // 1000, wakeups
@@ -0,0 +1,238 @@
+from array import array
+from clock import system_clock
+from button_events import PRESS, RELEASE, SHORT_PRESS, LONG_PRESS, DOUBLE_PRESS
+
+try:
+    from machine import Timer
+except ImportError:
+    Timer = None
+
+
+# Per-button flags
+_LONG_SENT = 1  # LONG_PRESS already sent for the current hold
+_SHORT_PENDING = 2  # a short press waits to see if a second one follows
+
+
+class Debouncer:
+    """Debounces and classifies any number of buttons from one periodic timer.
+
+    Every period the timer samples each button and moves its integrator one
+    step towards the level read. A button only changes state when the
+    integrator reaches its end stop, so contact chatter must last for
+    threshold samples in a row to be seen, on both the press and the
+    release edge, while a real press is still reported threshold periods
+    after it starts. Clean edges are then classified:
+
+    - PRESS and RELEASE as soon as the edges are confirmed.
+    - LONG_PRESS once a button has been held for long_ms.
+    - DOUBLE_PRESS when a second short press starts within double_ms of the
+      first one's release.
+    - SHORT_PRESS when no second press follows within double_ms.
+
+    Per-button state lives in preallocated arrays and events go to a
+    handler(ticks, pin, kind) callback, so sampling never allocates.
+
+    Args:
+        period_ms (int, optional): Sample period. Defaults to 5.
+        threshold (int, optional): Samples in a row needed to change
+            state. Defaults to 4 (20 ms at the default period).
+        long_ms (int, optional): Hold time of a long press. Defaults to 1000.
+        double_ms (int, optional): Window for a second press. Defaults to 300.
+        max_buttons (int, optional): Buttons that can be added. Defaults to 8.
+        timer (Timer, optional): Periodic timer. Defaults to a new
+            machine.Timer, or deadline mode on the host.
+        clock (Clock, optional): Time source. Defaults to the system clock.
+    """
+
+    def __init__(
+        self,
+        period_ms=5,
+        threshold=4,
+        long_ms=1000,
+        double_ms=300,
+        max_buttons=8,
+        timer=None,
+        clock=None,
+    ):
+        """Initialize the Debouncer object.
+
+        Args:
+            period_ms (int, optional): Sample period. Defaults to 5.
+            threshold (int, optional): Samples in a row needed to change
+                state. Defaults to 4.
+            long_ms (int, optional): Hold time of a long press. Defaults to 1000.
+            double_ms (int, optional): Window for a second press. Defaults to 300.
+            max_buttons (int, optional): Buttons that can be added. Defaults to 8.
+            timer (Timer, optional): Periodic timer. Defaults to a new
+                machine.Timer, or None on the host, in which case service()
+                must be called to take the samples.
+            clock (Clock, optional): Time source. Defaults to the system clock.
+        """
+        if timer is None and Timer is not None:
+            timer = Timer()
+        self.__period_ms = period_ms
+        self.__threshold = threshold
+        self.__long_ms = long_ms
+        self.__double_ms = double_ms
+        self.__timer = timer
+        self.__clock = clock if clock is not None else system_clock
+        self.__buttons = [None] * max_buttons
+        self.__handlers = [None] * max_buttons
+        self.__pins = bytearray(max_buttons)
+        self.__active = bytearray(max_buttons)
+        self.__counts = bytearray(max_buttons)
+        self.__states = bytearray(max_buttons)
+        self.__flags = bytearray(max_buttons)
+        self.__changed_at = array("I", [0] * max_buttons)
+        self.__released_at = array("I", [0] * max_buttons)
+        self.__count = 0
+        self.__due = 0
+        self.__running = False
+        self.__samples = 0
+        self.__events = 0
+        # Bound once so arming the timer does not allocate
+        self.__on_timer = self.__timer_tick
+
+    def __len__(self):
+        return self.__count
+
+    def add(self, button, handler, pin=0, active=1):
+        """Sample a button and report its events to a handler.
+
+        Args:
+            button (Pin): Input with value().
+            handler (callable): Called as handler(ticks, pin, kind) for each
+                event, from the timer callback, so it must be short and must
+                not allocate, e.g. the push() of a ButtonEvents queue.
+            pin (int, optional): Number passed to the handler to tell the
+                buttons apart. Defaults to 0.
+            active (int, optional): Level read while pressed, 0 for a button
+                wired to ground. Defaults to 1.
+
+        Raises:
+            ValueError: If every button slot is taken.
+        """
+        index = self.__count
+        if index == len(self.__buttons):
+            raise ValueError("no free button slot in the debouncer")
+        self.__buttons[index] = button
+        self.__handlers[index] = handler
+        self.__pins[index] = pin
+        self.__active[index] = active
+        self.__counts[index] = 0
+        self.__states[index] = 0
+        self.__flags[index] = 0
+        self.__count = index + 1
+
+    def start(self):
+        """Start sampling the buttons."""
+        clock = self.__clock
+        self.__due = clock.ticks_add(clock.ticks_ms(), self.__period_ms)
+        self.__running = True
+        if self.__timer is not None:
+            timer = self.__timer
+            timer.init(
+                mode=timer.PERIODIC, period=self.__period_ms, callback=self.__on_timer
+            )
+
+    @property
+    def running(self):
+        """bool: True between start() and stop()."""
+        return self.__running
+
+    def stop(self):
+        """Stop sampling the buttons."""
+        self.__running = False
+        if self.__timer is not None:
+            self.__timer.deinit()
+
+    def service(self):
+        """Take a sample if one is due.
+
+        Only needed when the debouncer runs without a timer; with a timer it
+        does nothing.
+        """
+        if self.__timer is None and self.__running:
+            clock = self.__clock
+            now = clock.ticks_ms()
+            if clock.ticks_diff(now, self.__due) >= 0:
+                self.__due = clock.ticks_add(now, self.__period_ms)
+                self.sample()
+
+    def ms_until_due(self):
+        """Get how long until the next sample.
+
+        Returns:
+            int or None: Milliseconds until the next sample (0 if it is due
+            now), or None when sampling is stopped.
+        """
+        if not self.__running:
+            return None
+        clock = self.__clock
+        return max(0, clock.ticks_diff(self.__due, clock.ticks_ms()))
+
+    def stats(self):
+        """Get the sampling counters.
+
+        Returns:
+            tuple: (samples, events) sample passes over every button and
+            events sent to the handlers.
+        """
+        return self.__samples, self.__events
+
+    def sample(self):
+        """Sample every button once and send any events that result."""
+        clock = self.__clock
+        now = clock.ticks_ms()
+        threshold = self.__threshold
+        counts = self.__counts
+        states = self.__states
+        flags = self.__flags
+        for i in range(self.__count):
+            # Integrate towards the level read, clamped to 0..threshold
+            count = counts[i]
+            if self.__buttons[i].value() == self.__active[i]:
+                if count < threshold:
+                    count += 1
+                    counts[i] = count
+            elif count:
+                count -= 1
+                counts[i] = count
+            state = states[i]
+            if state == 0 and count == threshold:
+                states[i] = 1
+                self.__changed_at[i] = now
+                self.__send(i, PRESS, now)
+                if flags[i] & _SHORT_PENDING:
+                    # A double press must not also become a long or short press
+                    flags[i] = _LONG_SENT
+                    self.__send(i, DOUBLE_PRESS, now)
+            elif state == 1 and count == 0:
+                states[i] = 0
+                self.__send(i, RELEASE, now)
+                if not flags[i] & _LONG_SENT:
+                    flags[i] = _SHORT_PENDING
+                    self.__released_at[i] = now
+                else:
+                    flags[i] = 0
+            elif state == 1:
+                if not flags[i] & _LONG_SENT and (
+                    clock.ticks_diff(now, self.__changed_at[i]) >= self.__long_ms
+                ):
+                    flags[i] |= _LONG_SENT
+                    self.__send(i, LONG_PRESS, now)
+            elif flags[i] & _SHORT_PENDING and (
+                clock.ticks_diff(now, self.__released_at[i]) >= self.__double_ms
+            ):
+                flags[i] = 0
+                self.__send(i, SHORT_PRESS, now)
+        self.__samples += 1
+
+    def __send(self, index, kind, ticks):
+        """Pass an event to a button's handler."""
+        self.__events += 1
+        self.__handlers[index](ticks, self.__pins[index], kind)
+
+    def __timer_tick(self, timer):
+        """Timer callback: sample every button."""
+        self.sample()
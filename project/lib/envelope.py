@@ -0,0 +1,226 @@
+from array import array
+
+try:
+    from machine import Timer
+except ImportError:
+    Timer = None
+
+try:
+    from time import localtime
+except ImportError:
+    localtime = None
+
+FULL_LEVEL = 256  # Envelope and volume levels are fractions of 256
+
+
+def build_ramp(steps, rising=True):
+    """Build a quadratic envelope ramp with integer maths only.
+
+    Args:
+        steps (int): Number of entries, one per envelope step.
+        rising (bool, optional): True for an attack ramp ending at
+            FULL_LEVEL, False for a decay ramp ending at 0. Defaults to True.
+
+    Returns:
+        array: Unsigned 16-bit levels from 0 to FULL_LEVEL.
+    """
+    square = steps * steps
+    if rising:
+        levels = [FULL_LEVEL * (n + 1) * (n + 1) // square for n in range(steps)]
+    else:
+        levels = [FULL_LEVEL * (steps - n - 1) ** 2 // square for n in range(steps)]
+    return array("H", levels)
+
+
+ATTACK = build_ramp(4)  # 8 ms at the default 500 Hz step rate
+DECAY = build_ramp(8, rising=False)  # 16 ms
+
+
+class Envelope:
+    """Volume control and click-free attack/decay for a PWM buzzer.
+
+    Sits between a tone source (ToneEngine, PatternPlayer) and the PWM
+    output, offering the same freq() and duty_u16() methods. A duty change
+    is scaled by the volume and, when ramps are enabled, stepped through
+    the ATTACK or DECAY lookup table by a periodic timer. An attack starts
+    at the first ATTACK step above the current level, so a tone following
+    another without a gap stays at full level. The timer only
+    runs while a ramp is in progress, and its callback uses table lookups,
+    integer multiplies and shifts only, so it never allocates.
+
+    Args:
+        output (PWM): The buzzer PWM output.
+        ramps (bool, optional): Shape tone starts and ends. Defaults to True.
+        timer (Timer, optional): Periodic timer that steps the ramps.
+            Defaults to a new machine.Timer when ramps are enabled.
+        rate_hz (int, optional): Ramp step rate. Defaults to 500.
+        volume (int, optional): Volume in percent. Defaults to 100.
+    """
+
+    def __init__(self, output, ramps=True, timer=None, rate_hz=500, volume=100):
+        """Initialize the Envelope object.
+
+        Args:
+            output (PWM): The buzzer PWM output.
+            ramps (bool, optional): Shape tone starts and ends. Defaults to
+                True. Without a timer (on the host) ramps are skipped.
+            timer (Timer, optional): Periodic timer that steps the ramps.
+                Defaults to a new machine.Timer when ramps are enabled.
+            rate_hz (int, optional): Ramp step rate. Defaults to 500.
+            volume (int, optional): Volume in percent. Defaults to 100.
+        """
+        if ramps and timer is None and Timer is not None:
+            timer = Timer()
+        self.__output = output
+        self.__timer = timer if ramps else None
+        self.__rate_hz = rate_hz
+        self.__percent = 0
+        self.__volume = 0
+        self.__duty = 0
+        self.__tone_duty = 0  # last non-zero duty, kept while decaying
+        self.__peak = 0  # tone duty scaled by the volume
+        self.__level = 0  # current envelope level, 0 to FULL_LEVEL
+        self.__release_level = 0
+        self.__index = 0
+        self.__ramping = False
+        # Bound once so arming the timer does not allocate
+        self.__on_timer = self.__step
+        self.volume = volume
+
+    @property
+    def volume(self):
+        """int: Volume in percent, 0 to 100."""
+        return self.__percent
+
+    @volume.setter
+    def volume(self, percent):
+        percent = max(0, min(100, percent))
+        self.__percent = percent
+        self.__volume = percent * FULL_LEVEL // 100
+        self.__peak = self.__tone_duty * self.__volume >> 8
+        if not self.__ramping and self.__level:
+            self.__output.duty_u16(self.__peak * self.__level >> 8)
+
+    def freq(self, value=None):
+        """Get or set the output frequency in Hz."""
+        if value is None:
+            return self.__output.freq()
+        self.__output.freq(value)
+
+    def duty_u16(self, value=None):
+        """Get or set the commanded duty.
+
+        A non-zero duty starts the attack ramp, zero starts the decay ramp.
+
+        Args:
+            value (int, optional): Duty from 0 to 65535 before volume scaling.
+
+        Returns:
+            int: The commanded duty when called without a value.
+        """
+        if value is None:
+            return self.__duty
+        self.__duty = value
+        if value:
+            self.__tone_duty = value
+            self.__peak = value * self.__volume >> 8
+        timer = self.__timer
+        if timer is None:
+            self.__level = FULL_LEVEL if value else 0
+            self.__output.duty_u16(self.__peak if value else 0)
+            return
+        if value:
+            # Continue from the current level, so a tone straight after
+            # another does not dip back to the bottom of the ramp
+            i = 0
+            while i < len(ATTACK) and ATTACK[i] <= self.__level:
+                i += 1
+            if i == len(ATTACK):
+                self.__output.duty_u16(self.__peak)
+                return
+            self.__index = i
+            self.__level = ATTACK[i]
+        elif self.__level:
+            self.__release_level = self.__level
+            self.__index = 0
+            self.__level = self.__release_level * DECAY[0] >> 8
+        else:
+            self.__output.duty_u16(0)
+            return
+        self.__output.duty_u16(self.__peak * self.__level >> 8)
+        if not self.__ramping:
+            self.__ramping = True
+            timer.init(
+                mode=timer.PERIODIC, freq=self.__rate_hz, callback=self.__on_timer
+            )
+
+    def __step(self, timer):
+        """Timer callback: move one step along the active ramp."""
+        i = self.__index + 1
+        if self.__duty:
+            if i < len(ATTACK):
+                level = ATTACK[i]
+            else:
+                level = FULL_LEVEL
+        elif i < len(DECAY):
+            level = self.__release_level * DECAY[i] >> 8
+        else:
+            level = 0
+        self.__index = i
+        self.__level = level
+        self.__output.duty_u16(self.__peak * level >> 8)
+        if level == FULL_LEVEL or level == 0:
+            self.__ramping = False
+            timer.deinit()
+
+
+class VolumeSchedule:
+    """Buzzer volume by time of day, e.g. quieter at night.
+
+    Args:
+        entries (sequence): (hour, minute, percent) tuples. Each volume
+            applies from its time until the next entry's time, and the last
+            entry carries on past midnight until the first.
+    """
+
+    def __init__(self, entries):
+        """Initialize the VolumeSchedule object.
+
+        Args:
+            entries (sequence): (hour, minute, percent) tuples.
+
+        Raises:
+            ValueError: If entries is empty.
+        """
+        if not entries:
+            raise ValueError("volume schedule has no entries")
+        self.__entries = sorted(
+            (hour * 60 + minute, percent) for hour, minute, percent in entries
+        )
+
+    def volume_at(self, hour, minute):
+        """Get the scheduled volume at a time of day.
+
+        Args:
+            hour (int): Hour, 0 to 23.
+            minute (int): Minute, 0 to 59.
+
+        Returns:
+            int: Volume in percent.
+        """
+        now = hour * 60 + minute
+        volume = self.__entries[-1][1]
+        for start, percent in self.__entries:
+            if start > now:
+                break
+            volume = percent
+        return volume
+
+    def current_volume(self):
+        """Get the scheduled volume now, from the real-time clock.
+
+        Returns:
+            int: Volume in percent.
+        """
+        now = localtime()
+        return self.volume_at(now[3], now[4])
@@ -0,0 +1,108 @@
+from array import array
+from clock import system_clock
+
+try:
+    from machine import disable_irq, enable_irq
+except ImportError:
+
+    def disable_irq():
+        return None
+
+    def enable_irq(state):
+        pass
+
+
+# Event codes
+EV_STATE = 1  # arg: new controller state id
+EV_OUTPUT = 2  # arg: (output id << 2) | level, level 2 means free-running
+EV_BUTTON = 3  # arg: GPIO pin number of the accepted press
+
+EVENT_NAMES = {EV_STATE: "state", EV_OUTPUT: "output", EV_BUTTON: "button"}
+
+
+class Trace:
+    """Fixed-size ring buffer of timestamped events for field diagnosis.
+
+    Each record is (timestamp_ms, event code, argument) stored in three
+    preallocated arrays, so record() never allocates and is safe to call
+    from a hard interrupt handler. When the buffer is full the oldest
+    records are overwritten. Use dump() to print the buffer over serial and
+    tools/trace_decode.py on the host to turn it into readable events.
+
+    Args:
+        size (int, optional): Number of records kept. Defaults to 256.
+        clock (Clock, optional): Time source. Defaults to the system clock.
+    """
+
+    def __init__(self, size=256, clock=None):
+        """Initialize the Trace object.
+
+        Args:
+            size (int, optional): Number of records kept. Defaults to 256.
+            clock (Clock, optional): Time source. Defaults to the system clock.
+        """
+        self.__clock = clock if clock is not None else system_clock
+        self.__size = size
+        self.__times = array("I", [0] * size)
+        self.__codes = bytearray(size)
+        self.__args = array("i", [0] * size)
+        self.__next = 0
+        self.__count = 0
+
+    def record(self, code, arg=0):
+        """Append an event, overwriting the oldest one when full.
+
+        Args:
+            code (int): Event code, e.g. EV_STATE.
+            arg (int, optional): Event argument. Defaults to 0.
+        """
+        irq_state = disable_irq()
+        i = self.__next
+        self.__times[i] = self.__clock.ticks_ms()
+        self.__codes[i] = code
+        self.__args[i] = arg
+        i += 1
+        self.__next = i if i < self.__size else 0
+        self.__count += 1
+        enable_irq(irq_state)
+
+    def clear(self):
+        """Discard every record."""
+        irq_state = disable_irq()
+        self.__next = 0
+        self.__count = 0
+        enable_irq(irq_state)
+
+    def stats(self):
+        """Get how many events were recorded and how many were overwritten.
+
+        Returns:
+            tuple: (recorded, overwritten) since the last clear.
+        """
+        count = self.__count
+        return count, max(0, count - self.__size)
+
+    def records(self):
+        """Get a copy of the buffered records, oldest first.
+
+        Returns:
+            list: (timestamp_ms, code, arg) tuples.
+        """
+        irq_state = disable_irq()
+        count = min(self.__count, self.__size)
+        first = (self.__next - count) % self.__size
+        enable_irq(irq_state)
+        # Records added while copying may overwrite the oldest entries
+        result = []
+        for n in range(count):
+            i = (first + n) % self.__size
+            result.append((self.__times[i], self.__codes[i], self.__args[i]))
+        return result
+
+    def dump(self):
+        """Print the buffer in the text format read by tools/trace_decode.py."""
+        recorded, overwritten = self.stats()
+        print("TRACE", recorded, overwritten)
+        for timestamp, code, arg in self.records():
+            print(timestamp, code, arg)
+        print("END")
@@ -0,0 +1,296 @@
+from clock import system_clock
+
+try:
+    from machine import Pin, Timer
+except ImportError:
+    Pin = None
+    Timer = None
+
+try:
+    import rp2
+except ImportError:
+    rp2 = None
+
+
+# State machines claimed by PioFlashers, one bit per sm_id
+PIO_STATE_MACHINES = 8
+_sm_claimed = 0
+
+
+def _release_sm(sm_id):
+    """Give a claimed PIO state machine back for other flashers."""
+    global _sm_claimed
+    _sm_claimed &= ~(1 << sm_id)
+
+
+def _claim_sm(sm_id):
+    """Claim a PIO state machine: the one given, or the lowest free one."""
+    global _sm_claimed
+    if sm_id is None:
+        sm_id = 0
+        while sm_id < PIO_STATE_MACHINES and _sm_claimed & (1 << sm_id):
+            sm_id += 1
+        if sm_id == PIO_STATE_MACHINES:
+            raise RuntimeError("no free PIO state machine")
+    elif _sm_claimed & (1 << sm_id):
+        raise ValueError("PIO state machine " + str(sm_id) + " is already in use")
+    _sm_claimed |= 1 << sm_id
+    return sm_id
+
+
+# Cycles each phase of _flash_program spends outside its delay count: the
+# set, the mov, and the final jmp that falls through (a count of n loops
+# n + 1 times). wrap() costs nothing, and the pulls only run once.
+ON_OVERHEAD = 3
+OFF_OVERHEAD = 3
+
+
+def flash_counts(cycles, on_cycles):
+    """Get the delay counts _flash_program needs for an exact waveform.
+
+    Args:
+        cycles (int): State machine cycles in one on/off period.
+        on_cycles (int): Cycles of the period spent on.
+
+    Returns:
+        tuple: The on and off counts to put in the FIFO. Phases shorter than
+        their overhead are stretched to it.
+    """
+    return max(0, on_cycles - ON_OVERHEAD), max(0, cycles - on_cycles - OFF_OVERHEAD)
+
+
+if rp2 is not None:
+
+    @rp2.asm_pio(set_init=rp2.PIO.OUT_LOW)
+    def _flash_program():
+        # The on and off counts are pulled once, then the pin toggles forever
+        pull()
+        mov(isr, osr)
+        pull()
+        wrap_target()
+        set(pins, 1)
+        mov(x, isr)
+        label("on")
+        jmp(x_dec, "on")
+        set(pins, 0)
+        mov(x, osr)
+        label("off")
+        jmp(x_dec, "off")
+        wrap()
+
+
+class PioFlasher:
+    """Flashes a pin from an RP2040 PIO state machine, with no CPU use.
+
+    Once started, the state machine toggles the pin with the commanded
+    period and duty until stopped, however busy or blocked the CPU is.
+    Each flasher claims its own state machine, so several lamps can flash
+    at once.
+
+    Args:
+        pin (int): GPIO pin number of the lamp.
+        sm_id (int, optional): PIO state machine to use (0-7). Defaults to
+            None, which claims the lowest one no other flasher uses.
+        freq (int, optional): State machine clock in Hz, which sets the
+            timing resolution. Defaults to 10000 (0.1 ms).
+    """
+
+    def __init__(self, pin, sm_id=None, freq=10000):
+        """Initialize the PioFlasher object.
+
+        Args:
+            pin (int): GPIO pin number of the lamp.
+            sm_id (int, optional): PIO state machine to use (0-7). Defaults
+                to None, which claims the lowest free one.
+            freq (int, optional): State machine clock in Hz. Defaults to 10000.
+
+        Raises:
+            RuntimeError: If the board has no PIO (not an RP2040), or all
+                state machines are claimed.
+            ValueError: If sm_id is already claimed by another flasher.
+        """
+        if rp2 is None:
+            raise RuntimeError("PIO flashing needs an RP2040")
+        self.__pin = pin
+        self.__sm_id = _claim_sm(sm_id)
+        self.__freq = freq
+        self.__sm = None
+
+    @property
+    def running(self):
+        """bool: True while the state machine is flashing the pin."""
+        return self.__sm is not None
+
+    def start(self, period_ms, duty_percent=50):
+        """Start flashing, replacing any waveform already running.
+
+        Args:
+            period_ms (int): Time of one on/off cycle in milliseconds.
+            duty_percent (int, optional): Share of the period spent on.
+                Defaults to 50.
+        """
+        self.stop()
+        cycles = period_ms * self.__freq // 1000
+        on_cycles = cycles * duty_percent // 100
+        sm = rp2.StateMachine(
+            self.__sm_id, _flash_program, freq=self.__freq, set_base=Pin(self.__pin)
+        )
+        on_count, off_count = flash_counts(cycles, on_cycles)
+        sm.put(on_count)
+        sm.put(off_count)
+        sm.active(1)
+        self.__sm = sm
+
+    def stop(self):
+        """Stop flashing and hand the pin back to normal GPIO, driven low."""
+        if self.__sm is None:
+            return
+        self.__sm.active(0)
+        self.__sm = None
+        Pin(self.__pin, Pin.OUT, value=0)
+
+    def deinit(self):
+        """Stop flashing and release the state machine for other flashers.
+
+        The flasher must not be started again afterwards.
+        """
+        self.stop()
+        if self.__sm_id is not None:
+            rp2.StateMachine(self.__sm_id).active(0)
+            _release_sm(self.__sm_id)
+            self.__sm_id = None
+
+
+class TimerFlasher:
+    """Flashes a pin from machine.Timer callbacks, for boards without PIO.
+
+    Each callback sets the pin and arms a one-shot timer for the rest of
+    the on or off phase, so flashing continues while the main loop is busy
+    (though a long hard interrupt can still delay it).
+
+    Args:
+        pin (int): GPIO pin number of the lamp.
+        timer (Timer, optional): One-shot timer. Defaults to a new machine.Timer.
+    """
+
+    def __init__(self, pin, timer=None):
+        """Initialize the TimerFlasher object.
+
+        Args:
+            pin (int): GPIO pin number of the lamp.
+            timer (Timer, optional): One-shot timer. Defaults to a new machine.Timer.
+        """
+        self.__pin = Pin(pin, Pin.OUT)
+        self.__timer = timer if timer is not None else Timer()
+        self.__on_ms = 0
+        self.__off_ms = 0
+        self.__level = 0
+        self.__running = False
+        # Bound once so arming the timer does not allocate
+        self.__on_timer = self.__toggle
+
+    @property
+    def running(self):
+        """bool: True while the timer is flashing the pin."""
+        return self.__running
+
+    def start(self, period_ms, duty_percent=50):
+        """Start flashing, replacing any waveform already running.
+
+        Args:
+            period_ms (int): Time of one on/off cycle in milliseconds.
+            duty_percent (int, optional): Share of the period spent on.
+                Defaults to 50.
+        """
+        self.__on_ms = max(1, period_ms * duty_percent // 100)
+        self.__off_ms = max(1, period_ms - self.__on_ms)
+        self.__running = True
+        self.__level = 0
+        self.__toggle(self.__timer)
+
+    def stop(self):
+        """Stop flashing with the pin driven low."""
+        self.__running = False
+        self.__timer.deinit()
+        self.__pin.value(0)
+
+    def deinit(self):
+        """Stop flashing; the timer is left free for other uses."""
+        self.stop()
+
+    def __toggle(self, timer):
+        """Timer callback: switch phase and arm the timer for its length."""
+        if not self.__running:
+            return
+        level = 1 - self.__level
+        self.__level = level
+        self.__pin.value(level)
+        period = self.__on_ms if level else self.__off_ms
+        timer.init(mode=timer.ONE_SHOT, period=period, callback=self.__on_timer)
+
+
+class RecordingFlasher:
+    """Host stand-in for a flash backend that records the commanded waveform.
+
+    Attributes:
+        commands (list): (ticks_ms, period_ms, duty_percent) for each start
+            and (ticks_ms, None, None) for each stop, in order.
+
+    Args:
+        clock (Clock, optional): Time source. Defaults to the system clock.
+    """
+
+    def __init__(self, clock=None):
+        """Initialize the RecordingFlasher object.
+
+        Args:
+            clock (Clock, optional): Time source. Defaults to the system clock.
+        """
+        self.__clock = clock if clock is not None else system_clock
+        self.commands = []
+
+    @property
+    def running(self):
+        """bool: True between a start() and the following stop()."""
+        return bool(self.commands) and self.commands[-1][1] is not None
+
+    def start(self, period_ms, duty_percent=50):
+        """Record the start of a waveform.
+
+        Args:
+            period_ms (int): Time of one on/off cycle in milliseconds.
+            duty_percent (int, optional): Share of the period spent on.
+                Defaults to 50.
+        """
+        self.commands.append((self.__clock.ticks_ms(), period_ms, duty_percent))
+
+    def stop(self):
+        """Record the end of the waveform."""
+        if self.running:
+            self.commands.append((self.__clock.ticks_ms(), None, None))
+
+    def deinit(self):
+        """Record the end of the waveform, as stop() does."""
+        self.stop()
+
+    def level_at(self, ticks_ms):
+        """Get the pin level the recorded waveform gives at a time.
+
+        Args:
+            ticks_ms (int): Time from the same clock as the recording.
+
+        Returns:
+            int: 1 if the pin would be high, 0 if low.
+        """
+        level = 0
+        clock = self.__clock
+        for started, period_ms, duty_percent in self.commands:
+            elapsed = clock.ticks_diff(ticks_ms, started)
+            if elapsed < 0:
+                break
+            if period_ms is None:
+                level = 0
+            else:
+                phase = elapsed % period_ms
+                level = 1 if phase < period_ms * duty_percent // 100 else 0
+        return level
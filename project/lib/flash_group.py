@@ -0,0 +1,144 @@
+from clock import system_clock
+
+
+class FlashGroup:
+    """Flashes several lamps in unison from one shared epoch.
+
+    Each Led_Light flashing on its own keeps its own toggle time, so lamps
+    that should flash together drift apart depending on when flash() was
+    first called. A FlashGroup derives the on/off phase of every member from
+    a single epoch and period: each flash() reads the clock once, computes
+    one level and only writes the members when that level changes, so the
+    timing work per tick does not grow with the number of lamps.
+
+    The group has the lamp interface (on, off, toggle, value, flash,
+    ms_until_due), so it can be passed to the Controller wherever a single
+    Led_Light is expected, e.g. as the pedestrian red light of both kerbs.
+
+    Args:
+        lamps (sequence, optional): Member lamps with on() and off().
+        period_ms (int, optional): One on/off cycle. Defaults to 1000.
+        clock (Clock, optional): Time source. Defaults to the system clock.
+        epoch (int, optional): ticks_ms value where a cycle starts (lamps
+            on). Groups given the same epoch and period flash in phase.
+            Defaults to the time the group is created.
+        bank (LedBank, optional): Bank of exactly the member lamps, to
+            switch them all with a single write.
+    """
+
+    def __init__(self, lamps=(), period_ms=1000, clock=None, epoch=None, bank=None):
+        """Initialize the FlashGroup object.
+
+        Args:
+            lamps (sequence, optional): Member lamps with on() and off().
+            period_ms (int, optional): One on/off cycle. Defaults to 1000.
+            clock (Clock, optional): Time source. Defaults to the system clock.
+            epoch (int, optional): ticks_ms value where a cycle starts.
+                Defaults to the time the group is created.
+            bank (LedBank, optional): Bank of exactly the member lamps.
+                Defaults to None.
+        """
+        self.__lamps = list(lamps)
+        self.__clock = clock if clock is not None else system_clock
+        self.__period = period_ms
+        self.__on_ms = period_ms // 2
+        self.__epoch = epoch if epoch is not None else self.__clock.ticks_ms()
+        self.__bank = bank
+        self.__level = None  # last level written to the members
+        self.__flash_active = False
+
+    def add(self, lamp):
+        """Add a lamp; it takes up the group's level on the next write.
+
+        Args:
+            lamp (Led_Light): Lamp with on() and off().
+        """
+        self.__lamps.append(lamp)
+        self.__level = None
+
+    def remove(self, lamp):
+        """Remove a lamp from the group, leaving it in its current state.
+
+        Args:
+            lamp (Led_Light): A member lamp.
+        """
+        self.__lamps.remove(lamp)
+
+    def __len__(self):
+        return len(self.__lamps)
+
+    def on(self):
+        """Stop flashing and turn every member on."""
+        self.__flash_active = False
+        if self.__level != 1:
+            self.__write(1)
+
+    def off(self):
+        """Stop flashing and turn every member off."""
+        self.__flash_active = False
+        if self.__level != 0:
+            self.__write(0)
+
+    def toggle(self):
+        """Toggle every member between on and off together."""
+        if self.__level == 1:
+            self.off()
+        else:
+            self.on()
+
+    def value(self):
+        """Get the level last written to the members.
+
+        Returns:
+            int: 1 if the members are on, 0 if off.
+        """
+        return 1 if self.__level == 1 else 0
+
+    def flash(self):
+        """Non-blocking flash of every member, in phase with the epoch.
+
+        Call repeatedly in the main loop; members are only written when the
+        shared phase crosses an edge.
+        """
+        clock = self.__clock
+        now = clock.ticks_ms()
+        elapsed = clock.ticks_diff(now, self.__epoch)
+        phase = elapsed % self.__period
+        if elapsed >= self.__period:
+            # Keep the epoch recent so ticks_diff never overflows
+            self.__epoch = clock.ticks_add(self.__epoch, elapsed - phase)
+        level = 1 if phase < self.__on_ms else 0
+        if level != self.__level:
+            self.__write(level)
+        self.__flash_active = True
+
+    def ms_until_due(self):
+        """Get how long until the shared phase next changes level.
+
+        Returns:
+            int or None: Milliseconds until the next edge, or None if the
+            group is not flashing.
+        """
+        if not self.__flash_active:
+            return None
+        clock = self.__clock
+        phase = clock.ticks_diff(clock.ticks_ms(), self.__epoch) % self.__period
+        if phase < self.__on_ms:
+            return self.__on_ms - phase
+        return self.__period - phase
+
+    def __write(self, level):
+        """Drive every member to a level."""
+        self.__level = level
+        bank = self.__bank
+        if bank is not None:
+            if level:
+                bank.all_on()
+            else:
+                bank.all_off()
+            return
+        for lamp in self.__lamps:
+            if level:
+                lamp.on()
+            else:
+                lamp.off()
@@ -126,13 +126,17 @@ class LcdApi:
     def putchar(self, char):
         # Writes the indicated character to the LCD at the current cursor
         # position, and advances the cursor by one position.
+        #
+        # The LCD increments its address after each character (LCD_ENTRY_INC),
+        # so the cursor is only tracked here and move_to() is only sent when
+        # it jumps: at a line wrap or a newline. Lines are not contiguous in
+        # the LCD's memory, so the address must be set at those points.
         if char == '\n':
             if self.implied_newline:
                 # self.implied_newline means we advanced due to a wraparound,
                 # so if we get a newline right after that we ignore it.
-                pass
-            else:
-                self.cursor_x = self.num_columns
+                return
+            self.cursor_x = self.num_columns
         else:
             self.hal_write_data(ord(char))
             self.cursor_x += 1
@@ -140,15 +144,19 @@ class LcdApi:
             self.cursor_x = 0
             self.cursor_y += 1
             self.implied_newline = (char != '\n')
-        if self.cursor_y >= self.num_lines:
-            self.cursor_y = 0
-        self.move_to(self.cursor_x, self.cursor_y)
+            if self.cursor_y >= self.num_lines:
+                self.cursor_y = 0
+            self.move_to(self.cursor_x, self.cursor_y)
 
     def putstr(self, string):
         # Write the indicated string to the LCD at the current cursor
         # position and advances the cursor position appropriately.
+        # The writes are bracketed by hal_begin_batch/hal_end_batch so a
+        # HAL can send the whole string in one bus transaction.
+        self.hal_begin_batch()
         for char in string:
             self.putchar(char)
+        self.hal_end_batch()
 
     def custom_char(self, location, charmap):
         # Write a character to one of the 8 CGRAM locations, available
@@ -171,6 +179,17 @@ class LcdApi:
         # If desired, a derived HAL class will implement this function.
         pass
 
+    def hal_begin_batch(self):
+        # Marks the start of a run of writes that may be buffered. Batches
+        # may nest; only the outermost hal_end_batch() has to send them.
+        # If desired, a derived HAL class will implement this function.
+        pass
+
+    def hal_end_batch(self):
+        # Marks the end of a run of writes; any buffered writes must be sent.
+        # If desired, a derived HAL class will implement this function.
+        pass
+
     def hal_write_command(self, cmd):
         # Write a command to the LCD.
         # It is expected that a derived HAL class will implement this function.
@@ -0,0 +1,219 @@
+SPACE = 0x20
+
+
+class LcdFrameBuffer:
+    """Shadow framebuffer that only sends the LCD cells that changed.
+
+    Callers write the whole screen they want into the frame, e.g. a status
+    line every second, then call flush(). The buffer keeps a shadow copy of
+    what the display shows and compares the two line by line: each run of
+    changed cells costs one move_to() plus one data write per cell, and
+    runs separated by no more than merge_gap unchanged cells are sent as
+    one run, since rewriting a cell costs no more than the move_to() it
+    saves. Updating one digit of a countdown is then two writes instead of
+    a move_to() for every cell of the screen.
+
+    The shadow starts as a blank screen, which is how LcdApi leaves the
+    display. Call invalidate() after writing to the LCD directly.
+
+    Args:
+        lcd (LcdApi): Display to draw on.
+        merge_gap (int, optional): Unchanged cells allowed inside a run.
+            Defaults to 1.
+    """
+
+    def __init__(self, lcd, merge_gap=1):
+        """Initialize the LcdFrameBuffer object.
+
+        Args:
+            lcd (LcdApi): Display to draw on.
+            merge_gap (int, optional): Unchanged cells allowed inside a run.
+                Defaults to 1.
+        """
+        self.__lcd = lcd
+        self.__lines = lcd.num_lines
+        self.__columns = lcd.num_columns
+        self.__merge_gap = merge_gap
+        size = self.__lines * self.__columns
+        self.__frame = bytearray(b" " * size)
+        self.__shadow = bytearray(b" " * size)
+        self.__stale_from = size  # cells from here on are redrawn regardless
+        self.__pending = False
+        self.__flushes = 0
+        self.__runs = 0
+        self.__cells = 0
+
+    @property
+    def frame(self):
+        """bytearray: The desired screen, one byte per cell, line by line."""
+        return self.__frame
+
+    def write(self, x, y, text):
+        """Write text into the frame, clipped at the end of the line.
+
+        Args:
+            x (int): Column of the first character.
+            y (int): Line.
+            text (str): Characters to write; codes 0-7 are custom characters.
+        """
+        columns = self.__columns
+        i = y * columns + x
+        end = (y + 1) * columns
+        frame = self.__frame
+        for char in text:
+            if i >= end:
+                break
+            frame[i] = ord(char) & 0xFF
+            i += 1
+
+    def write_line(self, y, text):
+        """Replace a whole line, padding it with spaces.
+
+        Args:
+            y (int): Line.
+            text (str): New contents of the line.
+        """
+        self.write(0, y, text)
+        frame = self.__frame
+        for i in range(y * self.__columns + len(text), (y + 1) * self.__columns):
+            frame[i] = SPACE
+
+    def clear(self):
+        """Blank the frame; the display is only cleared by the next flush()."""
+        frame = self.__frame
+        for i in range(len(frame)):
+            frame[i] = SPACE
+
+    def invalidate(self):
+        """Forget the shadow, so the next flush() redraws every cell."""
+        self.__stale_from = 0
+
+    @property
+    def pending(self):
+        """bool: True if the last flush() ran out of budget before finishing."""
+        return self.__pending
+
+    def codes_in_use(self, count):
+        """Get which character codes below count are wanted or still displayed.
+
+        A code counts if it is in the frame or in the shadow, so a cell whose
+        change has not been flushed yet (e.g. under a flush budget) still
+        holds its old code.
+
+        Args:
+            count (int): Number of codes to check, from 0.
+
+        Returns:
+            bytearray: 1 at each code in use, else 0.
+        """
+        used = bytearray(count)
+        for cells in (self.__frame, self.__shadow):
+            for code in cells:
+                if code < count:
+                    used[code] = 1
+        return used
+
+    def dirty_cells(self):
+        """Get how many cells differ from the display.
+
+        Returns:
+            int: Number of cells the next flush() must change.
+        """
+        frame = self.__frame
+        shadow = self.__shadow
+        stale_from = self.__stale_from
+        count = len(frame) - stale_from
+        for i in range(stale_from):
+            if frame[i] != shadow[i]:
+                count += 1
+        return count
+
+    def flush(self, budget=None):
+        """Send the changed cells to the display, or as many as a budget allows.
+
+        The LCD cursor is put back where it was afterwards, so putstr()
+        callers are not disturbed. With a budget, the flush stops once it
+        would exceed that many bus writes (commands plus data bytes,
+        counting the cursor restore) and pending is set; the next flush()
+        carries on from the cells still changed.
+
+        Args:
+            budget (int, optional): Most bus writes to send, at least 3 (a
+                move_to(), one cell and the restore). Defaults to None (no
+                limit).
+
+        Returns:
+            int: Bus writes sent.
+
+        Raises:
+            ValueError: If the budget is below 3.
+        """
+        if budget is not None and budget < 3:
+            raise ValueError("flush budget must be at least 3 writes")
+        lcd = self.__lcd
+        cursor_x = lcd.cursor_x
+        cursor_y = lcd.cursor_y
+        frame = self.__frame
+        shadow = self.__shadow
+        columns = self.__columns
+        gap = self.__merge_gap
+        stale_from = self.__stale_from
+        # Writes left for cells once a move_to() and the restore are paid for
+        left = budget - 2 if budget is not None else -1
+        runs = 0
+        writes = 0
+        cut = False
+        lcd.hal_begin_batch()
+        for y in range(self.__lines):
+            base = y * columns
+            x = 0
+            while x < columns:
+                i = base + x
+                if i < stale_from and frame[i] == shadow[i]:
+                    x += 1
+                    continue
+                if left == 0:
+                    cut = True
+                    stale_from = max(stale_from, i)
+                    break
+                # Extend the run over changed cells up to gap cells apart
+                start = x
+                end = x + 1
+                j = end
+                while j < columns and j - end <= gap:
+                    i = base + j
+                    if i >= stale_from or frame[i] != shadow[i]:
+                        end = j + 1
+                    j += 1
+                if left > 0:
+                    end = min(end, start + left)
+                    left = max(0, left - (end - start) - 1)
+                lcd.move_to(start, y)
+                for i in range(base + start, base + end):
+                    lcd.hal_write_data(frame[i])
+                    shadow[i] = frame[i]
+                self.__cells += end - start
+                writes += end - start + 1
+                runs += 1
+                x = end
+            if cut:
+                break
+        if runs:
+            lcd.move_to(cursor_x, cursor_y)
+            writes += 1
+        lcd.hal_end_batch()
+        # Stale cells before the cut have been redrawn
+        self.__stale_from = stale_from if cut else len(frame)
+        self.__pending = cut
+        self.__flushes += 1
+        self.__runs += runs
+        return writes
+
+    def stats(self):
+        """Get the flush counters.
+
+        Returns:
+            tuple: (flushes, runs, cells) flush() calls, runs sent and cells
+            written since the buffer was created.
+        """
+        return self.__flushes, self.__runs, self.__cells
@@ -0,0 +1,177 @@
+from array import array
+
+CGRAM_SLOTS = 8  # custom characters the HD44780 holds, codes 0-7
+
+
+class GlyphCache:
+    """Maps any number of custom glyphs onto the LCD's 8 CGRAM slots.
+
+    Glyphs are defined once by id, then requested by id when drawn. A
+    requested glyph already in a slot is a hit and costs nothing; a miss
+    uploads it with custom_char() into a free slot or, when all are taken,
+    the least recently used one. Slots whose glyph is on screen, in the
+    frame or still on the display awaiting a flush, are only recycled when
+    every slot is on screen, since changing a slot redraws every cell
+    showing it. With a frame buffer, cells still showing a
+    recycled slot are set to the old glyph's fallback character, so the
+    next flush() puts them right.
+
+    Args:
+        lcd (LcdApi): Display whose CGRAM is managed.
+        frame (LcdFrameBuffer, optional): Frame buffer the glyphs are drawn
+            in, used to find and remap displayed cells. Defaults to None.
+        slots (int, optional): CGRAM slots to manage, from code 0. Fewer
+            than 8 leaves the rest for the caller. Defaults to 8.
+    """
+
+    def __init__(self, lcd, frame=None, slots=CGRAM_SLOTS):
+        """Initialize the GlyphCache object.
+
+        Args:
+            lcd (LcdApi): Display whose CGRAM is managed.
+            frame (LcdFrameBuffer, optional): Frame buffer the glyphs are
+                drawn in. Defaults to None.
+            slots (int, optional): CGRAM slots to manage. Defaults to 8.
+
+        Raises:
+            ValueError: If slots is not between 1 and 8.
+        """
+        if not 1 <= slots <= CGRAM_SLOTS:
+            raise ValueError("slots must be between 1 and 8")
+        self.__lcd = lcd
+        self.__frame = frame
+        self.__glyphs = {}  # id -> (charmap, fallback code)
+        self.__slot_of = {}  # id -> slot
+        self.__slot_glyph = [None] * slots
+        self.__last_used = array("I", [0] * slots)
+        self.__clock = 0
+        self.__hits = 0
+        self.__misses = 0
+        self.__evictions = 0
+        self.__remapped = 0
+
+    def define(self, glyph_id, charmap, fallback=" "):
+        """Register a glyph; it is uploaded the first time it is used.
+
+        Redefining a glyph that is in a slot uploads the new rows at once.
+
+        Args:
+            glyph_id: Any hashable id, e.g. "walk" or ("digit", 3, "top").
+            charmap (sequence): 8 row bitmaps of 5 bits each.
+            fallback (str, optional): Character shown in its place if its
+                slot is recycled while on screen. Defaults to " ".
+
+        Raises:
+            ValueError: If charmap does not have 8 rows.
+        """
+        if len(charmap) != 8:
+            raise ValueError("glyph needs 8 rows")
+        self.__glyphs[glyph_id] = (bytes(charmap), ord(fallback))
+        slot = self.__slot_of.get(glyph_id)
+        if slot is not None:
+            self.__lcd.custom_char(slot, self.__glyphs[glyph_id][0])
+
+    def slot(self, glyph_id):
+        """Get the CGRAM slot holding a glyph, uploading it on a miss.
+
+        Args:
+            glyph_id: Id of a defined glyph.
+
+        Returns:
+            int: Character code (0-7) that shows the glyph.
+
+        Raises:
+            KeyError: If the glyph was never defined.
+        """
+        self.__clock += 1
+        slot = self.__slot_of.get(glyph_id)
+        if slot is not None:
+            self.__hits += 1
+            self.__last_used[slot] = self.__clock
+            return slot
+        charmap = self.__glyphs[glyph_id][0]
+        self.__misses += 1
+        slot = self.__victim()
+        old = self.__slot_glyph[slot]
+        if old is not None:
+            self.__evictions += 1
+            del self.__slot_of[old]
+            self.__remap(slot, self.__glyphs[old][1])
+        self.__slot_glyph[slot] = glyph_id
+        self.__slot_of[glyph_id] = slot
+        self.__last_used[slot] = self.__clock
+        self.__lcd.custom_char(slot, charmap)
+        return slot
+
+    def char(self, glyph_id):
+        """Get a glyph as a one-character string, for putstr() or write().
+
+        Args:
+            glyph_id: Id of a defined glyph.
+
+        Returns:
+            str: The glyph's character.
+        """
+        return chr(self.slot(glyph_id))
+
+    def put(self, x, y, glyph_id):
+        """Draw a glyph into the frame buffer the cache was given.
+
+        Args:
+            x (int): Column.
+            y (int): Line.
+            glyph_id: Id of a defined glyph.
+
+        Raises:
+            ValueError: If the cache was created without a frame buffer.
+        """
+        frame = self.__frame
+        if frame is None:
+            raise ValueError("put() needs a GlyphCache created with a frame")
+        slot = self.slot(glyph_id)
+        frame.frame[y * self.__lcd.num_columns + x] = slot
+
+    def stats(self):
+        """Get the cache counters.
+
+        Returns:
+            tuple: (hits, misses, evictions, remapped) lookups served from a
+            slot, glyphs uploaded, slots recycled and displayed cells given
+            their fallback because their slot was recycled.
+        """
+        return self.__hits, self.__misses, self.__evictions, self.__remapped
+
+    def reset_stats(self):
+        """Reset the counters to zero."""
+        self.__hits = 0
+        self.__misses = 0
+        self.__evictions = 0
+        self.__remapped = 0
+
+    def __victim(self):
+        """Choose the slot for a new glyph: free, else off screen, else LRU."""
+        slots = self.__slot_glyph
+        for slot in range(len(slots)):
+            if slots[slot] is None:
+                return slot
+        shown = self.__shown()
+        last_used = self.__last_used
+        return min(
+            range(len(slots)), key=lambda slot: (shown[slot], last_used[slot])
+        )
+
+    def __shown(self):
+        """Get which slots are in the frame or still on the display."""
+        if self.__frame is None:
+            return bytearray(len(self.__slot_glyph))
+        return self.__frame.codes_in_use(len(self.__slot_glyph))
+
+    def __remap(self, slot, fallback):
+        """Give frame cells that show a recycled slot the old glyph's fallback."""
+        if self.__frame is None:
+            return
+        frame = self.__frame.frame
+        for i in range(len(frame)):
+            if frame[i] == slot:
+                frame[i] = fallback
+                self.__remapped += 1
@@ -0,0 +1,156 @@
+try:
+    import asyncio
+except ImportError:
+    import uasyncio as asyncio
+
+from clock import system_clock
+
+# uasyncio sleeps in milliseconds natively; CPython's asyncio only in seconds
+if hasattr(asyncio, "sleep_ms"):
+    sleep_ms = asyncio.sleep_ms
+else:
+
+    def sleep_ms(ms):
+        return asyncio.sleep(ms / 1000)
+
+
+class LcdWriter:
+    """Draws LCD updates a few bus writes at a time, off the caller's path.
+
+    Updates only change the frame buffer, which costs no bus time, so
+    callers such as the controller loop never wait for the display.
+    service() then sends at most budget bus writes of the changed cells per
+    call, from the main loop or from the run() task, so its cost per tick
+    is bounded however much text is queued. The frame buffer acts as a
+    coalescing queue: a cell updated twice before it is sent is only sent
+    once, with its latest contents. Clearing blanks the frame rather than
+    sending the 5 ms clear command.
+
+    Latency is measured from the first update that finds the display up to
+    date until the flush that brings it up to date again.
+
+    Args:
+        frame (LcdFrameBuffer): Frame buffer of the display.
+        budget (int, optional): Most bus writes per service() call, at
+            least 3. Defaults to 8.
+        clock (Clock, optional): Time source. Defaults to the system clock.
+    """
+
+    def __init__(self, frame, budget=8, clock=None):
+        """Initialize the LcdWriter object.
+
+        Args:
+            frame (LcdFrameBuffer): Frame buffer of the display.
+            budget (int, optional): Most bus writes per service() call, at
+                least 3. Defaults to 8.
+            clock (Clock, optional): Time source. Defaults to the system clock.
+
+        Raises:
+            ValueError: If the budget is below 3.
+        """
+        if budget < 3:
+            raise ValueError("writer budget must be at least 3 writes")
+        self.__frame = frame
+        self.__budget = budget
+        self.__clock = clock if clock is not None else system_clock
+        self.__pending = False
+        self.__pending_since = 0
+        self.__updates = 0
+        self.__flushes = 0
+        self.__writes = 0
+        self.__last_latency = 0
+        self.__max_latency = 0
+
+    def write(self, x, y, text):
+        """Queue text at a position, clipped at the end of the line.
+
+        Args:
+            x (int): Column of the first character.
+            y (int): Line.
+            text (str): Characters to write.
+        """
+        self.__frame.write(x, y, text)
+        self.__queued()
+
+    def write_line(self, y, text):
+        """Queue a whole line, padded with spaces.
+
+        Args:
+            y (int): Line.
+            text (str): New contents of the line.
+        """
+        self.__frame.write_line(y, text)
+        self.__queued()
+
+    def clear(self):
+        """Queue a blank screen."""
+        self.__frame.clear()
+        self.__queued()
+
+    @property
+    def pending(self):
+        """bool: True while queued updates have not all reached the display."""
+        return self.__pending
+
+    def depth(self):
+        """Get the queue depth.
+
+        Returns:
+            int: Cells whose new contents have not been sent yet.
+        """
+        return self.__frame.dirty_cells()
+
+    def service(self):
+        """Send up to budget bus writes of queued updates.
+
+        Returns:
+            int: Bus writes sent.
+        """
+        if not self.__pending:
+            return 0
+        frame = self.__frame
+        writes = frame.flush(self.__budget)
+        self.__writes += writes
+        if not frame.pending:
+            clock = self.__clock
+            latency = clock.ticks_diff(clock.ticks_ms(), self.__pending_since)
+            self.__pending = False
+            self.__flushes += 1
+            self.__last_latency = latency
+            if latency > self.__max_latency:
+                self.__max_latency = latency
+        return writes
+
+    async def run(self, period_ms=10):
+        """Service the queue forever (or until the task is cancelled).
+
+        Args:
+            period_ms (int, optional): Time between service() calls while
+                updates are queued. Defaults to 10.
+        """
+        while True:
+            self.service()
+            await sleep_ms(period_ms)
+
+    def stats(self):
+        """Get the writer counters.
+
+        Returns:
+            tuple: (updates, flushes, writes, last_latency_ms,
+            max_latency_ms) updates queued, times the display was brought
+            up to date, bus writes sent and the update-to-display latency.
+        """
+        return (
+            self.__updates,
+            self.__flushes,
+            self.__writes,
+            self.__last_latency,
+            self.__max_latency,
+        )
+
+    def __queued(self):
+        """Note an update and start its latency clock if none was pending."""
+        self.__updates += 1
+        if not self.__pending:
+            self.__pending = True
+            self.__pending_since = self.__clock.ticks_ms()
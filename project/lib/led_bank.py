@@ -0,0 +1,200 @@
+import sys
+
+try:
+    from machine import mem32
+except ImportError:
+    mem32 = None
+
+# RP2040 single-cycle IO (SIO) block: writing a mask to GPIO_OUT_XOR flips
+# every selected pin in the same bus cycle.
+SIO_BASE = 0xD0000000
+GPIO_OUT = SIO_BASE + 0x010
+GPIO_OUT_XOR = SIO_BASE + 0x01C
+
+
+class SioGpio:
+    """Writes bank masks to the RP2040 SIO registers in one store.
+
+    The pins to change are found from GPIO_OUT and flipped together with a
+    single GPIO_OUT_XOR store, so the old lamp goes off in the same cycle
+    the new one comes on. Pins outside the masks are never touched.
+    """
+
+    def write(self, set_mask, clr_mask):
+        """Drive the pins in set_mask high and the pins in clr_mask low.
+
+        Args:
+            set_mask (int): Bit mask of GPIO numbers to drive high.
+            clr_mask (int): Bit mask of GPIO numbers to drive low.
+        """
+        flip = (mem32[GPIO_OUT] ^ set_mask) & (set_mask | clr_mask)
+        mem32[GPIO_OUT_XOR] = flip
+
+
+class PinGpio:
+    """Fallback that applies bank masks with one on()/off() call per lamp.
+
+    Used on boards without the RP2040 SIO registers. Lamps are updated one
+    after another, so this fallback is not glitch-free.
+
+    Args:
+        lamps (sequence): Lamps in the bank, each with a pin_number.
+    """
+
+    def __init__(self, lamps):
+        """Initialize the PinGpio object.
+
+        Args:
+            lamps (sequence): Lamps in the bank, each with a pin_number.
+        """
+        self.__lamps = tuple((1 << lamp.pin_number, lamp) for lamp in lamps)
+
+    def write(self, set_mask, clr_mask):
+        """Drive the pins in set_mask high and the pins in clr_mask low.
+
+        Args:
+            set_mask (int): Bit mask of GPIO numbers to drive high.
+            clr_mask (int): Bit mask of GPIO numbers to drive low.
+        """
+        for mask, lamp in self.__lamps:
+            if set_mask & mask:
+                lamp.on()
+            elif clr_mask & mask:
+                lamp.off()
+
+
+class RecordingGpio:
+    """Host stand-in for the SIO registers that records every bank write.
+
+    Attributes:
+        writes (list): (set_mask, clr_mask) tuples in the order written.
+        out (int): Simulated GPIO_OUT register after the writes.
+    """
+
+    def __init__(self):
+        """Initialize the RecordingGpio object with all outputs low."""
+        self.writes = []
+        self.out = 0
+
+    def write(self, set_mask, clr_mask):
+        """Record a write and apply it to the simulated output register.
+
+        Args:
+            set_mask (int): Bit mask of GPIO numbers to drive high.
+            clr_mask (int): Bit mask of GPIO numbers to drive low.
+        """
+        self.writes.append((set_mask, clr_mask))
+        self.out = (self.out | set_mask) & ~clr_mask
+
+
+def default_gpio(lamps):
+    """Pick the fastest GPIO writer available on this board.
+
+    Args:
+        lamps (sequence): Lamps in the bank, used by the Pin fallback.
+
+    Returns:
+        SioGpio on an RP2040, otherwise a PinGpio for the given lamps.
+    """
+    machine_name = getattr(sys.implementation, "_machine", "")
+    if mem32 is not None and "RP2040" in machine_name:
+        return SioGpio()
+    return PinGpio(lamps)
+
+
+class LedBank:
+    """Group of lamps switched together with a single register write.
+
+    The set and clear masks for "only lamp N lit" are computed once when
+    the bank is created, so changing aspect costs the same whatever the
+    number of lamps in the bank. Lamps that cache their state (Led_Light)
+    have the cache invalidated after every write, since the bank bypasses
+    their on() and off().
+
+    Lamps whose pin is not driven by GPIO_OUT (gpio_writable is False, as
+    for Pwm_Led_Light) cannot be switched by register writes, so a bank
+    holding one falls back to per-lamp writes.
+
+    Args:
+        lamps (sequence): Lamps in the bank, each with a pin_number.
+        gpio (optional): Object with write(set_mask, clr_mask). Defaults to
+            the SIO registers on an RP2040, or per-lamp writes elsewhere.
+    """
+
+    def __init__(self, lamps, gpio=None):
+        """Initialize the LedBank object.
+
+        Args:
+            lamps (sequence): Lamps in the bank, each with a pin_number.
+            gpio (optional): Object with write(set_mask, clr_mask). Defaults
+                to default_gpio(lamps), or a PinGpio if a lamp is not
+                gpio_writable.
+
+        Raises:
+            ValueError: If gpio writes registers and a lamp is not
+                gpio_writable (e.g. a Pwm_Led_Light).
+        """
+        pwm_pins = [
+            lamp.pin_number
+            for lamp in lamps
+            if not getattr(lamp, "gpio_writable", True)
+        ]
+        if gpio is None:
+            gpio = PinGpio(lamps) if pwm_pins else default_gpio(lamps)
+        elif pwm_pins and not isinstance(gpio, PinGpio):
+            raise ValueError(
+                "lamp on pin "
+                + str(pwm_pins[0])
+                + " is not driven by GPIO_OUT; use PinGpio for this bank"
+            )
+        masks = [1 << lamp.pin_number for lamp in lamps]
+        all_mask = 0
+        for mask in masks:
+            all_mask |= mask
+        self.__masks = tuple(masks)
+        self.__all_mask = all_mask
+        self.__exclusive = tuple((mask, all_mask & ~mask) for mask in masks)
+        self.__gpio = gpio
+        # Bound once so a write does not allocate
+        self.__invalidates = tuple(
+            lamp.invalidate for lamp in lamps if hasattr(lamp, "invalidate")
+        )
+
+    def show(self, index):
+        """Light only the lamp at index and turn every other lamp off.
+
+        Args:
+            index (int): Position of the lamp in the bank.
+        """
+        set_mask, clr_mask = self.__exclusive[index]
+        self.__gpio.write(set_mask, clr_mask)
+        self.__invalidate()
+
+    def write(self, states):
+        """Set every lamp in the bank at once.
+
+        Args:
+            states (sequence): 1 or 0 for each lamp, in bank order.
+        """
+        set_mask = 0
+        masks = self.__masks
+        for i in range(len(masks)):
+            if states[i]:
+                set_mask |= masks[i]
+        self.__gpio.write(set_mask, self.__all_mask & ~set_mask)
+        self.__invalidate()
+
+    def all_on(self):
+        """Turn every lamp in the bank on."""
+        self.__gpio.write(self.__all_mask, 0)
+        self.__invalidate()
+
+    def all_off(self):
+        """Turn every lamp in the bank off."""
+        self.__gpio.write(0, self.__all_mask)
+        self.__invalidate()
+
+    def __invalidate(self):
+        """Make the lamps read their state from the pins after a write."""
+        for invalidate in self.__invalidates:
+            invalidate()
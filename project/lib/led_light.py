@@ -1,5 +1,5 @@
 from machine import Pin
-from time import sleep, time
+from clock import system_clock
 
 
 class Led_Light(Pin):
@@ -8,54 +8,126 @@ class Led_Light(Pin):
     This class provides methods to control an LED including on, off, toggle, and non-blocking flashing.
     It extends the machine.Pin class functionality, overriding and adding methods specific to LED control.
 
+    The commanded state is cached, so toggle() and led_light_state do not read the pin back.
+    Code that writes the pin around this object (e.g. a LedBank) calls invalidate(), and the
+    next read takes the state from the pin.
+
     Args:
         pin (int): The GPIO pin number the LED is connected to.
         flashing (bool, optional): Whether to enable flashing capability. Defaults to False.
         debug (bool, optional): Whether to print debug statements. Defaults to False.
+        clock (Clock, optional): Time source for flashing. Defaults to the system clock.
+        flasher (optional): Flash backend from flash_backend that toggles the pin without the CPU.
     """
 
-    def __init__(self, pin, flashing=False, debug=False):
+    FLASH_PERIOD_MS = 1000  # one on/off cycle, toggling every 500 ms
+
+    def __init__(self, pin, flashing=False, debug=False, clock=None, flasher=None):
         """Initialize the Led_Light object.
 
         Args:
             pin (int): The GPIO pin number the LED is connected to.
             flashing (bool, optional): Whether to enable flashing capability. Defaults to False.
             debug (bool, optional): Whether to print debug statements. Defaults to False.
+            clock (Clock, optional): Time source for flashing. Defaults to the system clock.
+            flasher (optional): Flash backend (PioFlasher, TimerFlasher) that toggles the pin
+                without the CPU once flash() starts it. Defaults to None.
         """
         super().__init__(pin, Pin.OUT)
-        self.led_light_state
+        self.__state = self.value()
         self.__debug = debug
         self.__pin = pin
         self.__flashing = flashing
-        self.__last_toggle_time = time()
+        self.__clock = clock if clock is not None else system_clock
+        self.__last_toggle_time = self.__clock.ticks_ms()
+        self.__flash_active = False
+        self.__flasher = flasher
 
     def on(self):
         """Turn the LED on.
 
         Overrides the Pin.on() method to provide additional debug output.
         """
+        flasher = self.__flasher
+        if flasher is not None and flasher.running:
+            flasher.stop()
         self.high()
+        self.__state = 1
+        self.__flash_active = False
         if self.__debug:
-            print(f"LED connected to Pin {self.__pin} is {self.led_light_state}")
+            print(f"LED connected to Pin {self.__pin} is 1")
 
     def off(self):
         """Turn the LED off.
 
         Overrides the Pin.off() method to provide additional debug output.
         """
+        flasher = self.__flasher
+        if flasher is not None and flasher.running:
+            flasher.stop()
         self.low()
+        self.__state = 0
+        self.__flash_active = False
         if self.__debug:
-            print(f"LED connected to Pin {self.__pin} is {self.led_light_state}")
+            print(f"LED connected to Pin {self.__pin} is 0")
 
     def toggle(self):
         """Toggle the LED between on and off states.
 
         If the LED is off, turns it on. If the LED is on, turns it off.
         """
-        if self.value() == 0:
-            self.on()
-        elif self.value() == 1:
+        if self.led_light_state:
             self.off()
+        else:
+            self.on()
+
+    @property
+    def pin_number(self):
+        """Get the GPIO pin number the LED is connected to.
+
+        Returns:
+            int: The GPIO pin number.
+        """
+        return self.__pin
+
+    @property
+    def self_timed(self):
+        """Check whether flashing runs without repeated flash() calls.
+
+        Returns:
+            bool: True if a flash backend toggles the pin by itself.
+        """
+        return self.__flasher is not None
+
+    @property
+    def flasher(self):
+        """Get or set the flash backend, or None to flash from flash() calls.
+
+        Replacing a backend deinitialises the old one, which stops it and
+        releases its hardware (e.g. a PIO state machine).
+        """
+        return self.__flasher
+
+    @flasher.setter
+    def flasher(self, flasher):
+        old = self.__flasher
+        if old is not None and old is not flasher:
+            old.deinit()
+        self.__flasher = flasher
+        self.__flash_active = False
+
+    @property
+    def busy(self):
+        """Check whether a flash backend is running.
+
+        Schedulers must not lightsleep while busy: it stops the clocks of the
+        PIO state machine and timers, so the lamp would freeze mid-flash.
+
+        Returns:
+            bool: True while a flash backend toggles the pin.
+        """
+        flasher = self.__flasher
+        return flasher is not None and flasher.running
 
     @property
     def led_light_state(self):
@@ -64,28 +136,63 @@ class Led_Light(Pin):
         Returns:
             int: 0 if the LED is off, 1 if the LED is on.
         """
-        return self.value()
+        state = self.__state
+        if state is None:
+            state = self.__state = self.value()
+        return state
 
     @led_light_state.setter
     def led_light_state(self, value):
         """Set the state of the LED.
 
         Args:
-            value (int): 0 turns the LED on, 1 turns the LED off.
+            value (int): 1 turns the LED on, 0 turns the LED off.
         """
         if value == 1:
-            self.off()
-        elif value == 0:
             self.on()
+        elif value == 0:
+            self.off()
+
+    def invalidate(self):
+        """Forget the cached state after the pin was written around this object.
+
+        The next toggle() or led_light_state read takes the state from the pin.
+        """
+        self.__state = None
 
     def flash(self):
-        """Non-blocking flash: toggles LED every 0.5 seconds.
+        """Non-blocking flash: toggles LED every 500 milliseconds.
 
         This method should be called repeatedly in the main loop.
-        The LED will toggle only if flashing is enabled and 0.5 seconds
-        have elapsed since the last toggle.
+        The LED will toggle only if flashing is enabled and 500 ms have
+        elapsed since the last toggle.
+
+        With a flash backend the first call starts the backend, which keeps
+        flashing until on() or off() is called; later calls do nothing.
         """
-        now = time()
-        if self.__flashing and now - self.__last_toggle_time >= 0.5:
+        if self.__flasher is not None:
+            if self.__flashing and not self.__flasher.running:
+                self.__flasher.start(self.FLASH_PERIOD_MS)
+            return
+        now = self.__clock.ticks_ms()
+        elapsed = self.__clock.ticks_diff(now, self.__last_toggle_time)
+        if self.__flashing and elapsed >= 500:
             self.toggle()
             self.__last_toggle_time = now
+        self.__flash_active = self.__flashing
+
+    def ms_until_due(self):
+        """Get how long until the next flash toggle is due.
+
+        Used by schedulers to decide how long the CPU can sleep.
+
+        Returns:
+            int or None: Milliseconds until flash() will next toggle (0 if
+            it is due now), or None if the LED is not currently flashing or
+            a flash backend is doing the toggling.
+        """
+        if not self.__flash_active:
+            return None
+        now = self.__clock.ticks_ms()
+        elapsed = self.__clock.ticks_diff(now, self.__last_toggle_time)
+        return max(0, 500 - elapsed)
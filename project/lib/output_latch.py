@@ -0,0 +1,87 @@
+from event_trace import EV_OUTPUT
+
+
+class OutputLatch:
+    """Shadow copy of the last state commanded to a group of outputs.
+
+    Subsystems ask the latch whether an output needs writing before touching
+    the hardware. Repeating the state an output already has is counted as a
+    suppressed write and skipped, so a state that is re-applied every tick
+    only costs pin writes when something actually changes.
+
+    Args:
+        size (int): Number of outputs in the group.
+        trace (Trace, optional): Trace that records every issued write.
+        first_id (int, optional): Output id of index 0 in trace records.
+    """
+
+    UNKNOWN = 0xFF
+
+    def __init__(self, size, trace=None, first_id=0):
+        """Initialize the OutputLatch object.
+
+        Every output starts UNKNOWN so the first command is always written.
+
+        Args:
+            size (int): Number of outputs in the group.
+            trace (Trace, optional): Trace that records every issued write.
+                Defaults to None.
+            first_id (int, optional): Output id of index 0 in trace records,
+                so several latches can share one trace. Defaults to 0.
+        """
+        self.__shadow = bytearray(size)
+        self.__trace = trace
+        self.__first_id = first_id
+        self.__issued = 0
+        self.__suppressed = 0
+        self.invalidate()
+
+    def changed(self, index, value):
+        """Record a commanded state and report whether it must be written.
+
+        Args:
+            index (int): Output index within the group.
+            value (int): Commanded state, 0 for off and 1 for on.
+
+        Returns:
+            bool: True if the caller should write the output, False if the
+            output already has this state.
+        """
+        if self.__shadow[index] == value:
+            self.__suppressed += 1
+            return False
+        self.__shadow[index] = value
+        self.__issued += 1
+        if self.__trace is not None:
+            self.__trace.record(EV_OUTPUT, (self.__first_id + index) << 2 | value)
+        return True
+
+    def release(self, index):
+        """Mark an output as driven outside the latch (e.g. while flashing).
+
+        The next changed() call for this output will always be written.
+
+        Args:
+            index (int): Output index within the group.
+        """
+        if self.__trace is not None and self.__shadow[index] != self.UNKNOWN:
+            self.__trace.record(EV_OUTPUT, (self.__first_id + index) << 2 | 2)
+        self.__shadow[index] = self.UNKNOWN
+
+    def invalidate(self):
+        """Forget every shadowed state so the next commands are all written."""
+        for i in range(len(self.__shadow)):
+            self.__shadow[i] = self.UNKNOWN
+
+    def stats(self):
+        """Get the write counters.
+
+        Returns:
+            tuple: (issued, suppressed) number of writes since the last reset.
+        """
+        return self.__issued, self.__suppressed
+
+    def reset_stats(self):
+        """Reset the issued and suppressed write counters to zero."""
+        self.__issued = 0
+        self.__suppressed = 0
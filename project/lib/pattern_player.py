@@ -0,0 +1,198 @@
+from array import array
+from clock import system_clock
+
+try:
+    from machine import Timer, disable_irq, enable_irq
+except ImportError:
+    Timer = None
+
+    def disable_irq():
+        return None
+
+    def enable_irq(state):
+        pass
+
+
+def compile_pattern(steps):
+    """Compile a pattern into a flat array of (freq, duty, duration_ms) steps.
+
+    Args:
+        steps (sequence): (freq, duty, duration_ms) tuples. A freq of 0 is a
+            silent rest. Frequencies, duties and durations must fit in 16 bits.
+
+    Returns:
+        array: Unsigned 16-bit values, three per step.
+
+    Raises:
+        ValueError: If the pattern is empty or a step is shorter than 1 ms.
+    """
+    if not steps:
+        raise ValueError("pattern has no steps")
+    compiled = array("H")
+    for freq, duty, duration_ms in steps:
+        if duration_ms < 1:
+            raise ValueError("pattern step shorter than 1 ms")
+        compiled.append(freq)
+        compiled.append(duty)
+        compiled.append(duration_ms)
+    return compiled
+
+
+# Accessible pedestrian signal patterns, repeated for as long as selected
+# Locator tone: a short quiet tick once a second so the button can be found
+LOCATOR = compile_pattern(((880, 8192, 30), (0, 0, 970)))
+# Walk: rapid tick, ten per second
+WALK_TICK = compile_pattern(((1000, 32768, 20), (0, 0, 80)))
+# Clearance: silent while the warning light flashes
+CLEARANCE = compile_pattern(((0, 0, 1000),))
+
+
+class PatternPlayer:
+    """Loops a compiled tone pattern on a PWM output from a timer.
+
+    Each step is started by a one-shot machine.Timer callback that reads the
+    next (freq, duty, duration_ms) entry straight from the compiled array,
+    so playback never allocates. Selecting a different pattern restarts at
+    its first step immediately, so a switch never waits for a step to end.
+    Where no timer is available, service() advances the steps once their
+    deadline has passed.
+
+    Args:
+        output (PWM): Output with freq() and duty_u16(), e.g. the buzzer.
+        timer (Timer, optional): One-shot timer that starts each step.
+            Defaults to a new machine.Timer, or deadline mode on the host.
+        clock (Clock, optional): Time source. Defaults to the system clock.
+    """
+
+    def __init__(self, output, timer=None, clock=None):
+        """Initialize the PatternPlayer object.
+
+        Args:
+            output (PWM): Output with freq() and duty_u16().
+            timer (Timer, optional): One-shot timer that starts each step.
+                Defaults to a new machine.Timer, or None on the host, in
+                which case service() must be called to advance the steps.
+            clock (Clock, optional): Time source. Defaults to the system clock.
+        """
+        if timer is None and Timer is not None:
+            timer = Timer()
+        self.__output = output
+        self.__timer = timer
+        self.__clock = clock if clock is not None else system_clock
+        self.__pattern = None
+        self.__index = 0
+        self.__step_ends_at = 0
+        self.__sounding = False
+        self.__steps = 0
+        self.__switches = 0
+        # Bound once so arming the timer does not allocate
+        self.__on_timer = self.__timer_expired
+
+    @property
+    def pattern(self):
+        """array or None: The compiled pattern playing, None when silent."""
+        return self.__pattern
+
+    @property
+    def sounding(self):
+        """bool: True while the current step is a tone, False in a rest."""
+        return self.__sounding
+
+    def select(self, pattern):
+        """Start looping a pattern, or stop with None.
+
+        Selecting the pattern that is already playing does nothing, so it is
+        safe to call on every controller tick.
+
+        Args:
+            pattern (array): Compiled pattern from compile_pattern(), or None.
+        """
+        if pattern is self.__pattern:
+            return
+        irq_state = disable_irq()
+        self.__pattern = pattern
+        self.__index = 0
+        self.__switches += 1
+        if pattern is None:
+            if self.__timer is not None:
+                self.__timer.deinit()
+            self.__output.duty_u16(0)
+            self.__sounding = False
+        else:
+            self.__start_step()
+        enable_irq(irq_state)
+
+    def stop(self):
+        """Silence the output."""
+        self.select(None)
+
+    def service(self):
+        """Start the next step if the current one has ended.
+
+        Needed when the player runs without a timer. With a timer it only
+        catches up a step whose timer was held up, e.g. by a lightsleep in
+        a rest; otherwise the timer has already started it.
+        """
+        if self.__pattern is None:
+            return
+        clock = self.__clock
+        if clock.ticks_diff(clock.ticks_ms(), self.__step_ends_at) >= 0:
+            irq_state = disable_irq()
+            # Re-armed by __start_step(), so a late timer callback finds
+            # the new step not yet due and leaves it alone
+            self.__start_step()
+            enable_irq(irq_state)
+
+    def ms_until_due(self):
+        """Get how long until the next step starts.
+
+        Returns:
+            int or None: Milliseconds until the next step (0 if it is due
+            now), or None when no pattern is playing.
+        """
+        if self.__pattern is None:
+            return None
+        clock = self.__clock
+        return max(0, clock.ticks_diff(self.__step_ends_at, clock.ticks_ms()))
+
+    def stats(self):
+        """Get the playback counters.
+
+        Returns:
+            tuple: (steps, switches) steps started and patterns selected.
+        """
+        return self.__steps, self.__switches
+
+    def __start_step(self):
+        """Play the step at the current index and arm the timer for the next.
+
+        Called with interrupts disabled or from the timer callback.
+        """
+        pattern = self.__pattern
+        i = self.__index
+        freq = pattern[i]
+        duration_ms = pattern[i + 2]
+        output = self.__output
+        if freq:
+            output.freq(freq)
+            output.duty_u16(pattern[i + 1])
+        else:
+            output.duty_u16(0)
+        self.__sounding = freq != 0
+        i += 3
+        self.__index = i if i < len(pattern) else 0
+        self.__steps += 1
+        clock = self.__clock
+        self.__step_ends_at = clock.ticks_add(clock.ticks_ms(), duration_ms)
+        if self.__timer is not None:
+            timer = self.__timer
+            timer.init(mode=timer.ONE_SHOT, period=duration_ms, callback=self.__on_timer)
+
+    def __timer_expired(self, timer):
+        """Timer callback: the current step has ended."""
+        if self.__pattern is None:
+            return
+        clock = self.__clock
+        # service() may already have started the next step
+        if clock.ticks_diff(clock.ticks_ms(), self.__step_ends_at) >= 0:
+            self.__start_step()
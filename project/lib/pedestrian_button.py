@@ -1,5 +1,8 @@
-from machine import Pin
+from machine import Pin, disable_irq, enable_irq
+from micropython import schedule
 from time import ticks_ms, ticks_diff
+from button_events import PRESS
+from event_trace import EV_BUTTON
 
 
 class Pedestrian_Button(Pin):
@@ -8,12 +11,21 @@ class Pedestrian_Button(Pin):
     This class implements a button with interrupt-based detection and software debouncing.
     It maintains an internal state to track if a pedestrian is waiting after a button press.
 
+    The hard interrupt handler does not allocate: given a ButtonEvents queue, each
+    accepted press is pushed onto it as (ticks_ms, pin), and anything slower, such as
+    the debug print, is deferred with micropython.schedule. Given a Debouncer, the
+    button is sampled from its timer instead of the edge interrupt, and the queue also
+    receives the release, short, long and double press events.
+
     Args:
         pin (int): The GPIO pin number the button is connected to.
         debug (bool): Whether to print debug statements.
+        trace (Trace, optional): Trace that records accepted presses.
+        events (ButtonEvents, optional): Queue that receives accepted presses.
+        debouncer (Debouncer, optional): Samples and classifies the button.
     """
 
-    def __init__(self, pin, debug):
+    def __init__(self, pin, debug, trace=None, events=None, debouncer=None):
         """Initialize the Pedestrian_Button object.
 
         Sets up the pin as an input with pull-down resistor and configures
@@ -22,58 +34,141 @@ class Pedestrian_Button(Pin):
         Args:
             pin (int): The GPIO pin number the button is connected to.
             debug (bool): Whether to print debug statements.
+            trace (Trace, optional): Trace that records accepted presses.
+                Defaults to None.
+            events (ButtonEvents, optional): Queue that receives accepted presses,
+                which may be shared by several buttons. The caller must drain it,
+                or presses beyond its size are dropped. Defaults to None (no queue).
+            debouncer (Debouncer, optional): Samples and classifies the button in
+                place of the 200ms edge lockout. It is started here if it is not
+                running yet. Defaults to None.
         """
         super().__init__(pin, Pin.IN, Pin.PULL_DOWN)
         self.__debug = debug
         self.__pin = pin
         self.__last_pressed = ticks_ms()  # Track the last time the button was pressed
         self.__pedestrian_waiting = False
-        self.irq(
-            trigger=Pin.IRQ_RISING, handler=self.callback
-        )  # Set up interrupt on rising edge
+        self.__press_handler = None
+        self.__trace = trace
+        self.__events = events
+        self.__press_count = 0
+        self.__report_pending = False
+        # Bound once so the interrupt handler does not allocate
+        self.__on_report = self.__report
+        if debouncer is not None:
+            debouncer.add(self, self.__debounced, pin)
+            if not debouncer.running:
+                debouncer.start()
+        else:
+            self.irq(
+                trigger=Pin.IRQ_RISING, handler=self.callback, hard=True
+            )  # Set up interrupt on rising edge
+
+    @property
+    def button_state(self):
+        """Get or set the pedestrian waiting flag.
 
-    def button_state(self, value=None):
+        Reading it gives True once a press has been accepted; assigning False
+        clears it.
+
+        Returns:
+            bool: True if a pedestrian is waiting.
         """
-        Get or set the current state of the pedestrian waiting flag.
+        if self.__debug:
+            print(
+                f"Button connected to Pin {self.__pin} is {'WAITING' if self.__pedestrian_waiting else 'NOT WAITING'}"
+            )
+        return self.__pedestrian_waiting
 
-        - If called with no arguments, returns the current state (getter).
-        - If called with a boolean argument, sets the state (setter).
+    @button_state.setter
+    def button_state(self, value):
+        self.__pedestrian_waiting = bool(
+            value
+        )  # Convert to boolean to ensure proper type
+        if self.__debug:
+            print(f"Button state on Pin {self.__pin} set to {self.__pedestrian_waiting}")
 
-        Args:
-            value (bool, optional): If provided, sets the pedestrian waiting state.
+    def take_press(self):
+        """Read and clear the waiting flag in one step.
+
+        Interrupts are disabled between the read and the clear, so a press
+        accepted at that moment is either returned now or kept for the next
+        call, never lost.
 
         Returns:
-            bool: Current state if called without arguments.
+            bool: True if a pedestrian was waiting.
         """
-        if value is None:
-            # Getter
-            if self.__debug:
-                print(
-                    f"Button connected to Pin {self.__pin} is {'WAITING' if self.__pedestrian_waiting else 'NOT WAITING'}"
-                )
-            return self.__pedestrian_waiting
-        else:
-            self.__pedestrian_waiting = bool(
-                value
-            )  # Convert to boolean to ensure proper type
-            if self.__debug:
-                print(
-                    f"Button state on Pin {self.__pin} set to {self.__pedestrian_waiting}"
-                )
+        irq_state = disable_irq()
+        waiting = self.__pedestrian_waiting
+        self.__pedestrian_waiting = False
+        enable_irq(irq_state)
+        return waiting
+
+    @property
+    def events(self):
+        """ButtonEvents: Queue of accepted presses, drained by the consumer, or None."""
+        return self.__events
+
+    @property
+    def press_count(self):
+        """int: Accepted presses since the button was created."""
+        return self.__press_count
+
+    @property
+    def last_press_ms(self):
+        """int: ticks_ms() of the last accepted press."""
+        return self.__last_pressed
+
+    def set_press_handler(self, handler):
+        """Register a function to be called on every debounced press.
+
+        The handler runs in interrupt context with no arguments, so it must
+        be short and must not allocate memory (e.g. ThreadSafeFlag.set).
+
+        Args:
+            handler (callable): Function to call, or None to remove it.
+        """
+        self.__press_handler = handler
 
     def callback(self, pin):
         """Interrupt handler called when the button is pressed (rising edge).
 
         Implements software debouncing by ignoring presses that occur within
-        200ms of the previous press. Sets the pedestrian_waiting flag when a
-        valid button press is detected.
+        200ms of the previous press. Sets the pedestrian_waiting flag and queues
+        the press, if there is a queue, when a valid button press is detected. Runs as a hard interrupt,
+        so it must not allocate; the debug print is deferred to __report().
 
         Args:
             pin (Pin): The pin that triggered the interrupt.
         """
         current_time = ticks_ms()  # Get the current time in milliseconds
         if ticks_diff(current_time, self.__last_pressed) > 200:  # 200ms debounce delay
-            self.__last_pressed = current_time
-            self.__pedestrian_waiting = True
-            if self.__debug:
-                print(f"Button pressed on Pin {self.__pin} at {current_time}ms")
+            if self.__events is not None:
+                self.__events.push(current_time, self.__pin)
+            self.__accept(current_time)
+
+    def __debounced(self, ticks, pin, kind):
+        """Debouncer handler: queue every event and accept presses."""
+        if self.__events is not None:
+            self.__events.push(ticks, pin, kind)
+        if kind == PRESS:
+            self.__accept(ticks)
+
+    def __accept(self, current_time):
+        """Record an accepted press; runs in interrupt or timer context."""
+        self.__last_pressed = current_time
+        self.__pedestrian_waiting = True
+        self.__press_count += 1
+        if self.__trace is not None:
+            self.__trace.record(EV_BUTTON, self.__pin)
+        if self.__press_handler is not None:
+            self.__press_handler()
+        if self.__debug and not self.__report_pending:
+            # One report at a time keeps the schedule queue from filling
+            self.__report_pending = True
+            schedule(self.__on_report, current_time)
+
+    def __report(self, current_time):
+        """Print a press outside interrupt context, run via micropython.schedule."""
+        self.__report_pending = False
+        print(f"Button pressed on Pin {self.__pin} at {current_time}ms")
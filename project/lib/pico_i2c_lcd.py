@@ -12,13 +12,33 @@ MASK_E  = 0x04       # P2
 SHIFT_BACKLIGHT = 3  # P3
 SHIFT_DATA      = 4  # P4-P7
 
+BYTES_PER_WRITE = 4  # E high/low for each of the two nibbles
+
 class I2cLcd(LcdApi):
-    
+
     #Implements a HD44780 character LCD connected via PCF8574 on I2C
+    #
+    # Each command or data byte is sent as its four PCF8574 port writes in a
+    # single I2C transaction from a preallocated buffer. Between
+    # hal_begin_batch() and hal_end_batch() (e.g. during putstr) the port
+    # writes are queued in a larger buffer instead, so a whole string goes
+    # out in one writeto(). The only allocation is the small memoryview
+    # slice made per flush. Batches may nest; the writes are sent when the
+    # outermost batch ends.
 
-    def __init__(self, i2c, i2c_addr, num_lines, num_columns):
+    def __init__(self, i2c, i2c_addr, num_lines, num_columns, batch_size=None):
+        # batch_size is the number of byte writes one transaction can hold,
+        # by default enough for every cell of the display plus a move_to each.
         self.i2c = i2c
         self.i2c_addr = i2c_addr
+        if batch_size is None:
+            batch_size = 2 * num_lines * num_columns
+        self.write_buf = bytearray(BYTES_PER_WRITE)
+        self.batch_buf = bytearray(BYTES_PER_WRITE * batch_size)
+        # Sliced on flush, so the queued bytes are sent without a copy
+        self.batch_view = memoryview(self.batch_buf)
+        self.batch_len = 0
+        self.batch_depth = 0
         self.i2c.writeto(self.i2c_addr, bytes([0]))
         utime.sleep_ms(20)   # Allow LCD time to powerup
         # Send reset 3 times
@@ -45,42 +65,69 @@ class I2cLcd(LcdApi):
         self.i2c.writeto(self.i2c_addr, bytes([byte | MASK_E]))
         self.i2c.writeto(self.i2c_addr, bytes([byte]))
         gc.collect()
-        
+
     def hal_backlight_on(self):
-        # Allows the hal layer to turn the backlight on
+        # Allows the hal layer to turn the backlight on. Queued writes are
+        # sent first to keep their order; an open batch stays open.
+        self.flush_batch()
         self.i2c.writeto(self.i2c_addr, bytes([1 << SHIFT_BACKLIGHT]))
         gc.collect()
-        
+
     def hal_backlight_off(self):
         #Allows the hal layer to turn the backlight off
+        self.flush_batch()
         self.i2c.writeto(self.i2c_addr, bytes([0]))
         gc.collect()
-        
+
+    def hal_begin_batch(self):
+        # Queue the following writes until the matching hal_end_batch()
+        self.batch_depth += 1
+
+    def hal_end_batch(self):
+        # Close a batch; the outermost one sends the queued writes in one
+        # transaction and stops queueing
+        if self.batch_depth:
+            self.batch_depth -= 1
+        if not self.batch_depth:
+            self.flush_batch()
+
+    def flush_batch(self):
+        # Send any queued port writes
+        if self.batch_len:
+            self.i2c.writeto(self.i2c_addr, self.batch_view[:self.batch_len])
+            self.batch_len = 0
+
     def hal_write_command(self, cmd):
         # Write a command to the LCD. Data is latched on the falling edge of E.
-        byte = ((self.backlight << SHIFT_BACKLIGHT) |
-                (((cmd >> 4) & 0x0f) << SHIFT_DATA))
-        self.i2c.writeto(self.i2c_addr, bytes([byte | MASK_E]))
-        self.i2c.writeto(self.i2c_addr, bytes([byte]))
-        byte = ((self.backlight << SHIFT_BACKLIGHT) |
-                ((cmd & 0x0f) << SHIFT_DATA))
-        self.i2c.writeto(self.i2c_addr, bytes([byte | MASK_E]))
-        self.i2c.writeto(self.i2c_addr, bytes([byte]))
+        self.hal_write_byte(cmd, 0)
         if cmd <= 3:
             # The home and clear commands require a worst case delay of 4.1 msec
+            self.flush_batch()
             utime.sleep_ms(5)
-        gc.collect()
 
     def hal_write_data(self, data):
         # Write data to the LCD. Data is latched on the falling edge of E.
-        byte = (MASK_RS |
-                (self.backlight << SHIFT_BACKLIGHT) |
-                (((data >> 4) & 0x0f) << SHIFT_DATA))
-        self.i2c.writeto(self.i2c_addr, bytes([byte | MASK_E]))
-        self.i2c.writeto(self.i2c_addr, bytes([byte]))
-        byte = (MASK_RS |
-                (self.backlight << SHIFT_BACKLIGHT) |
-                ((data & 0x0f) << SHIFT_DATA))      
-        self.i2c.writeto(self.i2c_addr, bytes([byte | MASK_E]))
-        self.i2c.writeto(self.i2c_addr, bytes([byte]))
-        gc.collect()
+        self.hal_write_byte(data, MASK_RS)
+
+    def hal_write_byte(self, value, rs):
+        # Build the four port writes for one byte, then send them or queue
+        # them in the batch buffer.
+        batching = self.batch_depth
+        if batching:
+            if self.batch_len == len(self.batch_buf):
+                self.flush_batch()
+            buf = self.batch_buf
+            i = self.batch_len
+            self.batch_len = i + BYTES_PER_WRITE
+        else:
+            buf = self.write_buf
+            i = 0
+        port = rs | (self.backlight << SHIFT_BACKLIGHT)
+        byte = port | (((value >> 4) & 0x0f) << SHIFT_DATA)
+        buf[i] = byte | MASK_E
+        buf[i + 1] = byte
+        byte = port | ((value & 0x0f) << SHIFT_DATA)
+        buf[i + 2] = byte | MASK_E
+        buf[i + 3] = byte
+        if not batching:
+            self.i2c.writeto(self.i2c_addr, buf)
@@ -0,0 +1,245 @@
+from array import array
+from machine import Pin, PWM, Timer, disable_irq, enable_irq
+from clock import system_clock
+
+# Perceptual brightness (0-255) to PWM duty, computed once at import
+GAMMA = array("H", [round(65535 * (i / 255) ** 2.2) for i in range(256)])
+
+
+class Pwm_Led_Light(PWM):
+    """Dimmable LED with non-blocking, gamma-corrected fades.
+
+    A drop-in alternative to Led_Light for the traffic and pedestrian
+    subsystems: on(), off(), toggle(), value(), flash() and ms_until_due()
+    behave the same, but the LED is driven by PWM. The pin is muxed to the
+    PWM slice, so register writes to GPIO_OUT do not reach it and a LedBank
+    must switch it through on() and off(). Brightness is a level
+    from 0 to 255 mapped through the 256-entry GAMMA table, so a fade looks
+    even to the eye. A fade is an integer step schedule run by a periodic
+    timer: each step is one multiply/divide, one table lookup and one
+    duty_u16() write, and the timer stops once the target is reached.
+
+    Args:
+        pin (int): The GPIO pin number the LED is connected to.
+        flashing (bool, optional): Whether to enable flashing capability. Defaults to False.
+        debug (bool, optional): Whether to print debug statements. Defaults to False.
+        clock (Clock, optional): Time source for flashing. Defaults to the system clock.
+        fade_ms (int, optional): Fade time used by on() and off(). Defaults to 0 (instant).
+        step_ms (int, optional): Time between fade steps. Defaults to 10.
+        timer (Timer, optional): Periodic timer for fade steps. Defaults to a new machine.Timer.
+        freq (int, optional): PWM frequency in Hz. Defaults to 1000.
+    """
+
+    def __init__(
+        self,
+        pin,
+        flashing=False,
+        debug=False,
+        clock=None,
+        fade_ms=0,
+        step_ms=10,
+        timer=None,
+        freq=1000,
+    ):
+        """Initialize the Pwm_Led_Light object.
+
+        Args:
+            pin (int): The GPIO pin number the LED is connected to.
+            flashing (bool, optional): Whether to enable flashing capability. Defaults to False.
+            debug (bool, optional): Whether to print debug statements. Defaults to False.
+            clock (Clock, optional): Time source for flashing. Defaults to the system clock.
+            fade_ms (int, optional): Fade time used by on() and off(). Defaults to 0 (instant).
+            step_ms (int, optional): Time between fade steps. Defaults to 10.
+            timer (Timer, optional): Periodic timer for fade steps. Defaults to a new machine.Timer.
+            freq (int, optional): PWM frequency in Hz. Defaults to 1000.
+        """
+        super().__init__(Pin(pin))
+        self.freq(freq)
+        self.duty_u16(0)
+        self.__debug = debug
+        self.__pin = pin
+        self.__flashing = flashing
+        self.__clock = clock if clock is not None else system_clock
+        self.__fade_ms = fade_ms
+        self.__step_ms = step_ms
+        self.__timer = timer if timer is not None else Timer()
+        self.__max_level = 255
+        self.__level = 0
+        self.__start = 0
+        self.__target = 0
+        self.__step = 0
+        self.__steps = 0
+        self.__fading = False
+        self.__last_toggle_time = self.__clock.ticks_ms()
+        self.__flash_active = False
+        # Bound once so arming the timer does not allocate
+        self.__on_timer = self.__fade_step
+
+    def on(self):
+        """Turn the LED on, fading up to max_level over fade_ms."""
+        self.fade_to(self.__max_level, self.__fade_ms)
+        self.__flash_active = False
+        if self.__debug:
+            print(f"LED connected to Pin {self.__pin} is 1")
+
+    def off(self):
+        """Turn the LED off, fading down over fade_ms."""
+        self.fade_to(0, self.__fade_ms)
+        self.__flash_active = False
+        if self.__debug:
+            print(f"LED connected to Pin {self.__pin} is 0")
+
+    def toggle(self):
+        """Toggle the LED between on and off states."""
+        if self.__target:
+            self.off()
+        else:
+            self.on()
+
+    def value(self, value=None):
+        """Get or set the LED state like Pin.value().
+
+        Args:
+            value (int, optional): 1 turns the LED on, 0 turns it off.
+
+        Returns:
+            int: 1 if the LED is on (or fading on), 0 otherwise, when called
+            without a value.
+        """
+        if value is None:
+            return 1 if self.__target else 0
+        if value:
+            self.on()
+        else:
+            self.off()
+
+    @property
+    def pin_number(self):
+        """Get the GPIO pin number the LED is connected to.
+
+        Returns:
+            int: The GPIO pin number.
+        """
+        return self.__pin
+
+    @property
+    def gpio_writable(self):
+        """bool: Always False, the pin is driven by PWM rather than GPIO_OUT."""
+        return False
+
+    @property
+    def self_timed(self):
+        """bool: Always False, flashing needs flash() called every tick."""
+        return False
+
+    def invalidate(self):
+        """Do nothing: the state is kept by on() and off(), not read back.
+
+        Provided so lamps can be used interchangeably; a LedBank only
+        changes this lamp through on() and off().
+        """
+
+    @property
+    def led_light_state(self):
+        """Get or set the state of the LED: 1 for on, 0 for off."""
+        return self.value()
+
+    @led_light_state.setter
+    def led_light_state(self, value):
+        self.value(value)
+
+    @property
+    def brightness(self):
+        """int: Current brightness level, 0 to 255."""
+        return self.__level
+
+    @property
+    def max_level(self):
+        """Get or set the brightness used by on(), 0 to 255.
+
+        Lowering it dims the LED, e.g. at night. A lit LED fades to the new
+        level over fade_ms.
+        """
+        return self.__max_level
+
+    @max_level.setter
+    def max_level(self, level):
+        self.__max_level = max(0, min(255, level))
+        if self.__target:
+            self.fade_to(self.__max_level, self.__fade_ms)
+
+    def fade_to(self, level, duration_ms=0):
+        """Fade to a brightness level without blocking.
+
+        Args:
+            level (int): Target brightness, 0 to 255.
+            duration_ms (int, optional): Fade time. Defaults to 0 (instant).
+        """
+        level = max(0, min(255, level))
+        steps = duration_ms // self.__step_ms
+        if steps < 1 or level == self.__level:
+            self.__stop_fade()
+            self.__target = level
+            self.__level = level
+            self.duty_u16(GAMMA[level])
+            return
+        # The timer callback must not see a half-updated schedule
+        irq_state = disable_irq()
+        self.__start = self.__level
+        self.__target = level
+        self.__step = 0
+        self.__steps = steps
+        enable_irq(irq_state)
+        if not self.__fading:
+            self.__fading = True
+            timer = self.__timer
+            timer.init(
+                mode=timer.PERIODIC, period=self.__step_ms, callback=self.__on_timer
+            )
+
+    def flash(self):
+        """Non-blocking flash: toggles LED every 500 milliseconds.
+
+        This method should be called repeatedly in the main loop.
+        The LED will toggle only if flashing is enabled and 500 ms have
+        elapsed since the last toggle.
+        """
+        now = self.__clock.ticks_ms()
+        elapsed = self.__clock.ticks_diff(now, self.__last_toggle_time)
+        if self.__flashing and elapsed >= 500:
+            self.toggle()
+            self.__last_toggle_time = now
+        self.__flash_active = self.__flashing
+
+    def ms_until_due(self):
+        """Get how long until the next flash toggle is due.
+
+        Fades run from the timer, so they never need the CPU woken.
+
+        Returns:
+            int or None: Milliseconds until flash() will next toggle (0 if
+            it is due now), or None if the LED is not currently flashing.
+        """
+        if not self.__flash_active:
+            return None
+        now = self.__clock.ticks_ms()
+        elapsed = self.__clock.ticks_diff(now, self.__last_toggle_time)
+        return max(0, 500 - elapsed)
+
+    def __stop_fade(self):
+        """Stop the fade timer if a fade is running."""
+        if self.__fading:
+            self.__fading = False
+            self.__timer.deinit()
+
+    def __fade_step(self, timer):
+        """Timer callback: move the brightness one step along the fade."""
+        step = self.__step + 1
+        start = self.__start
+        level = start + (self.__target - start) * step // self.__steps
+        self.__step = step
+        self.__level = level
+        self.duty_u16(GAMMA[level])
+        if step >= self.__steps:
+            self.__fading = False
+            timer.deinit()
@@ -0,0 +1,165 @@
+from array import array
+
+
+class TickProfiler:
+    """Per-state histogram of how long each controller tick takes.
+
+    Every tick duration in microseconds is counted in a log2 bucket of its
+    state's histogram: bucket 0 holds 0 us and bucket b holds durations from
+    2**(b-1) to 2**b - 1 us. The histograms, minimums and maximums live in
+    preallocated arrays, so record() never allocates. The 99th percentile is
+    reported as the upper bound of its bucket, which never underestimates.
+
+    Pass the profiler to the Controller to time every update():
+
+        profiler = TickProfiler(STATE_NAMES, budget_us=10000)
+        controller = Controller(..., profiler=profiler)
+        ...
+        profiler.report()
+
+    Args:
+        names (sequence): State names, indexed by state id.
+        budget_us (int, optional): Tick budget in microseconds. Ticks that
+            take longer are counted as overruns. Defaults to None.
+    """
+
+    BUCKETS = 32
+
+    def __init__(self, names, budget_us=None):
+        """Initialize the TickProfiler object.
+
+        Args:
+            names (sequence): State names, indexed by state id.
+            budget_us (int, optional): Tick budget in microseconds, longer
+                ticks are counted as overruns. Defaults to None.
+        """
+        states = len(names)
+        self.__names = names
+        self.__budget_us = budget_us
+        self.__histogram = array("I", [0] * (states * self.BUCKETS))
+        self.__counts = array("I", [0] * states)
+        self.__min_us = array("I", [0] * states)
+        self.__max_us = array("I", [0] * states)
+        self.__overruns = array("I", [0] * states)
+
+    def record(self, state, elapsed_us):
+        """Count one tick.
+
+        Args:
+            state (int): State id the tick is attributed to.
+            elapsed_us (int): Duration of the tick in microseconds.
+        """
+        if elapsed_us < 0:
+            elapsed_us = 0
+        bucket = 0
+        remaining = elapsed_us
+        while remaining and bucket < self.BUCKETS - 1:
+            remaining >>= 1
+            bucket += 1
+        self.__histogram[state * self.BUCKETS + bucket] += 1
+        count = self.__counts[state]
+        if count == 0 or elapsed_us < self.__min_us[state]:
+            self.__min_us[state] = elapsed_us
+        if elapsed_us > self.__max_us[state]:
+            self.__max_us[state] = elapsed_us
+        self.__counts[state] = count + 1
+        if self.__budget_us is not None and elapsed_us > self.__budget_us:
+            self.__overruns[state] += 1
+
+    def percentile(self, state, percent):
+        """Get an upper bound for a percentile of a state's tick durations.
+
+        Args:
+            state (int): State id.
+            percent (int): Percentile, from 1 to 100.
+
+        Returns:
+            int or None: Duration in microseconds, or None if the state has
+            no ticks recorded.
+        """
+        count = self.__counts[state]
+        if count == 0:
+            return None
+        # Rank of the sample at the percentile, rounded up
+        rank = (count * percent + 99) // 100
+        seen = 0
+        base = state * self.BUCKETS
+        for bucket in range(self.BUCKETS):
+            seen += self.__histogram[base + bucket]
+            if seen >= rank:
+                upper = (1 << bucket) - 1
+                return min(max(upper, self.__min_us[state]), self.__max_us[state])
+        return self.__max_us[state]
+
+    def summary(self, state):
+        """Get the tick statistics of one state.
+
+        Args:
+            state (int): State id.
+
+        Returns:
+            tuple: (count, min_us, max_us, p99_us, overruns). The durations
+            are None if the state has no ticks recorded.
+        """
+        count = self.__counts[state]
+        if count == 0:
+            return 0, None, None, None, 0
+        return (
+            count,
+            self.__min_us[state],
+            self.__max_us[state],
+            self.percentile(state, 99),
+            self.__overruns[state],
+        )
+
+    def histogram(self, state):
+        """Get the non-empty buckets of a state's histogram.
+
+        Args:
+            state (int): State id.
+
+        Returns:
+            list: (upper_bound_us, count) pairs in increasing order.
+        """
+        base = state * self.BUCKETS
+        return [
+            ((1 << bucket) - 1, self.__histogram[base + bucket])
+            for bucket in range(self.BUCKETS)
+            if self.__histogram[base + bucket]
+        ]
+
+    def worst_us(self):
+        """Get the longest tick seen in any state.
+
+        Returns:
+            int: Duration in microseconds, 0 if nothing was recorded.
+        """
+        return max(self.__max_us)
+
+    def reset(self):
+        """Discard every recorded tick."""
+        for values in (
+            self.__histogram,
+            self.__counts,
+            self.__min_us,
+            self.__max_us,
+            self.__overruns,
+        ):
+            for i in range(len(values)):
+                values[i] = 0
+
+    def report(self):
+        """Print a table of the tick statistics of every state."""
+        print(
+            "{:<14}{:>8}{:>10}{:>10}{:>10}{:>10}".format(
+                "state", "ticks", "min us", "max us", "p99 us", "overruns"
+            )
+        )
+        for state, name in enumerate(self.__names):
+            count, min_us, max_us, p99_us, overruns = self.summary(state)
+            if count:
+                print(
+                    "{:<14}{:>8}{:>10}{:>10}{:>10}{:>10}".format(
+                        name, count, min_us, max_us, p99_us, overruns
+                    )
+                )
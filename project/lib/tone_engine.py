@@ -0,0 +1,210 @@
+from array import array
+from clock import system_clock
+
+try:
+    from machine import Timer, disable_irq, enable_irq
+except ImportError:
+    Timer = None
+
+    def disable_irq():
+        return None
+
+    def enable_irq(state):
+        pass
+
+
+class ToneEngine:
+    """Plays queued tones on a PWM output without blocking the caller.
+
+    play() starts a tone at once if the engine is idle, or queues it behind
+    the tones already waiting. When a tone's time is up the next one starts
+    and the output is silenced after the last. The switch is made by a
+    one-shot machine.Timer callback, or, where no timer is available, by
+    service() once the tone's deadline has passed.
+
+    The queue is a ring of preallocated arrays, so neither play() nor the
+    timer callback allocates. A sequence that does not fit in the free
+    queue space is dropped as a whole and counted.
+
+    Args:
+        output (PWM): Output with freq() and duty_u16(), e.g. the buzzer.
+        timer (Timer, optional): One-shot timer used to end each tone.
+            Defaults to a new machine.Timer, or deadline mode on the host.
+        clock (Clock, optional): Time source. Defaults to the system clock.
+        queue_size (int, optional): Tones that can be waiting. Defaults to 16.
+    """
+
+    def __init__(self, output, timer=None, clock=None, queue_size=16):
+        """Initialize the ToneEngine object.
+
+        Args:
+            output (PWM): Output with freq() and duty_u16().
+            timer (Timer, optional): One-shot timer used to end each tone.
+                Defaults to a new machine.Timer, or None on the host, in
+                which case service() must be called to advance the tones.
+            clock (Clock, optional): Time source. Defaults to the system clock.
+            queue_size (int, optional): Tones that can be waiting.
+                Defaults to 16.
+        """
+        if timer is None and Timer is not None:
+            timer = Timer()
+        self.__output = output
+        self.__timer = timer
+        self.__clock = clock if clock is not None else system_clock
+        self.__size = queue_size
+        self.__freqs = array("I", [0] * queue_size)
+        self.__duties = array("H", [0] * queue_size)
+        self.__durations = array("I", [0] * queue_size)
+        self.__head = 0
+        self.__length = 0
+        self.__playing = False
+        self.__ends_at = 0
+        self.__played = 0
+        self.__dropped = 0
+        # Bound once so arming the timer does not allocate
+        self.__on_timer = self.__timer_expired
+
+    def play(self, freq, duration_ms, duty=32768):
+        """Queue a single tone.
+
+        Args:
+            freq (int): Frequency in Hz, 0 for a silent rest.
+            duration_ms (int): Length of the tone in milliseconds.
+            duty (int, optional): PWM duty (0-65535). Defaults to 32768.
+
+        Returns:
+            bool: True if the tone was queued, False if it was dropped.
+        """
+        irq_state = disable_irq()
+        if self.__length == self.__size:
+            self.__dropped += 1
+            enable_irq(irq_state)
+            return False
+        self.__put(freq, duty, duration_ms)
+        if not self.__playing:
+            self.__start_next()
+        enable_irq(irq_state)
+        return True
+
+    def play_sequence(self, steps):
+        """Queue a sequence of tones, either all of them or none.
+
+        Args:
+            steps (sequence): (freq, duty, duration_ms) tuples.
+
+        Returns:
+            bool: True if the sequence was queued, False if it was dropped
+            because the queue did not have room for every step.
+        """
+        irq_state = disable_irq()
+        if self.__length + len(steps) > self.__size:
+            self.__dropped += 1
+            enable_irq(irq_state)
+            return False
+        for freq, duty, duration_ms in steps:
+            self.__put(freq, duty, duration_ms)
+        if not self.__playing:
+            self.__start_next()
+        enable_irq(irq_state)
+        return True
+
+    def stop(self):
+        """Silence the output and discard every queued tone."""
+        irq_state = disable_irq()
+        if self.__timer is not None:
+            self.__timer.deinit()
+        self.__length = 0
+        self.__playing = False
+        self.__output.duty_u16(0)
+        enable_irq(irq_state)
+
+    def service(self):
+        """Advance to the next tone if the current one has ended.
+
+        Only needed when the engine runs without a timer; with a timer it
+        does nothing.
+        """
+        if self.__timer is not None or not self.__playing:
+            return
+        clock = self.__clock
+        if clock.ticks_diff(clock.ticks_ms(), self.__ends_at) >= 0:
+            irq_state = disable_irq()
+            self.__start_next()
+            enable_irq(irq_state)
+
+    @property
+    def playing(self):
+        """bool: True while a tone or rest is sounding."""
+        return self.__playing
+
+    def queued(self):
+        """Get the number of tones waiting behind the current one.
+
+        Returns:
+            int: Queued tones.
+        """
+        return self.__length
+
+    def ms_until_due(self):
+        """Get how long until the current tone ends.
+
+        Returns:
+            int or None: Milliseconds until the next tone change (0 if it is
+            due now), or None when nothing is playing.
+        """
+        if not self.__playing:
+            return None
+        clock = self.__clock
+        return max(0, clock.ticks_diff(self.__ends_at, clock.ticks_ms()))
+
+    def stats(self):
+        """Get the tone counters.
+
+        Returns:
+            tuple: (played, dropped) tones started and sequences dropped.
+        """
+        return self.__played, self.__dropped
+
+    def __put(self, freq, duty, duration_ms):
+        """Append a tone to the ring. Called with interrupts disabled."""
+        i = self.__head + self.__length
+        if i >= self.__size:
+            i -= self.__size
+        self.__freqs[i] = freq
+        self.__duties[i] = duty
+        self.__durations[i] = duration_ms
+        self.__length += 1
+
+    def __start_next(self):
+        """Start the next queued tone, or go quiet if there is none.
+
+        Called with interrupts disabled or from the timer callback.
+        """
+        output = self.__output
+        if self.__length == 0:
+            output.duty_u16(0)
+            self.__playing = False
+            return
+        i = self.__head
+        freq = self.__freqs[i]
+        duration_ms = self.__durations[i]
+        self.__head = i + 1 if i + 1 < self.__size else 0
+        self.__length -= 1
+        if freq:
+            output.freq(freq)
+            output.duty_u16(self.__duties[i])
+        else:
+            output.duty_u16(0)
+        self.__playing = True
+        self.__played += 1
+        clock = self.__clock
+        self.__ends_at = clock.ticks_add(clock.ticks_ms(), duration_ms)
+        if self.__timer is not None:
+            timer = self.__timer
+            timer.init(
+                mode=timer.ONE_SHOT, period=max(1, duration_ms), callback=self.__on_timer
+            )
+
+    def __timer_expired(self, timer):
+        """Timer callback: the current tone has ended."""
+        self.__start_next()
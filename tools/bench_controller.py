@@ -0,0 +1,199 @@
+"""
+Host-side benchmark of the Controller.update() state machine.
+
+Compares the original if/elif engine (string state compares) against the
+compiled transition table in project/lib/controller.py. Each state is held
+for a fixed number of updates, and the state's output action is also timed
+on its own, so both the whole update and the dispatch left once the action
+is taken away can be compared state by state. The lamps, button and buzzer are do-nothing stand-ins, and
+both engines read the same injected VirtualClock with ticks_ms() and
+ticks_diff(), so the figures are the cost of the engine itself rather than
+of the time source.
+
+Run from the repository root:
+    python tools/bench_controller.py
+"""
+
+import os
+import sys
+from time import perf_counter
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "project", "lib"))
+
+from clock import VirtualClock  # noqa: E402
+from controller import (  # noqa: E402
+    STATE_NAMES,
+    Controller,
+    PedestrianSubsystem,
+    TrafficLightSubsystem,
+)
+
+UPDATES = 50000
+REPEATS = 21
+
+
+class NullLight:
+    def on(self):
+        pass
+
+    def off(self):
+        pass
+
+    def flash(self):
+        pass
+
+
+class NullButton:
+    button_state = False
+
+    def take_press(self):
+        return False
+
+
+class NullBuzzer:
+    def warning_on(self):
+        pass
+
+    def warning_off(self):
+        pass
+
+
+class LegacyController:
+    """The string-compare engine Controller.update() used before the table."""
+
+    def __init__(
+        self, ped_red, ped_green, traffic_red, traffic_amber, traffic_green, button, buzzer, clock
+    ):
+        self.traffic_lights = TrafficLightSubsystem(traffic_red, traffic_amber, traffic_green)
+        self.pedestrian_signals = PedestrianSubsystem(ped_red, ped_green, button, buzzer)
+        self.debug = False
+        self.clock = clock
+        self.state = "IDLE"
+        self.last_state_change = clock.ticks_ms()
+
+    def set_idle_state(self):
+        if self.debug:
+            print("System: IDLE state")
+        self.pedestrian_signals.show_stop()
+        self.traffic_lights.show_green()
+
+    def set_change_state(self):
+        if self.debug:
+            print("System: CHANGE state")
+        self.pedestrian_signals.show_stop()
+        self.traffic_lights.show_amber()
+
+    def set_walk_state(self):
+        if self.debug:
+            print("System: WALK state")
+        self.pedestrian_signals.show_walk()
+        self.traffic_lights.show_red()
+
+    def set_warning_state(self):
+        if self.debug:
+            print("System: WALK WARNING state")
+        self.pedestrian_signals.show_warning()
+        self.traffic_lights.show_red()
+
+    def update(self):
+        current_time = self.clock.ticks_ms()
+        elapsed = self.clock.ticks_diff(current_time, self.last_state_change)
+
+        if self.state == "IDLE":
+            if self.pedestrian_signals.is_button_pressed() and elapsed > 5000:
+                self.state = "CHANGE"
+                self.last_state_change = current_time
+            self.set_idle_state()
+
+        elif self.state == "CHANGE":
+            if elapsed > 5000:
+                self.state = "WALK"
+                self.last_state_change = current_time
+            self.set_change_state()
+
+        elif self.state == "WALK":
+            if elapsed > 5000:
+                self.state = "WALK_WARNING"
+                self.last_state_change = current_time
+            self.set_walk_state()
+
+        elif self.state == "WALK_WARNING":
+            if elapsed > 5000:
+                self.state = "IDLE"
+                self.last_state_change = current_time
+                self.pedestrian_signals.reset_button()
+            self.set_warning_state()
+
+
+def make(engine, clock):
+    lamps = [NullLight() for _ in range(5)]
+    if engine is Controller:
+        return Controller(*lamps, NullButton(), NullBuzzer(), clock=clock)
+    return engine(*lamps, NullButton(), NullBuzzer(), clock)
+
+
+ACTIONS = ("set_idle_state", "set_change_state", "set_walk_state", "set_warning_state")
+
+
+def best_ns(*calls):
+    """Time UPDATES calls of each function, REPEATS times in turn.
+
+    The functions are interleaved so that a slow patch on the host hits
+    them alike, and the fastest run of each is kept.
+
+    Returns:
+        list: ns per call for each function.
+    """
+    best = [None] * len(calls)
+    for _ in range(REPEATS):
+        for i, call in enumerate(calls):
+            start = perf_counter()
+            for _ in range(UPDATES):
+                call()
+            elapsed = perf_counter() - start
+            if best[i] is None or elapsed < best[i]:
+                best[i] = elapsed
+    return [elapsed * 1e9 / UPDATES for elapsed in best]
+
+
+def hold(controller, state):
+    # Both engines restart the state's timer when it is set
+    controller.state = state
+    if hasattr(controller, "last_state_change"):
+        controller.last_state_change = controller.clock.ticks_ms()
+
+
+def main():
+    print(
+        "{:<14}{:>11}{:>11}{:>9}{:>15}{:>14}{:>9}".format(
+            "state", "legacy ns", "table ns", "speedup", "legacy disp ns", "table disp ns", "speedup"
+        )
+    )
+    for state_id, state in enumerate(STATE_NAMES[:-1]):
+        clock = VirtualClock()
+        legacy = make(LegacyController, clock)
+        table = make(Controller, clock)
+        hold(legacy, state)
+        hold(table, state)
+        # The state's action is the same work in both engines; what is left
+        # of an update once it is taken away is the dispatch
+        action = getattr(table, ACTIONS[state_id])
+        legacy_ns, table_ns, action_ns = best_ns(legacy.update, table.update, action)
+        assert legacy.state == state and table.state == state, "state changed"
+        legacy_dispatch = max(1.0, legacy_ns - action_ns)
+        table_dispatch = max(1.0, table_ns - action_ns)
+        print(
+            "{:<14}{:>11.0f}{:>11.0f}{:>8.2f}x{:>15.0f}{:>14.0f}{:>8.2f}x".format(
+                state,
+                legacy_ns,
+                table_ns,
+                legacy_ns / table_ns,
+                legacy_dispatch,
+                table_dispatch,
+                legacy_dispatch / table_dispatch,
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+Host-side benchmark of the Debouncer against the 200 ms edge lockout.
+
+Each simulated button follows the same script of presses with contact
+chatter on both edges: a few short presses, a double press and a long
+hold. The script is replayed through
+
+    lockout     the Pedestrian_Button rising-edge handler with its 200 ms
+                lockout, fed every rising edge of the chattering signal
+    debouncer   project/lib/debouncer.py sampling every 5 ms on a
+                VirtualClock
+
+and the events each one reports are counted. The script has 6 real
+presses; the lockout sees chatter on a release more than 200 ms after the
+press as another press.
+
+The cost table times Debouncer.sample() for different numbers of buttons
+and reports the CPU time per button per second of sampling. Host figures
+only show how the cost scales; on the Pico each sample is slower by
+roughly the ratio of the two CPUs.
+
+Run from the repository root:
+    python tools/bench_debouncer.py
+"""
+
+import os
+import sys
+from time import perf_counter
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "project", "lib"))
+
+from button_events import KIND_NAMES  # noqa: E402
+from clock import VirtualClock  # noqa: E402
+from debouncer import Debouncer  # noqa: E402
+
+PERIOD_MS = 5
+CHATTER_MS = 6  # contact bounce after each edge, toggling every 1 ms
+# (press time, hold time) of each real press
+SCRIPT = (
+    (100, 120),  # short
+    (800, 350),  # short, slow release
+    (1600, 90),  # double press...
+    (1800, 90),
+    (2600, 1500),  # long hold
+    (4600, 250),  # short
+)
+SCRIPT_END_MS = 5500
+SAMPLES = 20000
+
+
+def edges():
+    """Get the (ticks_ms, level) transitions of the chattering signal."""
+    result = []
+    for start, hold in SCRIPT:
+        for ms in range(CHATTER_MS):
+            result.append((start + ms, 1 - (ms & 1)))
+        result.append((start + CHATTER_MS, 1))
+        release = start + hold
+        for ms in range(CHATTER_MS):
+            result.append((release + ms, ms & 1))
+        result.append((release + CHATTER_MS, 0))
+    return result
+
+
+class ScriptedPin:
+    """Input pin whose level follows the scripted signal on a clock."""
+
+    def __init__(self, clock, transitions):
+        self.__clock = clock
+        self.__transitions = transitions
+        self.__next = 0
+        self.__level = 0
+
+    def value(self):
+        now = self.__clock.ticks_ms()
+        transitions = self.__transitions
+        while self.__next < len(transitions) and transitions[self.__next][0] <= now:
+            self.__level = transitions[self.__next][1]
+            self.__next += 1
+        return self.__level
+
+
+def lockout_presses(transitions):
+    """Count the presses the 200 ms rising-edge lockout accepts."""
+    presses = 0
+    last = -1000
+    level = 0
+    for ticks, new_level in transitions:
+        if new_level and not level and ticks - last > 200:
+            last = ticks
+            presses += 1
+        level = new_level
+    return presses
+
+
+def debounced_events(transitions):
+    """Count the events the Debouncer reports for the script."""
+    clock = VirtualClock()
+    counts = [0] * len(KIND_NAMES)
+
+    def handler(ticks, pin, kind):
+        counts[kind] += 1
+
+    debouncer = Debouncer(period_ms=PERIOD_MS, clock=clock)
+    debouncer.add(ScriptedPin(clock, transitions), handler)
+    debouncer.start()
+    while clock.ticks_ms() < SCRIPT_END_MS:
+        clock.sleep_ms(1)
+        debouncer.service()
+    return counts
+
+
+class IdlePin:
+    def value(self):
+        return 0
+
+
+def sample_cost(buttons):
+    """Time Debouncer.sample() for a number of idle buttons."""
+    debouncer = Debouncer(max_buttons=buttons, clock=VirtualClock())
+    for pin in range(buttons):
+        debouncer.add(IdlePin(), None, pin)
+    start = perf_counter()
+    for _ in range(SAMPLES):
+        debouncer.sample()
+    elapsed_us = (perf_counter() - start) * 1000000
+    per_sample_us = elapsed_us / SAMPLES / buttons
+    return per_sample_us, per_sample_us * 1000 / PERIOD_MS
+
+
+def main():
+    transitions = edges()
+    print(f"Script: {len(SCRIPT)} real presses, {CHATTER_MS} ms of chatter per edge")
+    print(f"  lockout accepted presses: {lockout_presses(transitions)}")
+    counts = debounced_events(transitions)
+    events = ", ".join(f"{name} {n}" for name, n in zip(KIND_NAMES, counts))
+    print(f"  debouncer events: {events}")
+    print()
+    print(f"Sampling cost every {PERIOD_MS} ms")
+    print(f"{'buttons':>8}{'us/button/sample':>18}{'us/button/s':>14}")
+    for buttons in (1, 4, 8, 16):
+        per_sample, per_second = sample_cost(buttons)
+        print(f"{buttons:>8}{per_sample:>18.3f}{per_second:>14.1f}")
+
+
+main()
@@ -0,0 +1,90 @@
+"""
+On-board benchmark of I2cLcd.putstr() throughput in characters per second.
+
+Compares the original HAL, which sent every byte as four one-byte
+writeto() calls and ran gc.collect() after each character, against the
+batched HAL in project/lib/pico_i2c_lcd.py, which sends a whole string in
+one transaction. Both drive the same display, wired as in
+introduction_projects/7.I2C_module.md (SDA GP0, SCL GP1). The I2C bus is
+wrapped to count transactions as well.
+
+Run on the Pico with the library mounted, from the repository root:
+    mpremote mount project/lib run tools/bench_lcd.py
+"""
+
+import gc
+
+from machine import I2C, Pin
+from utime import sleep_ms, ticks_diff, ticks_us
+
+from pico_i2c_lcd import MASK_E, MASK_RS, SHIFT_BACKLIGHT, SHIFT_DATA, I2cLcd
+
+SCREEN = "Cross in 12 sec Walk with care  "  # 32 characters, a full 2x16 screen
+REPEATS = 20
+
+
+class CountingI2C:
+    """Passes writes through to the bus and counts them."""
+
+    def __init__(self, i2c):
+        self.i2c = i2c
+        self.transactions = 0
+
+    def writeto(self, addr, buf):
+        self.transactions += 1
+        return self.i2c.writeto(addr, buf)
+
+
+class LegacyI2cLcd(I2cLcd):
+    """I2cLcd with the per-nibble, per-character-collect HAL used before batching."""
+
+    def hal_begin_batch(self):
+        pass
+
+    def hal_end_batch(self):
+        pass
+
+    def hal_write_command(self, cmd):
+        self.legacy_write(cmd, 0)
+        if cmd <= 3:
+            sleep_ms(5)
+        gc.collect()
+
+    def hal_write_data(self, data):
+        self.legacy_write(data, MASK_RS)
+        gc.collect()
+
+    def legacy_write(self, value, rs):
+        port = rs | (self.backlight << SHIFT_BACKLIGHT)
+        byte = port | (((value >> 4) & 0x0F) << SHIFT_DATA)
+        self.i2c.writeto(self.i2c_addr, bytes([byte | MASK_E]))
+        self.i2c.writeto(self.i2c_addr, bytes([byte]))
+        byte = port | ((value & 0x0F) << SHIFT_DATA)
+        self.i2c.writeto(self.i2c_addr, bytes([byte | MASK_E]))
+        self.i2c.writeto(self.i2c_addr, bytes([byte]))
+
+
+def measure(lcd, bus):
+    """Write SCREEN REPEATS times from home and return (chars/s, transactions/screen)."""
+    bus.transactions = 0
+    start = ticks_us()
+    for _ in range(REPEATS):
+        lcd.move_to(0, 0)
+        lcd.putstr(SCREEN)
+    elapsed = ticks_diff(ticks_us(), start)
+    return len(SCREEN) * REPEATS * 1000000 // elapsed, bus.transactions // REPEATS
+
+
+def main():
+    i2c = I2C(0, sda=Pin(0), scl=Pin(1), freq=400000)
+    bus = CountingI2C(i2c)
+    addr = i2c.scan()[0]
+    print(f"{'HAL':<10}{'chars/s':>10}{'writes/screen':>16}")
+    for name, cls in (("legacy", LegacyI2cLcd), ("batched", I2cLcd)):
+        lcd = cls(bus, addr, 2, 16)
+        chars, writes = measure(lcd, bus)
+        print(f"{name:<10}{chars:>10}{writes:>16}")
+        lcd.clear()
+
+
+main()
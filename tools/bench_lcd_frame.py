@@ -0,0 +1,67 @@
+"""
+Host-side count of LCD bus writes for a once-per-second countdown screen.
+
+The screen shows a walk countdown on the top line and a fixed message on
+the bottom line, redrawn every second for 60 seconds by
+
+    putstr       move_to(0, 0) and putstr() of the whole screen
+    framebuffer  LcdFrameBuffer.write_line() of both lines, then flush()
+
+on a RecordingLcd, which counts the commands and data bytes each update
+sends and checks both leave the same text on the display.
+
+Run from the repository root:
+    python tools/bench_lcd_frame.py
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "project", "lib"))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from lcd_framebuffer import LcdFrameBuffer  # noqa: E402
+from sim_devices import RecordingLcd  # noqa: E402
+
+SECONDS = 60
+MESSAGE = "Walk with care"
+
+
+def screens():
+    for remaining in range(SECONDS, 0, -1):
+        yield f"Cross in {remaining} s", MESSAGE
+
+
+def run_putstr():
+    lcd = RecordingLcd(2, 16)
+    lcd.reset_counts()
+    for top, bottom in screens():
+        lcd.move_to(0, 0)
+        lcd.putstr(f"{top:<16}{bottom:<16}")
+    return lcd
+
+
+def run_framebuffer():
+    lcd = RecordingLcd(2, 16)
+    frame = LcdFrameBuffer(lcd)
+    lcd.reset_counts()
+    for top, bottom in screens():
+        frame.write_line(0, top)
+        frame.write_line(1, bottom)
+        frame.flush()
+    return lcd
+
+
+def main():
+    print(f"{SECONDS} countdown updates of a 2x16 screen")
+    print(f"{'method':<13}{'commands':>10}{'data':>8}{'writes/update':>15}")
+    results = []
+    for name, run in (("putstr", run_putstr), ("framebuffer", run_framebuffer)):
+        lcd = run()
+        writes = (lcd.commands + lcd.data) / SECONDS
+        print(f"{name:<13}{lcd.commands:>10}{lcd.data:>8}{writes:>15.1f}")
+        results.append((lcd.text(0), lcd.text(1)))
+    print("same final screen:", results[0] == results[1])
+
+
+main()
@@ -0,0 +1,98 @@
+"""
+Host-side count of CGRAM uploads for a walk countdown with custom glyphs.
+
+Each second the screen shows a two-frame walking figure and the remaining
+seconds as two-glyph-wide big digits (a top and a bottom half for each of
+the 10 digits), which is 22 glyphs in all, far more than the 8 CGRAM
+slots. The screen is drawn on a RecordingLcd through an LcdFrameBuffer by
+
+    upload       custom_char() of every glyph each time it is drawn, as a
+                 caller managing the slots by hand would have to
+    cache        GlyphCache, which only uploads on a miss
+
+and the glyph uploads and bus writes of each are counted, along with the
+cache's hit/miss counters.
+
+Run from the repository root:
+    python tools/bench_lcd_glyphs.py
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "project", "lib"))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from lcd_framebuffer import LcdFrameBuffer  # noqa: E402
+from lcd_glyphs import GlyphCache  # noqa: E402
+from sim_devices import RecordingLcd  # noqa: E402
+
+SECONDS = 30
+
+
+def glyphs():
+    """Get made-up 8-row bitmaps for every glyph id; only the ids matter."""
+    result = {("walk", 0): [4, 14, 4, 14, 21, 4, 10, 17]}
+    result[("walk", 1)] = [4, 14, 4, 14, 4, 4, 10, 10]
+    for digit in range(10):
+        for half in (0, 1):
+            result[(digit, half)] = [(digit * 3 + half + row) & 31 for row in range(8)]
+    return result
+
+
+def frames():
+    """Get the glyph ids to draw each second as (x, y, glyph_id) tuples."""
+    for remaining in range(SECONDS, 0, -1):
+        cells = [(0, 0, ("walk", remaining & 1))]
+        for n, char in enumerate(f"{remaining:2d}"):
+            if char != " ":
+                cells.append((3 + n, 0, (int(char), 0)))
+                cells.append((3 + n, 1, (int(char), 1)))
+        yield cells
+
+
+def run_upload(bitmaps):
+    lcd = RecordingLcd(2, 16)
+    frame = LcdFrameBuffer(lcd)
+    lcd.reset_counts()
+    uploads = 0
+    for cells in frames():
+        frame.clear()
+        # Hand-managed slots: upload each drawn glyph into the next slot
+        for slot, (x, y, glyph_id) in enumerate(cells):
+            lcd.custom_char(slot, bitmaps[glyph_id])
+            frame.frame[y * 16 + x] = slot
+            uploads += 1
+        frame.flush()
+    return lcd, uploads
+
+
+def run_cache(bitmaps):
+    lcd = RecordingLcd(2, 16)
+    frame = LcdFrameBuffer(lcd)
+    cache = GlyphCache(lcd, frame)
+    for glyph_id, bitmap in bitmaps.items():
+        cache.define(glyph_id, bitmap)
+    lcd.reset_counts()
+    for cells in frames():
+        frame.clear()
+        for x, y, glyph_id in cells:
+            cache.put(x, y, glyph_id)
+        frame.flush()
+    return lcd, cache.stats()
+
+
+def main():
+    bitmaps = glyphs()
+    print(f"{SECONDS} s walk countdown, {len(bitmaps)} glyphs, 8 CGRAM slots")
+    lcd, uploads = run_upload(bitmaps)
+    print(f"upload: {uploads} glyph uploads, {lcd.commands + lcd.data} bus writes")
+    lcd, (hits, misses, evictions, remapped) = run_cache(bitmaps)
+    print(f"cache:  {misses} glyph uploads, {lcd.commands + lcd.data} bus writes")
+    print(
+        f"        hits {hits}, misses {misses}, evictions {evictions}, "
+        f"remapped cells {remapped}, hit rate {hits / (hits + misses):.0%}"
+    )
+
+
+main()
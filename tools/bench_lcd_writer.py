@@ -0,0 +1,94 @@
+"""
+Host-side comparison of synchronous LCD drawing against the LcdWriter queue.
+
+A status screen (state, countdown and a scrolling message) changes every
+second for a minute, drawn on a RecordingLcd by
+
+    sync         clear(), then putstr() of both lines inside the caller, as
+                 the examples do
+    writer       LcdWriter.write_line() of both lines, with service()
+                 called every 10 ms of a VirtualClock
+
+For each the worst bus writes in a single call is reported, with an
+estimated time on a 400 kHz I2C bus (90 us per write: four port bytes,
+plus 5 ms for each clear or home command), and for the writer the queue
+depth and update-to-display latency.
+
+Run from the repository root:
+    python tools/bench_lcd_writer.py
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "project", "lib"))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from clock import VirtualClock  # noqa: E402
+from lcd_framebuffer import LcdFrameBuffer  # noqa: E402
+from lcd_writer import LcdWriter  # noqa: E402
+from sim_devices import RecordingLcd  # noqa: E402
+
+SECONDS = 60
+SERVICE_MS = 10
+BUDGET = 8
+WRITE_US = 90
+CLEAR_US = 5000
+MESSAGE = "Press button to cross - wait for the green walk signal - "
+
+
+def screens():
+    for second in range(SECONDS):
+        state = "WALK" if (second // 15) & 1 else "IDLE"
+        top = f"{state:<6}{15 - second % 15:>3} s"
+        offset = second % len(MESSAGE)
+        yield top, (MESSAGE + MESSAGE)[offset : offset + 16]
+
+
+def cost_us(writes, clears=0):
+    return writes * WRITE_US + clears * CLEAR_US
+
+
+def run_sync():
+    lcd = RecordingLcd(2, 16)
+    worst = 0
+    for top, bottom in screens():
+        lcd.reset_counts()
+        lcd.clear()
+        lcd.putstr(f"{top:<16}{bottom:<16}")
+        worst = max(worst, cost_us(lcd.commands + lcd.data, 2))
+    return lcd, worst
+
+
+def run_writer():
+    clock = VirtualClock()
+    lcd = RecordingLcd(2, 16)
+    writer = LcdWriter(LcdFrameBuffer(lcd), BUDGET, clock)
+    worst = 0
+    max_depth = 0
+    for top, bottom in screens():
+        writer.write_line(0, top)
+        writer.write_line(1, bottom)
+        max_depth = max(max_depth, writer.depth())
+        for _ in range(1000 // SERVICE_MS):
+            worst = max(worst, cost_us(writer.service()))
+            clock.advance(SERVICE_MS)
+    return lcd, writer, worst, max_depth
+
+
+def main():
+    print(f"{SECONDS} screen updates, writer budget {BUDGET} writes per {SERVICE_MS} ms")
+    lcd, worst = run_sync()
+    print(f"sync:   worst call {worst} us")
+    sync_text = (lcd.text(0), lcd.text(1))
+    lcd, writer, worst, max_depth = run_writer()
+    updates, flushes, writes, last_latency, max_latency = writer.stats()
+    print(f"writer: worst call {worst} us, max queue depth {max_depth} cells")
+    print(
+        f"        {updates} updates, {flushes} flushes, {writes} writes, "
+        f"latency last {last_latency} ms, max {max_latency} ms"
+    )
+    print("same final screen:", sync_text == (lcd.text(0), lcd.text(1)))
+
+
+main()
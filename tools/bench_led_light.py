@@ -0,0 +1,80 @@
+"""
+On-board micro-benchmark of Led_Light on(), off() and toggle().
+
+Compares the original class, which read the pin back to toggle and to
+report its state, against the cached-state Led_Light in
+project/lib/led_light.py. Both drive the same GPIO pin, so the figures are
+the per-call cost of each class on the Pico.
+
+Run on the Pico with the library mounted, from the repository root:
+    mpremote mount project/lib run tools/bench_led_light.py
+"""
+
+from machine import Pin
+from utime import ticks_diff, ticks_us
+
+from led_light import Led_Light
+
+PIN = 25  # on-board LED
+CALLS = 20000
+
+
+class LegacyLed_Light(Pin):
+    """The pin-reading on/off/toggle Led_Light used before the state cache."""
+
+    def __init__(self, pin, debug=False):
+        super().__init__(pin, Pin.OUT)
+        self.led_light_state
+        self.__debug = debug
+        self.__pin = pin
+
+    def on(self):
+        self.high()
+        if self.__debug:
+            print(f"LED connected to Pin {self.__pin} is {self.led_light_state}")
+
+    def off(self):
+        self.low()
+        if self.__debug:
+            print(f"LED connected to Pin {self.__pin} is {self.led_light_state}")
+
+    def toggle(self):
+        if self.value() == 0:
+            self.on()
+        elif self.value() == 1:
+            self.off()
+
+    @property
+    def led_light_state(self):
+        return self.value()
+
+
+def calls_per_second(method):
+    """Time CALLS calls of a bound method and return the rate."""
+    start = ticks_us()
+    for _ in range(CALLS):
+        method()
+    elapsed = ticks_diff(ticks_us(), start)
+    return CALLS * 1000000 // max(1, elapsed)
+
+
+def read_state(led):
+    return lambda: led.led_light_state
+
+
+def main():
+    legacy = LegacyLed_Light(PIN)
+    lean = Led_Light(PIN)
+    print(f"{'call':<16}{'legacy/s':>12}{'cached/s':>12}{'speedup':>10}")
+    for name in ("on", "off", "toggle", "led_light_state"):
+        if name == "led_light_state":
+            old = calls_per_second(read_state(legacy))
+            new = calls_per_second(read_state(lean))
+        else:
+            old = calls_per_second(getattr(legacy, name))
+            new = calls_per_second(getattr(lean, name))
+        print(f"{name:<16}{old:>12}{new:>12}{new / old:>9.2f}x")
+    lean.off()
+
+
+main()
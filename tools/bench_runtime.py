@@ -0,0 +1,183 @@
+"""
+Host-side benchmark: polling loop versus the event-driven CrossingRuntime.
+
+Both runtimes drive the real Controller with the simulated devices from
+sim_devices.py. The polling loop is the examples/v99.py loop (update, then
+sleep 100 ms) on a VirtualClock. The event-driven runtime runs on an
+asyncio loop whose clock is virtual too, so sleeping costs no real time.
+
+Reported per run:
+    wakeups     times the CPU had to run (one per poll, or one per task
+                resume for the event-driven runtime)
+    cycles      completed crossing cycles (IDLE -> CHANGE transitions)
+    latency     mean time from a press to CHANGE, for presses made after
+                the IDLE minimum had already expired
+
+Run from the repository root:
+    python tools/bench_runtime.py
+"""
+
+import asyncio
+import os
+import selectors
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "project", "lib"))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from clock import VirtualClock  # noqa: E402
+from controller import Controller  # noqa: E402
+from crossing_runtime import CrossingRuntime  # noqa: E402
+from sim_devices import SimButton, SimBuzzer, SimLed  # noqa: E402
+
+DURATION_MS = 600000
+# Presses well after the IDLE minimum, at odd times so they fall between polls
+PRESSES_MS = (30037, 95511, 170273, 260149, 377777, 480901)
+
+
+class VirtualSelector(selectors.DefaultSelector):
+    """Selector that advances virtual time instead of blocking."""
+
+    # Keep each step well inside half the ticks_us wrap period
+    MAX_STEP_US = 1 << 28
+
+    def __init__(self, clock):
+        super().__init__()
+        self.clock = clock
+
+    def select(self, timeout=None):
+        ready = super().select(0)
+        if not ready:
+            if timeout is None:
+                raise RuntimeError("event loop would block forever")
+            self.clock.advance_us(min(round(timeout * 1000000), self.MAX_STEP_US))
+        return ready
+
+
+class VirtualTimeLoop(asyncio.SelectorEventLoop):
+    """asyncio event loop whose time() follows a VirtualClock.
+
+    Time is read back from the clock, so code that blocks by sleeping on
+    the clock moves the loop's time on as well.
+    """
+
+    def __init__(self, clock):
+        super().__init__(VirtualSelector(clock))
+        self.clock = clock
+        self.last_us = clock.ticks_us()
+        self.now_us = 0
+
+    def time(self):
+        now = self.clock.ticks_us()
+        self.now_us += self.clock.ticks_diff(now, self.last_us)
+        self.last_us = now
+        return self.now_us / 1000000
+
+
+class Crossing:
+    """Controller and simulated devices, with the time of every CHANGE."""
+
+    def __init__(self):
+        self.clock = VirtualClock()
+        clock = self.clock
+        self.ped_red = SimLed(19, True, clock=clock)
+        self.button = SimButton(22, clock=clock)
+        self.buzzer = SimBuzzer(27, clock=clock)
+        self.controller = Controller(
+            self.ped_red,
+            SimLed(17, clock=clock),
+            SimLed(3, clock=clock),
+            SimLed(5, clock=clock),
+            SimLed(6, clock=clock),
+            self.button,
+            self.buzzer,
+            clock=clock,
+        )
+        self.changes_ms = []
+        self.__update = self.controller.update
+        self.controller.update = self.update
+        self.__start = clock.ticks_ms()
+
+    def now_ms(self):
+        return self.clock.ticks_diff(self.clock.ticks_ms(), self.__start)
+
+    def update(self):
+        before = self.controller.state
+        self.__update()
+        if before == "IDLE" and self.controller.state == "CHANGE":
+            self.changes_ms.append(self.now_ms())
+
+    def latency_ms(self):
+        latencies = []
+        for press in PRESSES_MS:
+            later = [t for t in self.changes_ms if t >= press]
+            if later and later[0] - press < 5000:
+                latencies.append(later[0] - press)
+        if not latencies:
+            return None
+        return sum(latencies) / len(latencies)
+
+
+def run_polling():
+    crossing = Crossing()
+    presses = list(PRESSES_MS)
+    wakeups = 0
+    while crossing.now_ms() < DURATION_MS:
+        while presses and presses[0] <= crossing.now_ms():
+            crossing.button.press()
+            presses.pop(0)
+        wakeups += 1
+        crossing.controller.update()
+        crossing.clock.sleep_ms(100)
+    return wakeups, crossing
+
+
+def run_event_driven():
+    crossing = Crossing()
+    runtime = CrossingRuntime(
+        crossing.controller, crossing.button, crossing.ped_red, crossing.buzzer, crossing.clock
+    )
+
+    async def press_button():
+        for press in PRESSES_MS:
+            await asyncio.sleep((press - crossing.now_ms()) / 1000)
+            crossing.button.press()
+
+    async def main():
+        task = asyncio.create_task(runtime.run())
+        presser = asyncio.create_task(press_button())
+        await asyncio.sleep(DURATION_MS / 1000)
+        task.cancel()
+        presser.cancel()
+
+    loop = VirtualTimeLoop(crossing.clock)
+    try:
+        loop.run_until_complete(main())
+    finally:
+        loop.close()
+    return runtime.wakeups, crossing
+
+
+def report(name, wakeups, crossing):
+    cycles = len(crossing.changes_ms)
+    latency = crossing.latency_ms()
+    print(
+        "{:<14}{:>9}{:>8}{:>16}{:>14}".format(
+            name,
+            wakeups,
+            cycles,
+            "{:.1f}".format(wakeups / cycles) if cycles else "n/a",
+            "{:.1f} ms".format(latency) if latency is not None else "n/a",
+        )
+    )
+
+
+def main():
+    print("{} s simulated, {} presses".format(DURATION_MS // 1000, len(PRESSES_MS)))
+    print("{:<14}{:>9}{:>8}{:>16}{:>14}".format("runtime", "wakeups", "cycles", "wakeups/cycle", "latency"))
+    report("polling", *run_polling())
+    report("event-driven", *run_event_driven())
+
+
+if __name__ == "__main__":
+    main()
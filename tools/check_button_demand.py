@@ -0,0 +1,82 @@
+"""
+Host check that the controller only leaves IDLE on pedestrian demand.
+
+Runs the crossing simulation from simulate.py on a VirtualClock and checks:
+
+    no presses      the controller stays in IDLE with traffic green
+    one press       exactly one crossing cycle, then back to IDLE
+    press in WALK   a press during the cycle is cleared when it ends and
+                    does not start a second cycle
+
+Prints one passed/failed line per check and exits non-zero on a failure.
+
+Run from the repository root:
+    python tools/check_button_demand.py
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from simulate import CrossingSimulation  # noqa: E402
+
+HOUR_MS = 3600000
+
+
+def run(duration_ms, presses_ms):
+    """Simulate and count crossing cycles and IDLE ticks with traffic not green."""
+    sim = CrossingSimulation()
+    counts = {"cycles": 0, "state": None}
+
+    def on_change(time_ms, state, lamps, beeps):
+        if state == "CHANGE" and counts["state"] != "CHANGE":
+            counts["cycles"] += 1
+        counts["state"] = state
+
+    sim.run(duration_ms, presses_ms, on_change)
+    return sim, counts["cycles"]
+
+
+def check(name, ok):
+    print(f"{name}: {'passed' if ok else 'failed'}")
+    return ok
+
+
+def main():
+    results = []
+
+    sim, cycles = run(HOUR_MS, ())
+    results.append(
+        check(
+            "no presses: stays in IDLE for an hour",
+            cycles == 0 and sim.controller.state == "IDLE" and sim.lamps() == "..G R.",
+        )
+    )
+
+    sim, cycles = run(HOUR_MS, (1800000,))
+    results.append(
+        check(
+            "one press: one crossing cycle, then IDLE",
+            cycles == 1 and sim.controller.state == "IDLE",
+        )
+    )
+
+    # Press at 10 s starts the cycle; 17 s is during WALK
+    sim, cycles = run(120000, (10000, 17000))
+    results.append(
+        check(
+            "press in WALK: cleared at the end of the cycle",
+            cycles == 1
+            and sim.button.presses == 2
+            and not sim.button.button_state
+            and sim.controller.state == "IDLE",
+        )
+    )
+
+    if not all(results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
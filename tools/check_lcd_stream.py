@@ -0,0 +1,79 @@
+"""
+Host check of the streaming LcdApi.putchar() against the original.
+
+Writes common strings on a RecordingLcd with the current putchar(), which
+only sends move_to() at line wraps and newlines, and with the original
+putchar(), which sent move_to() after every character. For each string it
+checks that the display memory, cursor and implied_newline end up the same,
+and prints the commands each one sent. Exits non-zero on a mismatch.
+
+Run from the repository root:
+    python tools/check_lcd_stream.py
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from sim_devices import RecordingLcd  # noqa: E402
+
+STRINGS = (
+    "Hello world!",
+    "Cross in 12 sec",
+    "Cross in 12 sec Walk with care  ",
+    "Exactly sixteen!\nNext line",
+    "Line one\nLine two",
+    "Wraps past the end of the second line",
+    "\n\n\nThree newlines",
+    "",
+)
+
+
+class LegacyLcd(RecordingLcd):
+    """RecordingLcd with the putchar() that moved after every character."""
+
+    def putchar(self, char):
+        if char == "\n":
+            if not self.implied_newline:
+                self.cursor_x = self.num_columns
+        else:
+            self.hal_write_data(ord(char))
+            self.cursor_x += 1
+        if self.cursor_x >= self.num_columns:
+            self.cursor_x = 0
+            self.cursor_y += 1
+            self.implied_newline = char != "\n"
+        if self.cursor_y >= self.num_lines:
+            self.cursor_y = 0
+        self.move_to(self.cursor_x, self.cursor_y)
+
+
+def write(lcd_class, lines, columns, string):
+    lcd = lcd_class(lines, columns)
+    lcd.reset_counts()
+    lcd.putstr(string)
+    shown = tuple(lcd.text(y) for y in range(lines))
+    return lcd, (shown, lcd.cursor_x, lcd.cursor_y, lcd.implied_newline)
+
+
+def main():
+    ok = True
+    print(f"{'size':<6}{'string':<42}{'legacy':>8}{'stream':>8}  result")
+    for lines, columns in ((2, 16), (4, 20)):
+        for string in STRINGS:
+            legacy, legacy_state = write(LegacyLcd, lines, columns, string)
+            stream, stream_state = write(RecordingLcd, lines, columns, string)
+            same = legacy_state == stream_state
+            ok = ok and same
+            print(
+                f"{lines}x{columns:<4}{string.replace(chr(10), '|'):<42}"
+                f"{legacy.commands:>8}{stream.commands:>8}"
+                f"  {'passed' if same else 'failed'}"
+            )
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Host check of the PioFlasher waveform, counted in state machine cycles.
+
+Reads the _flash_program PIO source out of flash_backend.py and runs it on
+a small emulator of the instructions it uses, one instruction per cycle as
+on the RP2040, with the FIFO loaded from flash_counts() as
+PioFlasher.start() loads it. For each period and duty it checks that the
+pin stays high and low for exactly the commanded number of cycles. Exits
+non-zero on a mismatch.
+
+Run from the repository root:
+    python tools/check_pio_flash.py
+"""
+
+import ast
+import os
+import sys
+
+LIB = os.path.join(os.path.dirname(__file__), "..", "project", "lib")
+sys.path.insert(0, LIB)
+
+from flash_backend import flash_counts  # noqa: E402
+
+# (cycles per period, duty percent), as start() works them out at 10 kHz
+WAVEFORMS = (
+    (10000, 50),
+    (10000, 25),
+    (5000, 50),
+    (100, 10),
+    (20, 50),
+    (7, 43),
+)
+
+
+def load_program():
+    """Get the instructions of _flash_program as (name, args) tuples."""
+    with open(os.path.join(LIB, "flash_backend.py")) as source:
+        tree = ast.parse(source.read())
+    for node in ast.walk(tree):
+        if isinstance(node, ast.FunctionDef) and node.name == "_flash_program":
+            return [
+                (
+                    statement.value.func.id,
+                    tuple(
+                        arg.value if isinstance(arg, ast.Constant) else arg.id
+                        for arg in statement.value.args
+                    ),
+                )
+                for statement in node.body
+                if isinstance(statement, ast.Expr)
+            ]
+    raise SystemExit("_flash_program not found in flash_backend.py")
+
+
+def run(program, fifo, cycles):
+    """Run the program for a number of cycles and get the pin level of each."""
+    code = []
+    labels = {}
+    wrap_target = wrap = None
+    for name, args in program:
+        if name == "label":
+            labels[args[0]] = len(code)
+        elif name == "wrap_target":
+            wrap_target = len(code)
+        elif name == "wrap":
+            wrap = len(code) - 1
+        else:
+            code.append((name, args))
+    registers = {"x": 0, "isr": 0, "osr": 0}
+    fifo = list(fifo)
+    pin = 0
+    pc = 0
+    levels = []
+    for _ in range(cycles):
+        name, args = code[pc]
+        next_pc = pc + 1
+        if name == "pull":
+            registers["osr"] = fifo.pop(0)
+        elif name == "mov":
+            registers[args[0]] = registers[args[1]]
+        elif name == "set":
+            pin = args[1]
+        elif name == "jmp" and args[0] == "x_dec":
+            if registers["x"]:
+                next_pc = labels[args[1]]
+            registers["x"] = (registers["x"] - 1) & 0xFFFFFFFF
+        else:
+            raise SystemExit("emulator does not support " + name)
+        if pc == wrap and next_pc == pc + 1:
+            next_pc = wrap_target
+        pc = next_pc
+        levels.append(pin)
+    return levels
+
+
+def phases(levels):
+    """Get the lengths of the first full high and low phases after a rise."""
+    start = levels.index(1)
+    fall = levels.index(0, start)
+    rise = levels.index(1, fall)
+    return fall - start, rise - fall
+
+
+def main():
+    program = load_program()
+    ok = True
+    print(f"{'cycles':>8}{'duty':>6}{'want on':>9}{'on':>7}{'want off':>10}{'off':>7}  result")
+    for cycles, duty_percent in WAVEFORMS:
+        on_cycles = cycles * duty_percent // 100
+        levels = run(program, flash_counts(cycles, on_cycles), 3 * cycles + 10)
+        high, low = phases(levels)
+        exact = (high, low) == (on_cycles, cycles - on_cycles)
+        ok = ok and exact
+        print(
+            f"{cycles:>8}{duty_percent:>5}%{on_cycles:>9}{high:>7}"
+            f"{cycles - on_cycles:>10}{low:>7}  {'passed' if exact else 'failed'}"
+        )
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
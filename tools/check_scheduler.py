@@ -0,0 +1,198 @@
+"""
+Host check of DeadlineScheduler sleeping on a VirtualClock.
+
+The controller and simulated devices from simulate.py are driven by the
+scheduler, with a recording sleeper standing in for machine.lightsleep.
+It checks:
+
+    idle            with no press, every lightsleep is capped at
+                    max_sleep_ms and the controller stays in IDLE
+    press wakes     if the press ends the lightsleep, the cycle starts at
+                    once and no wait overshoots a state's deadline
+    no wake         if it does not, the press is acted on within
+                    max_sleep_ms
+    tones           no lightsleep starts while a beep or pattern step
+                    sounds; those waits use the clock's idle sleep_ms
+                    instead, but a pattern's rests are slept through and
+                    its steps stay on time
+    flashing        no lightsleep starts while the pedestrian red light is
+                    flashed by a flash backend
+
+Prints one passed/failed line per check and exits non-zero on a failure.
+
+Run from the repository root:
+    python tools/check_scheduler.py
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "project", "lib"))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from deadline_scheduler import DeadlineScheduler  # noqa: E402
+from pattern_player import LOCATOR  # noqa: E402
+from simulate import CrossingSimulation  # noqa: E402
+
+MAX_SLEEP_MS = 60000
+
+
+class RecordingSleeper:
+    """Stands in for lightsleep: records each call and advances the clock.
+
+    With wake_on_press, a sleep ends early at the next scripted press, as
+    it would if the button interrupt woke the Pico.
+    """
+
+    def __init__(self, clock, sources, controller, presses_ms=(), wake_on_press=False):
+        self.clock = clock
+        self.sources = sources
+        self.controller = controller
+        self.states = []
+        self.presses = list(presses_ms) if wake_on_press else []
+        self.sleeps = []
+        self.while_busy = 0
+
+    def __call__(self, ms):
+        self.sleeps.append(ms)
+        self.states.append(self.controller.state)
+        if any(source.busy for source in self.sources):
+            self.while_busy += 1
+        now = self.clock.ticks_ms()
+        while self.presses and self.presses[0] <= now:
+            self.presses.pop(0)
+        if self.presses:
+            ms = min(ms, self.presses[0] - now)
+        self.clock.advance(ms)
+
+
+def run(
+    end_ms,
+    presses_ms=(),
+    wake_on_press=False,
+    max_sleep_ms=MAX_SLEEP_MS,
+    on_wake=None,
+    flashing=False,
+):
+    """Drive a simulation with the scheduler until end_ms of virtual time.
+
+    on_wake(sim, now) is called at each wake, before the update.
+
+    Returns:
+        tuple: (sim, sleeper, scheduler, transitions) where transitions are
+        (time_ms, state) for every state change.
+    """
+    sim = CrossingSimulation(self_timed=flashing)
+    sources = (sim.ped_red, sim.buzzer)
+    sleeper = RecordingSleeper(
+        sim.clock, sources, sim.controller, presses_ms, wake_on_press
+    )
+    scheduler = DeadlineScheduler(
+        sim.controller,
+        (sim.ped_red, sim.buzzer),
+        clock=sim.clock,
+        sleeper=sleeper,
+        max_sleep_ms=max_sleep_ms,
+    )
+    presses = list(presses_ms)
+    transitions = []
+    state = sim.controller.state
+    while sim.clock.ticks_ms() < end_ms:
+        now = sim.clock.ticks_ms()
+        while presses and presses[0] <= now:
+            sim.button.press()
+            presses.pop(0)
+        if on_wake is not None:
+            on_wake(sim, now)
+        sim.buzzer.service()
+        scheduler.run_once()
+        if sim.controller.state != state:
+            state = sim.controller.state
+            transitions.append((now, state))
+    return sim, sleeper, scheduler, transitions
+
+
+def check(name, ok):
+    print(f"{name}: {'passed' if ok else 'failed'}")
+    return ok
+
+
+def main():
+    results = []
+
+    sim, sleeper, scheduler, transitions = run(600000)
+    results.append(
+        check(
+            "idle: lightsleeps capped at max_sleep_ms",
+            not transitions
+            and sim.controller.state == "IDLE"
+            and max(sleeper.sleeps) <= MAX_SLEEP_MS,
+        )
+    )
+
+    # Every state lasts 5000 ms and leaves once more than that has passed,
+    # so a wait that overshot a deadline would make a phase longer
+    sim, sleeper, scheduler, transitions = run(60000, (10000,), wake_on_press=True)
+    times = [time_ms for time_ms, state in transitions]
+    phases = [later - earlier for earlier, later in zip(times, times[1:])]
+    results.append(
+        check(
+            "press wakes: cycle starts at the press, no phase overshoots",
+            [state for time_ms, state in transitions]
+            == ["CHANGE", "WALK", "WALK_WARNING", "IDLE"]
+            and times[0] == 10000
+            and all(phase == 5001 for phase in phases),
+        )
+    )
+
+    # Without a wake, the cap bounds how late a press is acted on
+    sim, sleeper, scheduler, transitions = run(60000, (10000,), max_sleep_ms=1000)
+    results.append(
+        check(
+            "press does not wake: acted on within max_sleep_ms",
+            transitions and 10000 <= transitions[0][0] <= 11000,
+        )
+    )
+
+    # IDLE silences the buzzer on its first update, so sound starts after
+    # it: a beep on the second wake, then a looping pattern once it ends.
+    # LOCATOR ticks for 30 ms and rests for 970 ms, from 5301 ms on
+    wakes = []
+
+    def beep_then_pattern(sim, now):
+        wakes.append(now)
+        if len(wakes) == 2:
+            sim.buzzer.beep(1000, 300)
+        elif len(wakes) == 3:
+            sim.buzzer.play_pattern(LOCATOR)
+
+    sim, sleeper, scheduler, transitions = run(15000, on_wake=beep_then_pattern)
+    results.append(
+        check(
+            "tones: no lightsleep while the buzzer is busy",
+            sim.buzzer.tone_stats()[0] == 1
+            and sim.buzzer.pattern_stats()[0] > 1
+            and sleeper.while_busy == 0
+            and sleeper.sleeps == [5001] + [970] * 10
+            and wakes[2::2] == list(range(5301, 15000, 1000)),
+        )
+    )
+
+    sim, sleeper, scheduler, transitions = run(
+        60000, (10000,), wake_on_press=True, flashing=True
+    )
+    results.append(
+        check(
+            "flashing: no lightsleep while the flash backend runs",
+            ("WALK_WARNING" in [state for time_ms, state in transitions])
+            and "WALK_WARNING" not in sleeper.states
+            and not sim.ped_red.busy,
+        )
+    )
+
+    if not all(results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
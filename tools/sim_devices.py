@@ -0,0 +1,307 @@
+"""
+Simulated crossing devices for running the controller on the host.
+
+Each class mirrors the public interface and timing behaviour of its device
+class in project/lib (Led_Light, Pedestrian_Button, Audio_Notification)
+without touching machine.Pin or machine.PWM, and takes its time from a
+Clock so a VirtualClock can fast-forward it. RecordingLcd is an LcdApi HAL
+that models the HD44780 memory and counts the bus writes instead of
+driving an I2C display.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "project", "lib"))
+
+from clock import system_clock  # noqa: E402
+from lcd_api import LcdApi  # noqa: E402
+from pattern_player import PatternPlayer  # noqa: E402
+from tone_engine import ToneEngine  # noqa: E402
+
+
+class SimLed:
+    """Stand-in for led_light.Led_Light that keeps its level in memory."""
+
+    def __init__(self, pin, flashing=False, debug=False, clock=None, flasher=None):
+        self.__pin = pin
+        self.__flashing = flashing
+        self.__debug = debug
+        self.__clock = clock if clock is not None else system_clock
+        self.__value = 0
+        self.__last_toggle_time = self.__clock.ticks_ms()
+        self.__flash_active = False
+        self.__flasher = flasher
+        self.writes = 0
+
+    def value(self, value=None):
+        if value is None:
+            if self.__flasher is not None and self.__flasher.running:
+                return self.__flasher.level_at(self.__clock.ticks_ms())
+            return self.__value
+        self.__value = 1 if value else 0
+        self.writes += 1
+
+    def on(self):
+        if self.__flasher is not None and self.__flasher.running:
+            self.__flasher.stop()
+        self.value(1)
+        self.__flash_active = False
+        if self.__debug:
+            print(f"LED connected to Pin {self.__pin} is {self.__value}")
+
+    def off(self):
+        if self.__flasher is not None and self.__flasher.running:
+            self.__flasher.stop()
+        self.value(0)
+        self.__flash_active = False
+        if self.__debug:
+            print(f"LED connected to Pin {self.__pin} is {self.__value}")
+
+    def toggle(self):
+        if self.__value == 0:
+            self.on()
+        else:
+            self.off()
+
+    @property
+    def pin_number(self):
+        return self.__pin
+
+    @property
+    def self_timed(self):
+        return self.__flasher is not None
+
+    @property
+    def busy(self):
+        return self.__flasher is not None and self.__flasher.running
+
+    @property
+    def led_light_state(self):
+        return self.value()
+
+    def flash(self):
+        if self.__flasher is not None:
+            if self.__flashing and not self.__flasher.running:
+                self.__flasher.start(1000)
+            return
+        now = self.__clock.ticks_ms()
+        elapsed = self.__clock.ticks_diff(now, self.__last_toggle_time)
+        if self.__flashing and elapsed >= 500:
+            self.toggle()
+            self.__last_toggle_time = now
+        self.__flash_active = self.__flashing
+
+    def ms_until_due(self):
+        if not self.__flash_active:
+            return None
+        now = self.__clock.ticks_ms()
+        elapsed = self.__clock.ticks_diff(now, self.__last_toggle_time)
+        return max(0, 500 - elapsed)
+
+
+class SimButton:
+    """Stand-in for pedestrian_button.Pedestrian_Button driven by press()."""
+
+    def __init__(self, pin, debug=False, clock=None):
+        self.__pin = pin
+        self.__debug = debug
+        self.__clock = clock if clock is not None else system_clock
+        self.__last_pressed = self.__clock.ticks_ms()
+        self.__pedestrian_waiting = False
+        self.__press_handler = None
+        self.presses = 0
+
+    @property
+    def button_state(self):
+        return self.__pedestrian_waiting
+
+    @button_state.setter
+    def button_state(self, value):
+        self.__pedestrian_waiting = bool(value)
+
+    def take_press(self):
+        waiting = self.__pedestrian_waiting
+        self.__pedestrian_waiting = False
+        return waiting
+
+    def press(self):
+        """Simulate a rising edge on the button pin at the current clock time."""
+        self.callback(self)
+
+    def set_press_handler(self, handler):
+        self.__press_handler = handler
+
+    def callback(self, pin):
+        current_time = self.__clock.ticks_ms()
+        if self.__clock.ticks_diff(current_time, self.__last_pressed) > 200:
+            self.__last_pressed = current_time
+            self.__pedestrian_waiting = True
+            self.presses += 1
+            if self.__press_handler is not None:
+                self.__press_handler()
+            if self.__debug:
+                print(f"Button pressed on Pin {self.__pin} at {current_time}ms")
+
+
+class SimBuzzer:
+    """Stand-in for audio_notification.Audio_Notification that counts beeps.
+
+    Tones run on a ToneEngine in deadline mode, so like the real buzzer it
+    never blocks; the tone ends on the first warning_on() after its deadline.
+    """
+
+    def __init__(self, pin, debug=False, clock=None):
+        self.__debug = debug
+        self.__clock = clock if clock is not None else system_clock
+        self.__tones = ToneEngine(self, None, self.__clock)
+        self.__player = PatternPlayer(self, None, self.__clock)
+        self.__last_toggle_time = self.__clock.ticks_ms()
+        self.__freq = 0
+        self.__duty = 0
+        self.__warning_active = False
+        self.beeps = 0
+
+    def warning_on(self):
+        self.__warning_active = True
+        self.__tones.service()
+        now = self.__clock.ticks_ms()
+        if self.__clock.ticks_diff(now, self.__last_toggle_time) >= 500:
+            self.beep(freq=500, duration=100)
+            self.__last_toggle_time = now
+
+    def warning_off(self):
+        self.__warning_active = False
+        self.__player.stop()
+        self.__tones.stop()
+
+    def ms_until_due(self):
+        tone_due = self.__tones.ms_until_due()
+        step_due = self.__player.ms_until_due()
+        if tone_due is None or (step_due is not None and step_due < tone_due):
+            tone_due = step_due
+        if not self.__warning_active:
+            return tone_due
+        now = self.__clock.ticks_ms()
+        elapsed = self.__clock.ticks_diff(now, self.__last_toggle_time)
+        beep_due = max(0, 500 - elapsed)
+        return beep_due if tone_due is None else min(beep_due, tone_due)
+
+    @property
+    def busy(self):
+        return self.__tones.playing or self.__player.sounding
+
+    def service(self):
+        # Does what the real buzzer's timer callbacks do on the Pico
+        self.__tones.service()
+        self.__player.service()
+
+    def freq(self, value=None):
+        if value is None:
+            return self.__freq
+        self.__freq = value
+
+    def duty_u16(self, value=None):
+        if value is None:
+            return self.__duty
+        self.__duty = value
+
+    def beep(self, freq=1000, duration=500):
+        self.beeps += 1
+        return self.__tones.play(freq, duration)
+
+    def play_sequence(self, steps):
+        return self.__tones.play_sequence(steps)
+
+    def play_pattern(self, pattern):
+        if pattern is not self.__player.pattern:
+            self.__tones.stop()
+            self.__player.select(pattern)
+        else:
+            self.__player.service()
+
+    def pattern_stats(self):
+        return self.__player.stats()
+
+    def tone_stats(self):
+        return self.__tones.stats()
+
+
+class RecordingLcd(LcdApi):
+    """LcdApi HAL that models the display memory and counts writes.
+
+    Commands and data are applied to a model of the HD44780 DDRAM and
+    CGRAM with the address counter auto-incrementing as on the chip, so
+    text(y) shows what the display would. A transaction is one batch, or
+    one write outside a batch, as I2cLcd sends them.
+    """
+
+    def __init__(self, num_lines=2, num_columns=16):
+        self.ddram = bytearray(b" " * 128)
+        self.cgram = bytearray(64)
+        self.__address = 0
+        self.__in_cgram = False
+        self.__batch_depth = 0
+        self.__batch_writes = 0
+        self.reset_counts()
+        LcdApi.__init__(self, num_lines, num_columns)
+        self.reset_counts()
+
+    def reset_counts(self):
+        self.commands = 0
+        self.data = 0
+        self.moves = 0
+        self.transactions = 0
+
+    def text(self, y):
+        """Get the characters shown on line y."""
+        base = (0x40 if y & 1 else 0) + (self.num_columns if y & 2 else 0)
+        return self.ddram[base : base + self.num_columns].decode()
+
+    def hal_begin_batch(self):
+        self.__batch_depth += 1
+
+    def hal_end_batch(self):
+        if self.__batch_depth:
+            self.__batch_depth -= 1
+        if not self.__batch_depth:
+            if self.__batch_writes:
+                self.transactions += 1
+            self.__batch_writes = 0
+
+    def hal_write_command(self, cmd):
+        self.commands += 1
+        self.__count_write()
+        if cmd & self.LCD_DDRAM:
+            self.moves += 1
+            self.__address = cmd & 0x7F
+            self.__in_cgram = False
+        elif cmd & self.LCD_CGRAM:
+            self.__address = cmd & 0x3F
+            self.__in_cgram = True
+        elif cmd == self.LCD_CLR:
+            self.ddram[:] = b" " * 128
+            self.__address = 0
+            self.__in_cgram = False
+        elif cmd == self.LCD_HOME:
+            self.__address = 0
+            self.__in_cgram = False
+
+    def hal_write_data(self, data):
+        self.data += 1
+        self.__count_write()
+        if self.__in_cgram:
+            self.cgram[self.__address] = data
+            self.__address = (self.__address + 1) & 0x3F
+        else:
+            self.ddram[self.__address] = data
+            self.__address = (self.__address + 1) & 0x7F
+
+    def hal_sleep_us(self, usecs):
+        pass
+
+    def __count_write(self):
+        if self.__batch_depth:
+            self.__batch_writes += 1
+        else:
+            self.transactions += 1
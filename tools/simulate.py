@@ -0,0 +1,180 @@
+"""
+Headless, accelerated simulation of the crossing controller on the host.
+
+Runs controller.Controller against simulated lamps, button and buzzer on a
+VirtualClock, so a full day of 100 ms ticks finishes in seconds. Button
+presses are scripted as timestamps in seconds, and the lamp states are
+printed as a compact timeline with one line per change:
+
+    time_ms  state         traffic ped  beeps
+
+traffic is the red/amber/green lamps and ped the red/green pedestrian
+lamps, each shown as its letter when lit and "." when dark.
+
+Examples, run from the repository root:
+    python tools/simulate.py --presses 3,40.5,41 --duration 90
+    python tools/simulate.py --every 120 --duration 86400 --quiet
+    python tools/simulate.py --every 60 --duration 600 --quiet --profile
+
+With --profile, each update() is timed on the virtual clock by a
+TickProfiler, so only time the simulated devices block for shows.
+"""
+
+import argparse
+import os
+import sys
+from time import perf_counter
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "project", "lib"))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from clock import VirtualClock  # noqa: E402
+from controller import STATE_NAMES, Controller  # noqa: E402
+from flash_backend import RecordingFlasher  # noqa: E402
+from sim_devices import SimButton, SimBuzzer, SimLed  # noqa: E402
+from tick_profiler import TickProfiler  # noqa: E402
+
+
+class CrossingSimulation:
+    """A controller wired to simulated devices on a shared VirtualClock.
+
+    Args:
+        tick_ms (int, optional): Time between controller updates. Defaults to 100.
+        profiler (TickProfiler, optional): Profiler passed to the controller.
+        self_timed (bool, optional): Flash the pedestrian red light from a
+            RecordingFlasher backend. Defaults to False.
+    """
+
+    def __init__(self, tick_ms=100, profiler=None, self_timed=False):
+        self.clock = VirtualClock()
+        self.tick_ms = tick_ms
+        self.elapsed_ms = 0
+        self.updates = 0
+        clock = self.clock
+        flasher = RecordingFlasher(clock) if self_timed else None
+        self.ped_red = SimLed(19, True, clock=clock, flasher=flasher)
+        self.ped_green = SimLed(17, clock=clock)
+        self.traffic_red = SimLed(3, clock=clock)
+        self.traffic_amber = SimLed(5, clock=clock)
+        self.traffic_green = SimLed(6, clock=clock)
+        self.button = SimButton(22, clock=clock)
+        self.buzzer = SimBuzzer(27, clock=clock)
+        self.controller = Controller(
+            self.ped_red,
+            self.ped_green,
+            self.traffic_red,
+            self.traffic_amber,
+            self.traffic_green,
+            self.button,
+            self.buzzer,
+            clock=clock,
+            profiler=profiler,
+        )
+
+    def lamps(self):
+        """Get the lamp states as a compact string, e.g. "..G R."."""
+        return "{}{}{} {}{}".format(
+            "R" if self.traffic_red.value() else ".",
+            "A" if self.traffic_amber.value() else ".",
+            "G" if self.traffic_green.value() else ".",
+            "R" if self.ped_red.value() else ".",
+            "G" if self.ped_green.value() else ".",
+        )
+
+    def run(self, duration_ms, presses_ms=(), on_change=None):
+        """Run the controller for duration_ms of virtual time.
+
+        Args:
+            duration_ms (int): Virtual time to simulate.
+            presses_ms (sequence, optional): Sorted button press times in ms.
+            on_change (callable, optional): Called as on_change(time_ms,
+                state, lamps, beeps) whenever the state or a lamp changes.
+        """
+        presses = list(presses_ms)
+        next_press = 0
+        last = None
+        end = self.elapsed_ms + duration_ms
+        update = self.controller.update
+        while self.elapsed_ms < end:
+            while next_press < len(presses) and presses[next_press] <= self.elapsed_ms:
+                self.button.press()
+                next_press += 1
+            before = self.clock.ticks_ms()
+            update()
+            self.updates += 1
+            if on_change is not None:
+                current = (self.controller.state, self.lamps())
+                if current != last:
+                    on_change(self.elapsed_ms, current[0], current[1], self.buzzer.beeps)
+                    last = current
+            # Time spent blocked inside update() counts too
+            spent = self.clock.ticks_diff(self.clock.ticks_ms(), before)
+            self.clock.advance(self.tick_ms)
+            self.elapsed_ms += self.tick_ms + spent
+
+
+def parse_presses(args):
+    presses = []
+    if args.presses:
+        presses.extend(float(p) for p in args.presses.split(","))
+    if args.press_file:
+        with open(args.press_file) as press_file:
+            presses.extend(float(line) for line in press_file if line.strip())
+    if args.every:
+        t = args.every
+        while t < args.duration:
+            presses.append(t)
+            t += args.every
+    return sorted(int(p * 1000) for p in presses)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--duration", type=float, default=60, help="seconds to simulate")
+    parser.add_argument("--tick", type=int, default=100, help="ms between updates")
+    parser.add_argument("--presses", help="comma separated press times in seconds")
+    parser.add_argument("--press-file", help="file with one press time in seconds per line")
+    parser.add_argument("--every", type=float, help="press the button every N seconds")
+    parser.add_argument("--quiet", action="store_true", help="only print the summary")
+    parser.add_argument("--profile", action="store_true", help="report update() times")
+    parser.add_argument("--budget", type=int, default=10000, help="tick budget in us")
+    args = parser.parse_args()
+
+    profiler = TickProfiler(STATE_NAMES, args.budget) if args.profile else None
+    sim = CrossingSimulation(args.tick, profiler)
+    presses = parse_presses(args)
+    counts = {"lines": 0, "cycles": 0, "state": None}
+
+    def on_change(time_ms, state, lamps, beeps):
+        counts["lines"] += 1
+        if state == "CHANGE" and counts["state"] != "CHANGE":
+            counts["cycles"] += 1
+        counts["state"] = state
+        if not args.quiet:
+            print("{:>10}  {:<12}  {}  {:>5}".format(time_ms, state, lamps, beeps))
+
+    start = perf_counter()
+    sim.run(int(args.duration * 1000), presses, on_change)
+    wall = perf_counter() - start
+
+    issued, suppressed = sim.controller.output_stats()
+    print(
+        "simulated {:.0f} s in {:.2f} s: {} updates, {} presses, {} crossing cycles, "
+        "{} beeps, {} timeline lines, {} output writes issued / {} suppressed".format(
+            sim.elapsed_ms / 1000,
+            wall,
+            sim.updates,
+            sim.button.presses,
+            counts["cycles"],
+            sim.buzzer.beeps,
+            counts["lines"],
+            issued,
+            suppressed,
+        )
+    )
+    if profiler is not None:
+        profiler.report()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Decode a crossing trace dumped over serial by event_trace.Trace.dump().
+
+Reads the captured serial output (other lines are ignored), and prints one
+line per event with the time relative to the first record:
+
+       +0 ms  state   IDLE
+     +512 ms  button  pin 22
+    +5001 ms  state   CHANGE
+    +5001 ms  output  traffic amber on
+
+Run from the repository root:
+    python tools/trace_decode.py serial_log.txt
+    python tools/trace_decode.py < serial_log.txt
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "project", "lib"))
+
+from clock import ticks_diff  # noqa: E402
+from controller import OUTPUT_NAMES, STATE_NAMES  # noqa: E402
+from event_trace import EV_BUTTON, EV_OUTPUT, EV_STATE, EVENT_NAMES  # noqa: E402
+
+LEVELS = ("off", "on", "free-running")
+
+
+def parse(lines):
+    """Get the header and records of the last dump found in lines."""
+    header = None
+    records = []
+    in_dump = False
+    for line in lines:
+        fields = line.split()
+        if fields[:1] == ["TRACE"] and len(fields) == 3:
+            header = (int(fields[1]), int(fields[2]))
+            records = []
+            in_dump = True
+        elif in_dump and fields == ["END"]:
+            in_dump = False
+        elif in_dump and len(fields) == 3:
+            records.append(tuple(int(field) for field in fields))
+    return header, records
+
+
+def describe(code, arg):
+    """Get a readable description of one record's argument."""
+    if code == EV_STATE:
+        if 0 <= arg < len(STATE_NAMES):
+            return STATE_NAMES[arg]
+        return "state {}".format(arg)
+    if code == EV_OUTPUT:
+        output, level = arg >> 2, arg & 3
+        if output < len(OUTPUT_NAMES):
+            name = OUTPUT_NAMES[output]
+        else:
+            name = "output {}".format(output)
+        return "{} {}".format(name, LEVELS[level] if level < len(LEVELS) else level)
+    if code == EV_BUTTON:
+        return "pin {}".format(arg)
+    return str(arg)
+
+
+def main():
+    if len(sys.argv) > 1:
+        with open(sys.argv[1]) as log:
+            header, records = parse(log)
+    else:
+        header, records = parse(sys.stdin)
+    if header is None:
+        sys.exit("no TRACE dump found")
+    recorded, overwritten = header
+    print(
+        "{} events recorded, {} overwritten, {} shown".format(
+            recorded, overwritten, len(records)
+        )
+    )
+    if not records:
+        return
+    start = records[0][0]
+    for timestamp, code, arg in records:
+        elapsed = ticks_diff(timestamp, start)
+        name = EVENT_NAMES.get(code, str(code))
+        print("{:>+9} ms  {:<7} {}".format(elapsed, name, describe(code, arg)))
+
+
+if __name__ == "__main__":
+    main()